@@ -1,12 +1,38 @@
 #!/usr/bin/env python3
 """
-autonomous-runner.py V2 — Print + Resume Architecture
-
-Manages Claude Code sessions using --print and --resume. Each "turn" is a separate
-subprocess invocation: the initial turn creates a session, subsequent turns resume it.
-Output is streamed in real-time via --output-format stream-json on stdout.
+autonomous-runner.py V2 — Persistent Stream-JSON Sessions
+
+Manages Claude Code sessions from one asyncio event loop. By default each session is one long-lived process
+fed over stdin: every "turn" is a single user message written as a stream-json
+line, and the turn ends at the next `result` event on stdout. The process (and
+the loaded session) stays up between turns, so a turn costs no CLI startup or
+session rehydration. If the process dies it is relaunched with --resume.
+
+The older print + resume protocol, one subprocess per turn, remains as a
+fallback (--session-mode print, or automatically when the CLI will not run a
+persistent session).
+
+Agent output is read from non-blocking subprocess streams, so other work runs
+while a build turn is in flight: the repo is fetched and NEEDS_HUMAN.md polled
+in the background, and supervisor escalations run alongside the next build
+turn, in the supervisor's own worktree, their guidance applied as soon as it
+arrives. Ctrl+C cancels the current turn immediately; agent processes run in
+their own process group and are terminated by the runner.
+
+Whether the build is broken (an escalation trigger) is decided by
+runner/build_health.py: the working tree is fingerprinted by git tree hash,
+results are cached per hash, and only the workspace packages changed since
+the last green tree (and their dependents) are type-checked, on a snapshot
+worktree, alongside the next turn. The supervisor is shown that check's output.
+
+Everything the runner logs, and every turn, cost, intervention, escalation,
+session ID and phase/step transition, goes to a SQLite ledger in the git
+common dir (runner/ledger.py) instead of build_log.txt and BUILD_STATE.json;
+`python3 scripts/runner/ledger.py phases|stalls|turns|runs|log` queries it.
 
 Protocol:
+  Stream: claude --print --input-format stream-json [--resume SESSION_ID] --dangerously-skip-permissions --model MODEL --output-format stream-json
+          stdin:  {"type": "user", "message": {"role": "user", "content": [{"type": "text", "text": PROMPT}]}}
   Start:  claude --print PROMPT --dangerously-skip-permissions --model MODEL --output-format stream-json
   Resume: claude --print PROMPT --resume SESSION_ID --dangerously-skip-permissions --model MODEL --output-format stream-json
 
@@ -16,11 +42,24 @@ Usage:
   python scripts/autonomous-runner.py --dry-run             # Pre-flight only
   python scripts/autonomous-runner.py --no-supervisor       # Skip supervisor
   python scripts/autonomous-runner.py --max-cost 100        # Cost cap ($)
+  python scripts/autonomous-runner.py --session-mode print  # One subprocess per turn
+  python scripts/autonomous-runner.py --build-check full    # Escalation check runs pnpm build
+  python scripts/autonomous-runner.py --parallel 3          # Independent phases side by side
+  python scripts/autonomous-runner.py --show-dag            # Print the phase dependency graph
+
+With --parallel N the runner schedules phases off the dependency graph in the
+skill files' "## Prerequisites" sections (runner/phase_dag.py) instead of
+BUILD_STATE.json's current_phase: up to N phases whose prerequisites are merged
+are built at once, each by its own build session on branch phase-NN in its own
+git worktree. A finished phase is merged into main by the runner; if the merge
+conflicts, the phase's agent is asked to merge main into its branch and resolve
+it, then the merge is retried.
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import os
 import shutil
@@ -28,10 +67,18 @@ import signal
 import subprocess
 import sys
 import time
+from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from runner.build_health import BuildHealth, BuildResult
+from runner.ledger import Ledger, StateFile, default_path
+from runner.phase_dag import (
+    PhaseScheduler, add_detached_worktree, add_worktree, branch_name, critical_path, levels,
+    load_phase_graph, merge_branch, remove_worktree,
+)
+
 # ============================================================
 # Constants
 # ============================================================
@@ -42,7 +89,6 @@ GUIDANCE_FILE = REPO_ROOT / "GUIDANCE.md"
 NEEDS_HUMAN_FILE = REPO_ROOT / "NEEDS_HUMAN.md"
 SKILLS_DIR = REPO_ROOT / "skills"
 SYMLINK_PATH = SKILLS_DIR / "current-phase.md"
-SUPERVISOR_LOG_DIR = REPO_ROOT / "docs" / "supervisor-log"
 
 REQUIRED_ENV_VARS = [
     "NEXT_PUBLIC_SUPABASE_URL",
@@ -58,9 +104,21 @@ CONFIG = {
     "max_supervisor_calls_per_step": 3,
     "max_supervisor_cost_usd": 20.0,
     "needs_human_poll_seconds": 120,
+    "git_sync_seconds": 60,                 # background fetch + NEEDS_HUMAN.md check during turns
+    "max_turns_per_phase": 40,              # --parallel: a phase not done by then needs a human
+    "max_merge_attempts": 3,                # --parallel: conflict-resolution rounds per phase
     "claude_model": "claude-opus-4-6",
+    "session_mode": "stream",               # "stream" (persistent process) or "print"
+    "build_check": "incremental",           # "incremental" (scoped tsc) or "full" (pnpm build)
+    "build_check_wait_seconds": 5,          # a check still running after this is read next turn
 }
 
+SESSION_MODES = ("stream", "print")
+BUILD_CHECKS = ("incremental", "full")
+
+# Stream-json lines carry whole tool results; asyncio's 64 KiB default is too small.
+STREAM_LINE_LIMIT = 64 * 1024 * 1024
+
 # ============================================================
 # ANSI Colors
 # ============================================================
@@ -80,51 +138,55 @@ class C:
 
 shutdown_requested = False
 
-def handle_sigint(signum, frame):
+def handle_sigint(task: asyncio.Task):
+    """First Ctrl+C cancels the run (and the turn in flight); a second one quits outright."""
     global shutdown_requested
     if shutdown_requested:
         print("\nForce quit.")
-        sys.exit(1)
+        os._exit(1)
     shutdown_requested = True
-    print("\nCtrl+C — finishing current turn, then stopping...")
-
-signal.signal(signal.SIGINT, handle_sigint)
+    print("\nCtrl+C — cancelling current turn and stopping...")
+    task.cancel()
 
 # ============================================================
-# Logging — dual output to terminal + build_log.txt
+# Logging — terminal + the run ledger (runner/ledger.py)
 # ============================================================
 
-def _write_log(line: str):
-    """Append a line to build_log.txt."""
-    try:
-        with open(REPO_ROOT / "build_log.txt", "a") as f:
-            f.write(line + "\n")
-    except OSError:
-        pass
+LEDGER: Ledger | None = None  # opened in main(); `python3 scripts/runner/ledger.py log -f` tails it
+
+def _write_log(tag: str, line: str):
+    """Record a logged line in the ledger (buffered; no file open per line)."""
+    if LEDGER is not None:
+        LEDGER.log(tag, line)
+
+def record(kind: str, **fields):
+    """Record a runner event in the ledger."""
+    if LEDGER is not None:
+        LEDGER.record(kind, **fields)
 
 def log_info(msg: str):
     ts = datetime.now().strftime("%H:%M:%S")
     display = f"[{ts}] {C.BLUE}[RUNNER]{C.NC} {msg}"
     print(display, flush=True)
-    _write_log(f"[{ts}] [RUNNER] {msg}")
+    _write_log("RUNNER", msg)
 
 def log_ok(msg: str):
     ts = datetime.now().strftime("%H:%M:%S")
     display = f"[{ts}] {C.GREEN}[OK]{C.NC} {msg}"
     print(display, flush=True)
-    _write_log(f"[{ts}] [OK] {msg}")
+    _write_log("OK", msg)
 
 def log_warn(msg: str):
     ts = datetime.now().strftime("%H:%M:%S")
     display = f"[{ts}] {C.YELLOW}[WARN]{C.NC} {msg}"
     print(display, flush=True)
-    _write_log(f"[{ts}] [WARN] {msg}")
+    _write_log("WARN", msg)
 
 def log_error(msg: str):
     ts = datetime.now().strftime("%H:%M:%S")
     display = f"[{ts}] {C.RED}[ERROR]{C.NC} {msg}"
     print(display, flush=True)
-    _write_log(f"[{ts}] [ERROR] {msg}")
+    _write_log("ERROR", msg)
 
 def log_build_line(line: str):
     """Log a build agent output line."""
@@ -133,7 +195,7 @@ def log_build_line(line: str):
     ts = datetime.now().strftime("%H:%M:%S")
     display = f"[{ts}] [BUILD] {line}"
     print(display, flush=True)
-    _write_log(f"[{ts}] [BUILD] {line}")
+    _write_log("BUILD", line)
 
 def log_supervisor_line(line: str):
     """Log a supervisor output line."""
@@ -142,41 +204,95 @@ def log_supervisor_line(line: str):
     ts = datetime.now().strftime("%H:%M:%S")
     display = f"[{ts}] {C.MAGENTA}[SUPERVISOR]{C.NC} {line}"
     print(display, flush=True)
-    _write_log(f"[{ts}] [SUPERVISOR] {line}")
-    # Also write to supervisor-specific log
-    try:
-        SUPERVISOR_LOG_DIR.mkdir(parents=True, exist_ok=True)
-        with open(SUPERVISOR_LOG_DIR / "supervisor_log.txt", "a") as f:
-            f.write(f"[{ts}] [SUPERVISOR] {line}\n")
-    except OSError:
-        pass
+    _write_log("SUPERVISOR", line)
 
 def log_status(state: dict, cost: float, turn: int):
     phase = state.get("current_phase", "?")
     step = state.get("current_step", "?")
     line = f"\n[STATUS] Phase {phase} | Step {step} | Turn {turn} | Cost: ${cost:.2f}\n"
     print(line, flush=True)
-    _write_log(line.strip())
+    _write_log("STATUS", line.strip())
 
 # ============================================================
 # Helpers
 # ============================================================
 
+BUILD_STATE = StateFile(BUILD_STATE_FILE)
+
 def load_build_state() -> dict[str, Any]:
+    """BUILD_STATE.json (re-parsed only when it changed); phase/step moves go to the ledger."""
     if not BUILD_STATE_FILE.exists():
         log_error("BUILD_STATE.json not found.")
         sys.exit(1)
-    with open(BUILD_STATE_FILE) as f:
-        return json.load(f)
+    state = BUILD_STATE.load()
+    if LEDGER is not None:
+        LEDGER.observe_state(state)
+    return state
 
-def git_pull():
+async def run_command(args: list[str], timeout: float | None = None) -> tuple[int | None, str, str]:
+    """
+    Run a command in the repo without blocking the event loop.
+    Returns (returncode, stdout, stderr); returncode is None if the command
+    is not installed. On timeout the process is killed and
+    asyncio.TimeoutError raised.
+    """
     try:
-        subprocess.run(
-            ["git", "pull", "origin", "main"],
-            cwd=REPO_ROOT, capture_output=True, text=True, timeout=30,
+        proc = await asyncio.create_subprocess_exec(
+            *args, cwd=REPO_ROOT,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
         )
-    except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+    except FileNotFoundError:
+        return None, "", f"{args[0]} not found"
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        await stop_process(proc, grace=0)
+        raise
+    return proc.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+
+
+async def stop_process(proc: asyncio.subprocess.Process, grace: float = 10):
+    """Terminate a child (kill it if it outlives `grace` seconds) and reap it."""
+    if proc.returncode is not None:
+        return
+    try:
+        if grace:
+            proc.terminate()
+            try:
+                await asyncio.wait_for(proc.wait(), grace)
+                return
+            except asyncio.TimeoutError:
+                pass
+        proc.kill()
+    except ProcessLookupError:
         pass
+    await proc.wait()
+
+
+# Serializes the runner's own git commands (pulls from the main loop, the
+# escalation task and the repo watcher).
+GIT_LOCK = asyncio.Lock()
+
+async def git_pull():
+    async with GIT_LOCK:
+        try:
+            await run_command(["git", "pull", "origin", "main"], timeout=30)
+        except asyncio.TimeoutError:
+            pass
+
+async def git_fetch():
+    """Update origin/main without touching the working tree (safe mid-turn)."""
+    async with GIT_LOCK:
+        try:
+            await run_command(["git", "fetch", "--quiet", "origin", "main"], timeout=30)
+        except asyncio.TimeoutError:
+            pass
+
+async def on_origin(path: str) -> bool:
+    """Whether origin/main, as last fetched, has `path`."""
+    returncode, _, _ = await run_command(["git", "cat-file", "-e", f"origin/main:{path}"])
+    return returncode == 0
 
 def update_symlink(phase: int):
     target = f"phase-{phase:02d}.md"
@@ -211,20 +327,6 @@ def load_env_file() -> dict[str, str]:
                 os.environ[key] = value
     return env_vars
 
-def save_session_ids(build_id: str | None, supervisor_id: str | None):
-    """Store active session IDs in BUILD_STATE.json for resumability."""
-    try:
-        state = load_build_state()
-        state["active_sessions"] = {
-            "build_session_id": build_id,
-            "supervisor_session_id": supervisor_id,
-        }
-        with open(BUILD_STATE_FILE, "w") as f:
-            json.dump(state, f, indent=2)
-            f.write("\n")
-    except Exception as e:
-        log_warn(f"Could not save session IDs: {e}")
-
 # ============================================================
 # Stream-JSON Output Formatting
 # ============================================================
@@ -261,29 +363,20 @@ def format_event(event: dict) -> str | None:
 # run_claude_turn — launch subprocess, stream output, return result
 # ============================================================
 
-def run_claude_turn(args: list[str], on_line=None, session: "AgentSession | None" = None) -> dict:
+async def read_events(stream: asyncio.StreamReader, on_line=None,
+                      stop_at_result: bool = False) -> tuple[list[dict], dict | None]:
     """
-    Launch a claude subprocess with the given args.
-    Read stdout line by line for real-time stream-json output.
-    Returns when the subprocess exits.
+    Read stream-json events from a claude stdout until EOF (or, with
+    stop_at_result, until the turn's result event). Returns (events, result).
     """
-    proc = subprocess.Popen(
-        args,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        cwd=REPO_ROOT,
-    )
-
-    # Track for graceful shutdown
-    if session is not None:
-        session._current_proc = proc
-
     collected: list[dict] = []
     result_event: dict | None = None
 
-    for raw_line in iter(proc.stdout.readline, ''):
-        line = raw_line.strip()
+    while True:
+        raw_line = await stream.readline()
+        if not raw_line:
+            break
+        line = raw_line.decode(errors="replace").strip()
         if not line:
             continue
         try:
@@ -303,21 +396,14 @@ def run_claude_turn(args: list[str], on_line=None, session: "AgentSession | None
 
         if event.get("type") == "result":
             result_event = event
+            if stop_at_result:
+                break
 
-    # stdout closed — wait for process to finish
-    try:
-        proc.wait(timeout=30)
-    except subprocess.TimeoutExpired:
-        proc.terminate()
-        try:
-            proc.wait(timeout=10)
-        except subprocess.TimeoutExpired:
-            proc.kill()
-            proc.wait()
+    return collected, result_event
 
-    if session is not None:
-        session._current_proc = None
 
+def turn_result(collected: list[dict], result_event: dict | None, stderr_text: str = "") -> dict:
+    """The dict every turn returns, from its events and result event."""
     if result_event:
         return {
             "events": collected,
@@ -327,48 +413,168 @@ def run_claude_turn(args: list[str], on_line=None, session: "AgentSession | None
             "is_error": result_event.get("is_error", False),
             "process_died": False,
         }
-    else:
-        # No result event — process crashed or errored out
-        stderr_text = ""
+    # No result event — process crashed or errored out
+    if stderr_text:
+        log_warn(f"Subprocess stderr: {stderr_text[:500]}")
+    return {
+        "events": collected,
+        "result": None,
+        "session_id": None,
+        "cost_usd": 0,
+        "is_error": True,
+        "stderr": stderr_text,
+        "process_died": True,
+    }
+
+
+async def run_claude_turn(args: list[str], on_line=None, session: "AgentSession | None" = None) -> dict:
+    """
+    Launch a claude subprocess with the given args.
+    Read stdout line by line for real-time stream-json output.
+    Returns when the subprocess exits; cancelling terminates it.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=session.cwd if session is not None else REPO_ROOT,
+        limit=STREAM_LINE_LIMIT,
+        start_new_session=True,
+    )
+
+    # Track for graceful shutdown
+    if session is not None:
+        session._current_proc = proc
+
+    # Drain stderr alongside stdout so a chatty process never blocks on a full pipe.
+    stderr_task = asyncio.create_task(proc.stderr.read())
+    try:
+        collected, result_event = await read_events(proc.stdout, on_line)
+
+        # stdout closed — wait for process to finish
         try:
-            stderr_text = proc.stderr.read()
-        except Exception:
-            pass
-        if stderr_text:
-            log_warn(f"Subprocess stderr: {stderr_text[:500]}")
-        return {
-            "events": collected,
-            "result": None,
-            "session_id": None,
-            "cost_usd": 0,
-            "is_error": True,
-            "stderr": stderr_text,
-            "process_died": True,
-        }
+            await asyncio.wait_for(proc.wait(), 30)
+        except asyncio.TimeoutError:
+            await stop_process(proc)
+        stderr_text = (await stderr_task).decode(errors="replace")
+    finally:
+        if proc.returncode is None:
+            await stop_process(proc, grace=0)
+        stderr_task.cancel()
+        if session is not None:
+            session._current_proc = None
+
+    return turn_result(collected, result_event, "" if result_event else stderr_text)
 
 # ============================================================
-# AgentSession — print + resume session management
+# StreamChannel — one persistent claude process, many turns
+# ============================================================
+
+class StreamChannel:
+    """
+    A long-lived `claude --print --input-format stream-json` process.
+
+    send() writes one user message to stdin and reads stdout until that
+    turn's result event; the process then waits for the next message.
+    stderr is drained by a task (the pipe would otherwise fill up over a
+    long session) and its tail kept for diagnostics.
+    """
+
+    def __init__(self, proc: asyncio.subprocess.Process):
+        self.proc = proc
+        self.turns = 0
+        self.cost_reported = 0.0  # the process's running total_cost_usd, as of its last result
+        self._stderr: deque[str] = deque(maxlen=50)
+        self._stderr_task = asyncio.create_task(self._drain_stderr())
+
+    @classmethod
+    async def open(cls, args: list[str], cwd: Path = REPO_ROOT) -> "StreamChannel":
+        proc = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,
+            limit=STREAM_LINE_LIMIT,
+            start_new_session=True,
+        )
+        return cls(proc)
+
+    async def _drain_stderr(self):
+        while line := await self.proc.stderr.readline():
+            self._stderr.append(line.decode(errors="replace").rstrip("\n"))
+
+    def stderr_tail(self) -> str:
+        return "\n".join(self._stderr)
+
+    def is_alive(self) -> bool:
+        return self.proc.returncode is None
+
+    async def send(self, text: str, on_line=None) -> dict:
+        message = {"type": "user", "message": {"role": "user", "content": [{"type": "text", "text": text}]}}
+        try:
+            self.proc.stdin.write((json.dumps(message) + "\n").encode())
+            await self.proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            return turn_result([], None, self.stderr_tail())
+        collected, result_event = await read_events(self.proc.stdout, on_line, stop_at_result=True)
+        self.turns += 1
+        if not result_event:
+            # EOF mid-turn: let the process finish exiting so stderr is complete.
+            try:
+                await asyncio.wait_for(self.proc.wait(), 5)
+                await asyncio.wait_for(self._stderr_task, 5)
+            except asyncio.TimeoutError:
+                pass
+        result = turn_result(collected, result_event, "" if result_event else self.stderr_tail())
+        if result_event:
+            # A persistent process reports its cost so far, not this turn's.
+            running = result["cost_usd"] or 0.0
+            result["cost_usd"] = max(running - self.cost_reported, 0.0)
+            self.cost_reported = running
+        return result
+
+    async def close(self):
+        """Stop the process (the session itself lives on, resumable by id)."""
+        await stop_process(self.proc)
+        self._stderr_task.cancel()
+
+# ============================================================
+# AgentSession — persistent stream session, print + resume fallback
 # ============================================================
 
 class AgentSession:
     """
-    Manages a Claude Code session using --print and --resume.
+    Manages a Claude Code session.
 
+    In "stream" mode the session is one StreamChannel: start() launches it and
+    sends the initial prompt, send_and_read() writes the next message to the
+    same process. A channel that has died is relaunched with --resume
+    SESSION_ID on the next turn. If a fresh channel dies before finishing its
+    first turn (e.g. a CLI without --input-format stream-json), the session
+    falls back to "print" mode for good.
+
+    In "print" mode each turn is a separate subprocess:
     start() launches: claude --print PROMPT [flags] --output-format stream-json
     send_and_read() launches: claude --print PROMPT --resume SESSION_ID [flags] --output-format stream-json
 
-    Each turn is a separate subprocess invocation. The session persists
-    via session_id which is captured from the result event.
+    Either way the session persists via session_id, captured from the result event.
     """
 
-    def __init__(self, name: str, initial_prompt: str, model: str = None):
+    def __init__(self, name: str, initial_prompt: str, model: str = None, mode: str = None,
+                 cwd: Path = None, phase: int | None = None):
         self.name = name
         self.initial_prompt = initial_prompt
         self.model = model or CONFIG["claude_model"]
+        self.mode = mode or CONFIG["session_mode"]
+        self.cwd = cwd or REPO_ROOT  # a phase worktree under --parallel; the supervisor's own
+        self.phase = phase            # under --parallel; else the ledger uses BUILD_STATE.json's
         self.turn_count = 0
         self.total_cost = 0.0
         self.session_id: str | None = None
-        self._current_proc: subprocess.Popen | None = None
+        self._died_mid_turn = False  # the next turn relaunches with --resume
+        self._current_proc: asyncio.subprocess.Process | None = None
+        self._channel: StreamChannel | None = None
 
     def _common_flags(self) -> list[str]:
         return [
@@ -377,63 +583,115 @@ class AgentSession:
             "--output-format", "stream-json", "--verbose",
         ]
 
-    def start(self, on_line=None) -> dict:
-        """Launch initial turn — creates a new session."""
-        args = ["claude", "--print", self.initial_prompt] + self._common_flags()
-        result = run_claude_turn(args, on_line=on_line, session=self)
+    async def _stream_turn(self, text: str, on_line=None) -> dict | None:
+        """
+        One turn over the persistent channel, (re)launching it if needed.
+        Returns None if a fresh channel could not complete a turn, after
+        switching this session to print mode.
+        """
+        if self._channel is None or not self._channel.is_alive():
+            args = ["claude", "--print", "--input-format", "stream-json"] + self._common_flags()
+            if self.session_id:
+                args += ["--resume", self.session_id]
+            self._channel = await StreamChannel.open(args, cwd=self.cwd)
+            self._current_proc = self._channel.proc
+        result = await self._channel.send(text, on_line=on_line)
+        if result.get("process_died") and self._channel.turns <= 1 and not result["events"]:
+            log_warn(f"{self.name}: persistent session unavailable; falling back to print + resume")
+            await self._close_channel()
+            self.mode = "print"
+            return None
+        if result.get("process_died"):
+            await self._close_channel()
+        return result
+
+    async def _close_channel(self):
+        if self._channel is not None:
+            await self._channel.close()
+        self._channel = None
+        self._current_proc = None
+
+    def _record_turn(self, result: dict, cost_before: float, started: float):
+        if LEDGER is not None:
+            LEDGER.record_turn(self.name, self.total_cost - cost_before, time.monotonic() - started,
+                               session_id=self.session_id, phase=self.phase, turn=self.turn_count,
+                               process_died=result.get("process_died", False),
+                               is_error=result.get("is_error", False))
+
+    async def start(self, on_line=None) -> dict:
+        """Launch initial turn — creates a new session.
+
+        A restarted session keeps its turn count and cost: they are what this
+        session has spent, which the cost caps add up.
+        """
+        started, cost_before = time.monotonic(), self.total_cost
+        result = await self._stream_turn(self.initial_prompt, on_line) if self.mode == "stream" else None
+        if result is None:
+            args = ["claude", "--print", self.initial_prompt] + self._common_flags()
+            result = await run_claude_turn(args, on_line=on_line, session=self)
         if result.get("session_id"):
             self.session_id = result["session_id"]
-        self.turn_count = 1
-        self.total_cost = result.get("cost_usd", 0)
+        self._died_mid_turn = False
+        self.turn_count += 1
+        self.total_cost += result.get("cost_usd", 0)
+        self._record_turn(result, cost_before, started)
         return result
 
-    def send_and_read(self, text: str, on_line=None) -> dict:
-        """Resume the session with a new prompt. Launches a new subprocess."""
+    async def send_and_read(self, text: str, on_line=None) -> dict:
+        """Send the next prompt: over the live channel, else by resuming in a new subprocess."""
         if not self.session_id:
             raise RuntimeError(f"{self.name}: no session_id to resume")
-        args = (
-            ["claude", "--print", text, "--resume", self.session_id]
-            + self._common_flags()
-        )
-        result = run_claude_turn(args, on_line=on_line, session=self)
+        started, cost_before = time.monotonic(), self.total_cost
+        result = await self._stream_turn(text, on_line) if self.mode == "stream" else None
+        if result is None:
+            args = (
+                ["claude", "--print", text, "--resume", self.session_id]
+                + self._common_flags()
+            )
+            result = await run_claude_turn(args, on_line=on_line, session=self)
         self.turn_count += 1
         self.total_cost += result.get("cost_usd", 0)
         # Update session_id if returned (should stay the same)
         if result.get("session_id"):
             self.session_id = result["session_id"]
+        if result.get("process_died"):
+            # Keep session_id so the next turn resumes the conversation; drop it
+            # only if this turn was that resume and it produced nothing at all.
+            if self._died_mid_turn and not result["events"]:
+                log_warn(f"{self.name}: could not resume session {self.session_id}; starting fresh")
+                self.session_id = None
+            self._died_mid_turn = True
+        else:
+            self._died_mid_turn = False
+        self._record_turn(result, cost_before, started)
         return result
 
     def is_alive(self) -> bool:
         """Session is resumable if we have a session_id."""
         return self.session_id is not None
 
-    def kill(self):
+    async def kill(self):
         """Kill any running subprocess for this session."""
-        if self._current_proc and self._current_proc.poll() is None:
-            self._current_proc.terminate()
-            try:
-                self._current_proc.wait(timeout=10)
-            except subprocess.TimeoutExpired:
-                self._current_proc.kill()
-                self._current_proc.wait()
+        if self._channel is not None:
+            await self._close_channel()
+        if self._current_proc is not None:
+            await stop_process(self._current_proc)
         self._current_proc = None
 
-    def restart(self, on_line=None):
+    async def restart(self, on_line=None):
         """Start a fresh session (new session_id)."""
-        self.kill()
+        await self.kill()
         self.session_id = None
-        self.turn_count = 0
-        self.total_cost = 0.0
-        return self.start(on_line=on_line)
+        return await self.start(on_line=on_line)
 
 # ============================================================
 # Session Start with Retry
 # ============================================================
 
-def start_session_with_retry(session: AgentSession, on_line=None, max_retries: int = 3) -> dict:
+async def start_session_with_retry(session: AgentSession, on_line=None, max_retries: int = 3) -> dict:
     for attempt in range(max_retries):
         try:
-            result = session.start(on_line=on_line)
+            result = await session.start(on_line=on_line)
             if not result.get("process_died"):
                 return result
             log_warn(f"{session.name} process died on start (attempt {attempt + 1})")
@@ -441,11 +699,11 @@ def start_session_with_retry(session: AgentSession, on_line=None, max_retries: i
             log_warn(f"{session.name} start attempt {attempt + 1} failed: {e}")
         wait = 30 * (2 ** attempt)
         log_info(f"Retrying in {wait}s...")
-        time.sleep(wait)
+        await asyncio.sleep(wait)
 
-    write_needs_human(f"Failed to start {session.name} session after {max_retries} attempts")
-    wait_for_human()
-    return start_session_with_retry(session, on_line=on_line, max_retries=max_retries)
+    await write_needs_human(f"Failed to start {session.name} session after {max_retries} attempts")
+    await wait_for_human()
+    return await start_session_with_retry(session, on_line=on_line, max_retries=max_retries)
 
 # ============================================================
 # BuildMonitor — real-time output analysis
@@ -516,7 +774,8 @@ CORRECTIONS = {
 # Escalation Logic
 # ============================================================
 
-def should_escalate(state_before: dict, state_after: dict, no_progress_turns: int) -> tuple[bool, str]:
+async def should_escalate(state_before: dict, state_after: dict, no_progress_turns: int,
+                          build_result: BuildResult | None = None) -> tuple[bool, str]:
     # Phase transition
     if state_after.get("current_phase", 0) > state_before.get("current_phase", 0):
         return True, "phase_transition"
@@ -525,16 +784,9 @@ def should_escalate(state_before: dict, state_after: dict, no_progress_turns: in
     if no_progress_turns >= CONFIG["max_no_progress_for_escalation"]:
         return True, "repeated_stuck"
 
-    # Build broken
-    try:
-        build = subprocess.run(
-            ["pnpm", "build"], capture_output=True, text=True,
-            cwd=REPO_ROOT, timeout=120,
-        )
-        if build.returncode != 0:
-            return True, "build_broken"
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        log_warn("Could not run pnpm build for escalation check")
+    # Build broken (latest finished build-health check; see runner/build_health.py)
+    if build_result is not None and not build_result.ok:
+        return True, "build_broken"
 
     # Multiple blockers
     if len(state_after.get("blocking_issues", [])) >= 3:
@@ -563,7 +815,8 @@ def build_escalation_message(reason: str, context: dict) -> str:
         parts.append(f"\nBuild error output:\n```\n{context.get('build_error', 'unknown')}\n```")
 
     parts.append("\nFollow your framework: DIAGNOSE -> ROOT CAUSE -> ALTERNATIVES -> DECISION -> ACTION")
-    parts.append("Write GUIDANCE.md (or NEEDS_HUMAN.md if beyond scope), commit, push.")
+    parts.append("Write GUIDANCE.md (or NEEDS_HUMAN.md if beyond scope), commit, "
+                 "and push with `git push origin HEAD:main`.")
 
     return "\n\n".join(parts)
 
@@ -571,12 +824,15 @@ def build_escalation_message(reason: str, context: dict) -> str:
 # Escalation Flow
 # ============================================================
 
-def escalate_to_supervisor(
+async def escalate_to_supervisor(
     supervisor_session: AgentSession,
     context: dict,
 ) -> tuple[str, str | None]:
     """
-    Send escalation to the Supervisor agent.
+    Send escalation to the Supervisor agent. Runs as a task alongside the
+    build agent's next turn; the main loop applies the outcome when it lands.
+    The supervisor works in its own worktree (see run_build), and the runner
+    only fetches its push here: REPO_ROOT is pulled between build turns.
     Returns (status, guidance_prompt_for_build).
     status is one of: "needs_human", "guidance_sent", "no_guidance"
     guidance_prompt_for_build is the prompt to send to the build agent on next resume,
@@ -587,27 +843,27 @@ def escalate_to_supervisor(
     # Ensure supervisor has a session
     if not supervisor_session.is_alive():
         log_info("Supervisor session lost. Restarting...")
-        start_session_with_retry(supervisor_session, on_line=log_supervisor_line)
+        await start_session_with_retry(supervisor_session, on_line=log_supervisor_line)
 
     log_info("[SUPERVISOR] Sending escalation...")
 
     # Tell supervisor to git pull first
     full_message = f"First run: git pull origin main\n\nThen handle this:\n\n{message}"
-    result = supervisor_session.send_and_read(full_message, on_line=log_supervisor_line)
+    result = await supervisor_session.send_and_read(full_message, on_line=log_supervisor_line)
 
     log_info(f"[SUPERVISOR] Done. Cost: ${result.get('cost_usd', 0):.2f}")
 
     if result.get("process_died"):
-        log_warn("Supervisor process died during escalation.")
-        supervisor_session.session_id = None  # Force restart next time
+        log_warn("Supervisor process died during escalation; it is resumed next time.")
 
-    # Runner pulls to get GUIDANCE.md or NEEDS_HUMAN.md
-    git_pull()
+    # The build agent may be mid-turn in REPO_ROOT: look for GUIDANCE.md or
+    # NEEDS_HUMAN.md on origin/main; the next pre-turn pull brings them in.
+    await git_fetch()
 
-    if NEEDS_HUMAN_FILE.exists():
+    if NEEDS_HUMAN_FILE.exists() or await on_origin(NEEDS_HUMAN_FILE.name):
         return "needs_human", None
 
-    if GUIDANCE_FILE.exists():
+    if await on_origin(GUIDANCE_FILE.name):
         guidance_prompt = (
             "Run git pull origin main. Read GUIDANCE.md and follow its instructions. "
             "Delete GUIDANCE.md when done, commit the deletion, then continue building."
@@ -620,7 +876,8 @@ def escalate_to_supervisor(
 # NEEDS_HUMAN Handling
 # ============================================================
 
-def write_needs_human(reason: str):
+async def write_needs_human(reason: str):
+    record("needs_human", reason=reason)
     content = (
         f"# Human Intervention Needed\n\n"
         f"**Generated at:** {datetime.now(timezone.utc).isoformat()}\n"
@@ -628,15 +885,13 @@ def write_needs_human(reason: str):
         f"Delete this file and push to resume.\n"
     )
     NEEDS_HUMAN_FILE.write_text(content)
-    subprocess.run(["git", "add", "NEEDS_HUMAN.md"], cwd=REPO_ROOT, capture_output=True)
-    subprocess.run(
-        ["git", "commit", "-m", "PAUSED: needs human intervention"],
-        cwd=REPO_ROOT, capture_output=True,
-    )
-    subprocess.run(["git", "push", "origin", "main"], cwd=REPO_ROOT, capture_output=True)
+    async with GIT_LOCK:
+        await run_command(["git", "add", "NEEDS_HUMAN.md"])
+        await run_command(["git", "commit", "-m", "PAUSED: needs human intervention"])
+        await run_command(["git", "push", "origin", "main"])
 
 
-def wait_for_human():
+async def wait_for_human():
     log_info("=" * 50)
     log_info(" PAUSED — HUMAN INTERVENTION NEEDED")
     log_info(" Read NEEDS_HUMAN.md for details")
@@ -644,13 +899,43 @@ def wait_for_human():
     log_info("=" * 50)
 
     while True:
-        time.sleep(CONFIG["needs_human_poll_seconds"])
-        git_pull()
+        await asyncio.sleep(CONFIG["needs_human_poll_seconds"])
+        await git_pull()
         if not NEEDS_HUMAN_FILE.exists():
             log_info("NEEDS_HUMAN.md removed. Resuming build.")
             return
         log_info(f"Waiting for human... ({datetime.now().strftime('%H:%M')})")
 
+# ============================================================
+# RepoWatcher — background git sync while turns run
+# ============================================================
+
+class RepoWatcher:
+    """
+    Fetches origin/main every git_sync_seconds and notices NEEDS_HUMAN.md,
+    locally or on the remote, while the build agent is mid-turn. Fetching
+    never touches the working tree the agent is editing; the post-turn pull
+    then only has to fast-forward.
+    """
+
+    def __init__(self, interval: float | None = None):
+        self.interval = interval or CONFIG["git_sync_seconds"]
+        self.needs_human = asyncio.Event()
+
+    async def _remote_needs_human(self) -> bool:
+        await git_fetch()
+        return await on_origin("NEEDS_HUMAN.md")
+
+    async def run(self):
+        while True:
+            if NEEDS_HUMAN_FILE.exists() or await self._remote_needs_human():
+                if not self.needs_human.is_set():
+                    log_warn("NEEDS_HUMAN.md appeared — pausing after the current turn.")
+                self.needs_human.set()
+            else:
+                self.needs_human.clear()
+            await asyncio.sleep(self.interval)
+
 # ============================================================
 # Agent Prompts
 # ============================================================
@@ -684,10 +969,41 @@ BUILD_CONTINUE_PROMPT = (
     "delete it, commit. Then continue building from where you left off."
 )
 
+PHASE_BUILD_PROMPT = """You are a Build Agent for M&A Deal OS, building Phase {phase} only. You are working in a dedicated git worktree on branch {branch}; other phases are being built at the same time in other worktrees.
+
+PROTOCOL:
+1. Run `pnpm install` if node_modules is missing.
+2. Read skills/phase-{phase:02d}.md and execute its steps in order, following the build-test-commit loop:
+   - Build the step
+   - Run the specified tests
+   - If tests pass: git add, commit with "[Phase {phase}.Y] Description — tests: N/M passing"
+   - If tests fail: retry up to 3 times, then commit as [WIP] and note the blocker in the test report
+3. Commit on this branch only. Do not push, pull, merge or switch branches: the runner merges {branch} into main when the phase is done.
+4. Do not edit BUILD_STATE.json or skills/current-phase.md; the runner tracks phase progress.
+5. Touch only what this phase needs. Never break existing functionality.
+6. When every step is done: write docs/test-results/phase{phase}_test_report.md, commit it, and end your reply with the line PHASE {phase} COMPLETE.
+
+Start now."""
+
+PHASE_CONTINUE_PROMPT = (
+    "Continue building Phase {phase} from where you left off. When every step is done and "
+    "docs/test-results/phase{phase}_test_report.md is committed, end your reply with the line "
+    "PHASE {phase} COMPLETE."
+)
+
+PHASE_CONFLICT_PROMPT = (
+    "The runner could not merge {branch} into main; these files conflict with phases merged "
+    "since you started: {files}. Run `git merge main` in this worktree, resolve the conflicts so "
+    "both phases' changes survive, re-run this phase's tests, and commit the merge. Then end your "
+    "reply with the line PHASE {phase} COMPLETE."
+)
+
 SUPERVISOR_INIT_PROMPT = """You are the Supervisor Agent for the M&A Deal OS autonomous build.
 
 YOUR ROLE: You oversee a Build Agent (a separate Claude Code session) that follows skill files to build the system phase by phase. You are consulted when the Build Agent gets stuck, and at phase transitions for readiness review.
 
+You work in your own checkout of main (a detached worktree), not the Build Agent's. Pull with `git pull origin main` and push with `git push origin HEAD:main`; if the push is rejected, pull again and retry.
+
 READ THESE FILES NOW to understand the project:
 - CLAUDE.md (build protocol)
 - BUILD_STATE.json (current state)
@@ -797,203 +1113,527 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--max-cost", type=float, default=200.0)
     parser.add_argument("--no-supervisor", action="store_true")
     parser.add_argument("--skip-api-checks", action="store_true")
+    parser.add_argument("--parallel", type=int, default=1, metavar="N",
+                        help="Build up to N independent phases at once, each in its own git "
+                             "worktree (default 1: one phase after another off BUILD_STATE.json)")
+    parser.add_argument("--show-dag", action="store_true",
+                        help="Print the phase dependency graph from the skill files and exit")
+    parser.add_argument("--build-check", choices=BUILD_CHECKS, default=CONFIG["build_check"],
+                        help="Escalation build check: scoped incremental tsc, or the full pnpm build")
+    parser.add_argument("--session-mode", choices=SESSION_MODES, default=CONFIG["session_mode"],
+                        help="stream: one persistent process per session (default); "
+                             "print: a new --print --resume process per turn")
     return parser.parse_args()
 
 # ============================================================
-# Main Loop
+# Parallel Phases — dependency-graph scheduler
 # ============================================================
 
-def main():
-    args = parse_args()
-    CONFIG["claude_model"] = args.model
+def show_dag():
+    graph = load_phase_graph(SKILLS_DIR)
+    state = load_build_state()
+    done = set(state.get("phases_completed", []))
+    for phase, deps in graph.items():
+        mark = "done" if phase in done else ""
+        print(f"  Phase {phase:>2}  needs {', '.join(map(str, sorted(deps))) or '-':<40} {mark}")
+    print("\nWaves (phases in a wave can run side by side):")
+    for i, wave in enumerate(levels(graph), 1):
+        print(f"  {i:>2}. {', '.join(map(str, wave))}")
+    path = critical_path(graph)
+    print(f"\nCritical path: {len(path)} of {len(graph)} phases ({' -> '.join(map(str, path))})")
+
+
+def phase_complete(result: dict, phase: int, worktree: Path) -> bool:
+    text = (result.get("result") or {}).get("result") or ""
+    report = worktree / "docs" / "test-results" / f"phase{phase}_test_report.md"
+    return f"PHASE {phase} COMPLETE" in text and report.exists()
+
+
+# Merges into main and BUILD_STATE.json updates happen in REPO_ROOT, one at a time.
+# Pausing the phases takes the lock too, so a merge is never cut off halfway.
+MERGE_LOCK = asyncio.Lock()
+
+async def record_phase_merged(phase: int, scheduler: PhaseScheduler):
+    """Runner-owned progress in BUILD_STATE.json: the phase agents never touch it."""
+    state = dict(load_build_state())
+    completed = set(state.get("phases_completed", [])) | {phase}
+    state["phases_completed"] = sorted(completed)
+    state["phases_in_progress"] = sorted(scheduler.running)
+    pending = scheduler.pending()
+    state["current_phase"] = min(pending + sorted(scheduler.running), default=max(completed) + 1)
+    with open(BUILD_STATE_FILE, "w") as f:
+        json.dump(state, f, indent=2)
+        f.write("\n")
+    async with GIT_LOCK:
+        await run_command(["git", "add", "BUILD_STATE.json"])
+        await run_command(["git", "commit", "-m", f"[Phase {phase}] Merged; BUILD_STATE.json updated"])
+        await run_command(["git", "push", "origin", "main"])
+
+
+async def merge_phase(phase: int) -> list[str]:
+    """Merge phase-NN into main in REPO_ROOT (caller holds MERGE_LOCK); the conflicting paths, if any."""
+    async with GIT_LOCK:
+        return await asyncio.to_thread(
+            merge_branch, REPO_ROOT, branch_name(phase),
+            f"[Phase {phase}] Merge {branch_name(phase)}",
+        )
 
-    run_preflight_checks(skip_api=args.skip_api_checks)
 
-    if args.dry_run:
-        log_ok("Pre-flight checks passed. Dry run — not launching.")
-        state = load_build_state()
-        log_info(f"Would start at Phase {state.get('current_phase')}, Step {state.get('current_step')}")
-        return
+async def run_phase(phase: int, scheduler: PhaseScheduler, costs: dict, sessions: dict,
+                    args: argparse.Namespace) -> bool:
+    """Build one phase in its own worktree until it is merged into main; False if it gave up.
 
-    # Initialize
-    git_pull()
+    A phase cancelled by a pause keeps its session in `sessions` (and its
+    worktree); running it again resumes that session where it stopped.
+    """
+    branch = branch_name(phase)
+
+    def on_line(line):
+        log_build_line(f"[P{phase:02d}] {line}")
+
+    session = sessions.get(phase)
+    if session is None:
+        async with GIT_LOCK:
+            worktree = await asyncio.to_thread(add_worktree, REPO_ROOT, phase)
+        log_info(f"Phase {phase}: started on {branch} in {worktree}")
+        session = sessions[phase] = AgentSession(
+            branch, PHASE_BUILD_PROMPT.format(phase=phase, branch=branch),
+            model=args.model, cwd=worktree, phase=phase,
+        )
+        resuming = False
+    else:
+        worktree = session.cwd
+        log_info(f"Phase {phase}: resuming on {branch} after {session.turn_count} turns")
+        resuming = session.is_alive()
+    merge_attempts = 0
+    try:
+        if resuming:
+            result = await session.send_and_read(PHASE_CONTINUE_PROMPT.format(phase=phase), on_line=on_line)
+        else:
+            result = await start_session_with_retry(session, on_line=on_line)
+        while session.turn_count < CONFIG["max_turns_per_phase"]:
+            costs[phase] = session.total_cost
+            if phase_complete(result, phase, worktree):
+                async with MERGE_LOCK:
+                    conflicts = await merge_phase(phase)
+                    if not conflicts:
+                        scheduler.finish(phase)
+                        await record_phase_merged(phase, scheduler)
+                if not conflicts:
+                    record("phase_merged", session=branch, phase=phase, total_cost_usd=session.total_cost,
+                           turns=session.turn_count, merge_attempts=merge_attempts + 1)
+                    log_ok(f"Phase {phase}: merged into main after {session.turn_count} turns "
+                           f"(${session.total_cost:.2f})")
+                    sessions.pop(phase, None)
+                    return True
+                merge_attempts += 1
+                log_warn(f"Phase {phase}: merge conflicts in {', '.join(conflicts)}")
+                if merge_attempts >= CONFIG["max_merge_attempts"]:
+                    break
+                prompt = PHASE_CONFLICT_PROMPT.format(phase=phase, branch=branch, files=", ".join(conflicts))
+            else:
+                prompt = PHASE_CONTINUE_PROMPT.format(phase=phase)
+
+            if sum(costs.values()) > args.max_cost:
+                log_warn(f"Phase {phase}: cost limit reached; stopping.")
+                break
+            if not session.is_alive():
+                log_warn(f"Phase {phase}: session lost. Starting fresh.")
+                await session.kill()
+                result = await start_session_with_retry(session, on_line=on_line)
+                continue
+            result = await session.send_and_read(prompt, on_line=on_line)
+            if result.get("process_died"):
+                log_warn(f"Phase {phase}: build process died mid-turn. Resuming its session.")
+        costs[phase] = session.total_cost
+        scheduler.fail(phase)
+        record("phase_failed", session=branch, phase=phase, total_cost_usd=session.total_cost,
+               turns=session.turn_count, merge_attempts=merge_attempts)
+        sessions.pop(phase, None)
+        return False
+    finally:
+        costs[phase] = session.total_cost
+        await session.kill()
+
+
+async def pause_phases(tasks: dict) -> list[int]:
+    """Stop every running phase agent now; the phases to resume afterwards.
+
+    Their sessions and worktrees are kept. Phases that finished meanwhile
+    stay in `tasks` for the caller to collect.
+    """
+    async with MERGE_LOCK:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    paused = [phase for task, phase in tasks.items() if task.cancelled()]
+    for task in [task for task in tasks if task.cancelled()]:
+        del tasks[task]
+    return paused
+
+
+async def run_dag(args: argparse.Namespace):
+    """Build every pending phase, up to args.parallel at a time, in dependency order.
+
+    When NEEDS_HUMAN.md appears (locally or on origin/main) every phase agent
+    is stopped at once, mid-turn if need be, and resumed once it is gone.
+    """
+    asyncio.get_running_loop().add_signal_handler(signal.SIGINT, handle_sigint, asyncio.current_task())
+    await git_pull()
+    graph = load_phase_graph(SKILLS_DIR)
     state = load_build_state()
-    update_symlink(state.get("current_phase", 3))
+    scheduler = PhaseScheduler(graph, done=set(state.get("phases_completed", [])))
+    path = critical_path({p: d for p, d in graph.items() if p not in scheduler.done})
 
     log_info("=" * 50)
-    log_info("  M&A DEAL OS — AUTONOMOUS BUILD V2")
-    log_info(f"  Starting Phase {state.get('current_phase')}, Step {state.get('current_step')}")
+    log_info("  M&A DEAL OS — AUTONOMOUS BUILD V2 (parallel phases)")
+    log_info(f"  Pending phases: {', '.join(map(str, scheduler.pending())) or 'none'}")
+    log_info(f"  Critical path: {len(path)} phases")
+    log_info(f"  Parallel: {args.parallel}")
     log_info(f"  Model: {args.model}")
-    log_info(f"  Max turns: {args.max_turns}")
     log_info(f"  Max cost: ${args.max_cost:.2f}")
-    log_info(f"  Supervisor: {'disabled' if args.no_supervisor else 'enabled'}")
     log_info("=" * 50)
 
-    # Start Build Agent
-    log_info("Starting Build Agent...")
-    build = AgentSession("build", BUILD_INIT_PROMPT, model=args.model)
-    init_result = start_session_with_retry(build, on_line=log_build_line)
-    log_ok(f"Build Agent ready. Session: {build.session_id}")
-
-    # Start Supervisor (unless disabled)
-    supervisor: AgentSession | None = None
-    if not args.no_supervisor:
-        log_info("Starting Supervisor...")
-        supervisor = AgentSession("supervisor", SUPERVISOR_INIT_PROMPT, model=args.model)
-        sup_result = start_session_with_retry(supervisor, on_line=log_supervisor_line)
-        log_ok(f"Supervisor ready. Session: {supervisor.session_id}")
-
-    # Save session IDs to BUILD_STATE.json
-    save_session_ids(
-        build.session_id,
-        supervisor.session_id if supervisor else None,
-    )
+    costs: dict[int, float] = {}
+    sessions: dict[int, AgentSession] = {}  # running or paused phases
+    tasks: dict[asyncio.Task, int] = {}
+    watcher = RepoWatcher()
+    watcher_task = asyncio.create_task(watcher.run(), name="repo-watcher")
+    needs_human = asyncio.create_task(watcher.needs_human.wait())
+
+    def launch(phase: int):
+        tasks[asyncio.create_task(run_phase(phase, scheduler, costs, sessions, args),
+                                  name=branch_name(phase))] = phase
+
+    async def collect(task: asyncio.Task):
+        phase = tasks.pop(task)
+        if task.exception() is not None:
+            log_error(f"Phase {phase}: {task.exception()}")
+            scheduler.fail(phase)
+            ok = False
+        else:
+            ok = task.result()
+        if ok:
+            async with GIT_LOCK:
+                await asyncio.to_thread(remove_worktree, REPO_ROOT, phase, True)
+        else:
+            log_warn(f"Phase {phase}: not completed; its worktree is kept for inspection. "
+                     f"Blocked: {', '.join(map(str, scheduler.blocked())) or 'nothing'}")
 
-    # Tracking
-    monitor = BuildMonitor()
-    no_progress_turns = 0
-    supervisor_calls_this_step = 0
-    next_prompt: str | None = None  # Override for next turn's prompt (course corrections / guidance)
+    try:
+        while True:
+            if NEEDS_HUMAN_FILE.exists() or watcher.needs_human.is_set():
+                await git_pull()
+                if NEEDS_HUMAN_FILE.exists():
+                    paused = await pause_phases(tasks)
+                    for task in list(tasks):
+                        await collect(task)
+                    if paused:
+                        log_info(f"Paused phases {', '.join(map(str, paused))}; "
+                                 f"their sessions and worktrees are kept.")
+                    await wait_for_human()
+                    for phase in paused:
+                        launch(phase)
+                watcher.needs_human.clear()
+                needs_human.cancel()
+                needs_human = asyncio.create_task(watcher.needs_human.wait())
+            if sum(costs.values()) <= args.max_cost:
+                for phase in scheduler.ready()[:args.parallel - len(tasks)]:
+                    scheduler.start(phase)
+                    launch(phase)
+            if not tasks:
+                break
+            finished, _ = await asyncio.wait([*tasks, needs_human], return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                if task is not needs_human:
+                    await collect(task)
+    except asyncio.CancelledError:
+        log_info("Shutdown requested. Cleaning up.")
+    finally:
+        for task in (*tasks, watcher_task, needs_human):
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        log_info(f"Runner finished. Total cost: ${sum(costs.values()):.2f}")
+
+    if scheduler.failed or scheduler.blocked():
+        await write_needs_human(
+            f"Parallel build stopped. Failed: {sorted(scheduler.failed)}; "
+            f"blocked behind them: {scheduler.blocked()}. Worktrees are under "
+            f"{REPO_ROOT.parent / (REPO_ROOT.name + '-worktrees')}."
+        )
+    elif not scheduler.pending() and not scheduler.running:
+        log_info("*  *  *  BUILD COMPLETE  *  *  *")
 
-    for turn in range(args.max_turns):
-        if shutdown_requested:
-            log_info("Shutdown requested. Cleaning up.")
-            break
+# ============================================================
+# Main Loop
+# ============================================================
 
-        # Check completion
-        state = load_build_state()
-        if state.get("current_phase", 0) > 14 or (REPO_ROOT / "BUILD_COMPLETE").exists():
-            log_info("*  *  *  BUILD COMPLETE  *  *  *")
-            break
+def start_build_check(health: BuildHealth) -> asyncio.Task:
+    full = CONFIG["build_check"] == "full"
+    return asyncio.create_task(asyncio.to_thread(health.check, full), name="build-health")
 
-        # Check NEEDS_HUMAN
-        if NEEDS_HUMAN_FILE.exists():
-            wait_for_human()
-
-        # Check cost limits
-        total_cost = build.total_cost + (supervisor.total_cost if supervisor else 0)
-        if total_cost > args.max_cost:
-            write_needs_human(f"Cost limit reached: ${total_cost:.2f}")
-            wait_for_human()
-
-        # Pre-turn
-        git_pull()
-        state_before = load_build_state()
-        monitor.reset_turn()
-
-        # Determine prompt for this turn
-        prompt = next_prompt or BUILD_CONTINUE_PROMPT
-        next_prompt = None  # Reset
-
-        # If build session has no session_id (died previously), restart it
-        if not build.is_alive():
-            log_warn("Build session lost. Starting fresh.")
-            build = AgentSession("build", BUILD_INIT_PROMPT, model=args.model)
-            start_session_with_retry(build, on_line=log_build_line)
-            save_session_ids(
-                build.session_id,
-                supervisor.session_id if supervisor else None,
-            )
-            continue  # The start already sent the init prompt; loop back for next turn
 
-        # Send turn
-        log_info(f"Turn {turn + 1}/{args.max_turns} — resuming session")
+async def finished_build_check(check: asyncio.Task | None, wait: float = 0) -> BuildResult | None:
+    """The check's result once it is done (waiting up to `wait` seconds), else None."""
+    if check is None:
+        return None
+    if not check.done():
+        await asyncio.wait({check}, timeout=wait)
+        if not check.done():
+            return None
+    try:
+        result = check.result()
+    except Exception as e:
+        log_warn(f"Could not run build check: {e}")
+        return None
+    (log_ok if result.ok else log_warn)(result.summary())
+    record("build_check", seconds=result.seconds, ok=result.ok, tree=result.tree,
+           packages=result.packages, mode=result.mode, cached=result.cached)
+    return result
 
-        def handle_build_line(line):
-            log_build_line(line)
-            monitor.process_line(line)
 
-        result = build.send_and_read(prompt, on_line=handle_build_line)
+def start_escalation(supervisor: AgentSession, context: dict) -> asyncio.Task:
+    log_info(f"Escalating to Supervisor ({context['reason']}); the build continues meanwhile.")
+    record("escalation", session="supervisor", reason=context["reason"],
+           no_progress_turns=context.get("no_progress_turns"))
+    return asyncio.create_task(escalate_to_supervisor(supervisor, context), name="escalation")
 
-        if result.get("process_died"):
-            log_warn("Build process died mid-turn. Will restart next iteration.")
-            build.session_id = None  # Force restart on next loop
-            continue
 
-        # Check monitor for pending intervention — use as next turn's prompt
-        if monitor.pending_intervention and monitor.pending_intervention in CORRECTIONS:
-            intervention = monitor.pending_intervention
-            log_warn(f"Intervention triggered: {intervention}")
-            next_prompt = CORRECTIONS[intervention]
+async def run_build(args: argparse.Namespace):
+    asyncio.get_running_loop().add_signal_handler(signal.SIGINT, handle_sigint, asyncio.current_task())
 
-        # Post-turn
-        git_pull()
-        state_after = load_build_state()
+    # Initialize
+    await git_pull()
+    state = load_build_state()
+    update_symlink(state.get("current_phase", 3))
 
-        # Track progress
-        same_step = (
-            state_after.get("current_step") == state_before.get("current_step") and
-            state_after.get("current_phase") == state_before.get("current_phase")
-        )
-        if same_step:
-            no_progress_turns += 1
-        else:
-            no_progress_turns = 0
-            supervisor_calls_this_step = 0
-
-        # Status
-        total_cost = build.total_cost + (supervisor.total_cost if supervisor else 0)
-        log_status(state_after, total_cost, turn + 1)
-
-        # Escalation check (only if supervisor enabled)
-        if supervisor and not args.no_supervisor:
-            should, reason = should_escalate(state_before, state_after, no_progress_turns)
-
-            if should:
-                if supervisor_calls_this_step >= CONFIG["max_supervisor_calls_per_step"]:
-                    write_needs_human(
-                        f"Supervisor consulted {CONFIG['max_supervisor_calls_per_step']} times on "
-                        f"Phase {state_after.get('current_phase')} "
-                        f"Step {state_after.get('current_step')} with no progress."
-                    )
-                    wait_for_human()
-                    supervisor_calls_this_step = 0
-                    continue
-
-                if not supervisor.is_alive():
-                    log_info("Supervisor session lost. Restarting...")
-                    supervisor = AgentSession("supervisor", SUPERVISOR_INIT_PROMPT, model=args.model)
-                    start_session_with_retry(supervisor, on_line=log_supervisor_line)
-                    save_session_ids(build.session_id, supervisor.session_id)
-
-                context = {
-                    "reason": reason,
-                    "phase": state_after.get("current_phase"),
-                    "step": state_after.get("current_step"),
-                    "no_progress_turns": no_progress_turns,
-                    "output_tail": monitor.get_tail(),
-                    "blocking_issues": state_after.get("blocking_issues", []),
-                }
-
-                if reason == "build_broken":
-                    try:
-                        build_err = subprocess.run(
-                            ["pnpm", "build"], capture_output=True, text=True,
-                            cwd=REPO_ROOT, timeout=120,
-                        )
-                        context["build_error"] = (build_err.stderr or build_err.stdout)[-500:]
-                    except (subprocess.TimeoutExpired, FileNotFoundError):
-                        context["build_error"] = "Could not capture build error"
+    log_info("=" * 50)
+    log_info("  M&A DEAL OS — AUTONOMOUS BUILD V2")
+    log_info(f"  Starting Phase {state.get('current_phase')}, Step {state.get('current_step')}")
+    log_info(f"  Model: {args.model}")
+    log_info(f"  Sessions: {args.session_mode}")
+    log_info(f"  Max turns: {args.max_turns}")
+    log_info(f"  Max cost: ${args.max_cost:.2f}")
+    log_info(f"  Supervisor: {'disabled' if args.no_supervisor else 'enabled'}")
+    log_info("=" * 50)
 
-                esc_status, guidance_prompt = escalate_to_supervisor(supervisor, context)
-                supervisor_calls_this_step += 1
+    build: AgentSession | None = None
+    supervisor: AgentSession | None = None
+    watcher = RepoWatcher()
+    watcher_task: asyncio.Task | None = None
+    escalation: asyncio.Task | None = None  # supervisor round-trip running alongside the build
+    health = BuildHealth(REPO_ROOT)
+    build_check: asyncio.Task | None = None  # build-health check of the tree the last turn left
 
+    try:
+        # Start Build Agent and Supervisor (unless disabled) side by side
+        log_info("Starting Build Agent...")
+        build = AgentSession("build", BUILD_INIT_PROMPT, model=args.model)
+        starts = [start_session_with_retry(build, on_line=log_build_line)]
+        if not args.no_supervisor:
+            log_info("Starting Supervisor...")
+            # Its own worktree, so its pulls and commits never touch the build agent's files mid-turn
+            async with GIT_LOCK:
+                supervisor_tree = await asyncio.to_thread(add_detached_worktree, REPO_ROOT, "supervisor")
+            supervisor = AgentSession("supervisor", SUPERVISOR_INIT_PROMPT, model=args.model,
+                                      cwd=supervisor_tree)
+            starts.append(start_session_with_retry(supervisor, on_line=log_supervisor_line))
+        await asyncio.gather(*starts)
+        log_ok(f"Build Agent ready. Session: {build.session_id}")
+        if supervisor:
+            log_ok(f"Supervisor ready. Session: {supervisor.session_id}")
+        watcher_task = asyncio.create_task(watcher.run(), name="repo-watcher")
+
+        # Tracking
+        monitor = BuildMonitor()
+        no_progress_turns = 0
+        supervisor_calls_this_step = 0
+        next_prompt: str | None = None  # Override for next turn's prompt (course corrections / guidance)
+
+        for turn in range(args.max_turns):
+            # Apply a finished escalation
+            if escalation and escalation.done():
+                try:
+                    esc_status, guidance_prompt = escalation.result()
+                except Exception as e:
+                    log_warn(f"Escalation failed: {e}")
+                    esc_status, guidance_prompt = "no_guidance", None
+                escalation = None
+                record("guidance", session="supervisor", status=esc_status)
                 if esc_status == "needs_human":
-                    wait_for_human()
+                    await wait_for_human()
                     supervisor_calls_this_step = 0
                 elif esc_status == "guidance_sent" and guidance_prompt:
                     # Override next turn's prompt to follow guidance
                     next_prompt = guidance_prompt
 
-        # Brief pause between turns
-        time.sleep(5)
+            # Check completion
+            state = load_build_state()
+            if state.get("current_phase", 0) > 14 or (REPO_ROOT / "BUILD_COMPLETE").exists():
+                log_info("*  *  *  BUILD COMPLETE  *  *  *")
+                break
+
+            # Check NEEDS_HUMAN (noticed in the background while the last turn ran)
+            if NEEDS_HUMAN_FILE.exists() or watcher.needs_human.is_set():
+                await git_pull()
+                if NEEDS_HUMAN_FILE.exists():
+                    await wait_for_human()
+                watcher.needs_human.clear()
+
+            # Check cost limits
+            total_cost = build.total_cost + (supervisor.total_cost if supervisor else 0)
+            if total_cost > args.max_cost:
+                await write_needs_human(f"Cost limit reached: ${total_cost:.2f}")
+                await wait_for_human()
+
+            # Pre-turn
+            await git_pull()
+            state_before = load_build_state()
+            monitor.reset_turn()
+
+            # Determine prompt for this turn
+            prompt = next_prompt or BUILD_CONTINUE_PROMPT
+            next_prompt = None  # Reset
+
+            # If build session has no session_id (died previously), restart it
+            if not build.is_alive():
+                log_warn("Build session lost. Starting fresh.")
+                await build.kill()
+                await start_session_with_retry(build, on_line=log_build_line)
+                continue  # The start already sent the init prompt; loop back for next turn
+
+            # Send turn
+            log_info(f"Turn {turn + 1}/{args.max_turns} — resuming session")
+
+            def handle_build_line(line):
+                log_build_line(line)
+                monitor.process_line(line)
+
+            result = await build.send_and_read(prompt, on_line=handle_build_line)
+
+            if result.get("process_died"):
+                log_warn("Build process died mid-turn. Resuming its session next iteration.")
+                continue
+
+            # Check monitor for pending intervention — use as next turn's prompt
+            if monitor.pending_intervention and monitor.pending_intervention in CORRECTIONS:
+                intervention = monitor.pending_intervention
+                log_warn(f"Intervention triggered: {intervention}")
+                record("intervention", session="build", name=intervention)
+                next_prompt = CORRECTIONS[intervention]
+
+            # Post-turn
+            await git_pull()
+            state_after = load_build_state()
+
+            # Track progress
+            same_step = (
+                state_after.get("current_step") == state_before.get("current_step") and
+                state_after.get("current_phase") == state_before.get("current_phase")
+            )
+            if same_step:
+                no_progress_turns += 1
+            else:
+                no_progress_turns = 0
+                supervisor_calls_this_step = 0
+
+            # Status
+            total_cost = build.total_cost + (supervisor.total_cost if supervisor else 0)
+            log_status(state_after, total_cost, turn + 1)
+
+            # Escalation check (only if supervisor enabled)
+            if supervisor and not args.no_supervisor:
+                # Check the tree this turn left; a cached or quick result counts now,
+                # a slow one runs alongside the next turn and is read after it.
+                build_result = None
+                if build_check is not None and build_check.done():
+                    build_result = await finished_build_check(build_check)
+                    build_check = None
+                if build_check is None:
+                    build_check = start_build_check(health)
+                    build_result = await finished_build_check(
+                        build_check, CONFIG["build_check_wait_seconds"]) or build_result
+                    if build_check.done():
+                        build_check = None
+                should, reason = await should_escalate(state_before, state_after, no_progress_turns,
+                                                       build_result)
+
+                if should and escalation is not None:
+                    log_info(f"Escalation ({reason}) skipped: the previous one is still in progress.")
+                elif should:
+                    if supervisor_calls_this_step >= CONFIG["max_supervisor_calls_per_step"]:
+                        await write_needs_human(
+                            f"Supervisor consulted {CONFIG['max_supervisor_calls_per_step']} times on "
+                            f"Phase {state_after.get('current_phase')} "
+                            f"Step {state_after.get('current_step')} with no progress."
+                        )
+                        await wait_for_human()
+                        supervisor_calls_this_step = 0
+                        continue
+
+                    if not supervisor.is_alive():
+                        log_info("Supervisor session lost. Restarting...")
+                        await supervisor.kill()
+                        await start_session_with_retry(supervisor, on_line=log_supervisor_line)
+
+                    context = {
+                        "reason": reason,
+                        "phase": state_after.get("current_phase"),
+                        "step": state_after.get("current_step"),
+                        "no_progress_turns": no_progress_turns,
+                        "output_tail": monitor.get_tail(),
+                        "blocking_issues": state_after.get("blocking_issues", []),
+                    }
+
+                    if reason == "build_broken":
+                        context["build_error"] = build_result.output[-500:] or "no output"
+
+                    escalation = start_escalation(supervisor, context)
+                    supervisor_calls_this_step += 1
+
+    except asyncio.CancelledError:
+        log_info("Shutdown requested. Cleaning up.")
+    finally:
+        health.cancel()
+        for task in (watcher_task, escalation, build_check):
+            if task is not None:
+                task.cancel()
+        # Cleanup
+        total_cost = (build.total_cost if build else 0) + (supervisor.total_cost if supervisor else 0)
+        log_info(f"Runner finished. Total cost: ${total_cost:.2f}")
+        await asyncio.gather(*(session.kill() for session in (build, supervisor) if session),
+                             return_exceptions=True)
+
+
+def main():
+    args = parse_args()
+    CONFIG["claude_model"] = args.model
+    CONFIG["session_mode"] = args.session_mode
+    CONFIG["build_check"] = args.build_check
+
+    if args.show_dag:
+        show_dag()
+        return
+
+    global LEDGER
+    LEDGER = Ledger(default_path(REPO_ROOT))
+    LEDGER.start_run("dry-run" if args.dry_run else "parallel" if args.parallel > 1 else "sequential",
+                     args.model, sys.argv[1:])
+    try:
+        run_preflight_checks(skip_api=args.skip_api_checks)
 
-    # Cleanup
-    total_cost = build.total_cost + (supervisor.total_cost if supervisor else 0)
-    log_info(f"Runner finished. Total cost: ${total_cost:.2f}")
-    build.kill()
-    if supervisor:
-        supervisor.kill()
+        if args.dry_run:
+            log_ok("Pre-flight checks passed. Dry run — not launching.")
+            state = load_build_state()
+            log_info(f"Would start at Phase {state.get('current_phase')}, Step {state.get('current_step')}")
+            return
+
+        if args.parallel > 1:
+            asyncio.run(run_dag(args))
+        else:
+            asyncio.run(run_build(args))
+    finally:
+        LEDGER.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Throughput and accuracy of the exhibit classifier.
+
+Runs harvester.exhibits over the fixture corpus of EDGAR filenames in
+test-data/edgar/exhibit-filenames.tsv, checks every classification against
+the expected type and exhibit number, and times repeated passes. The regex
+chain harvest_edgar.py used before the classifier existed is measured the
+same way for comparison.
+
+Usage:
+    python3 scripts/bench_exhibit_classifier.py
+    python3 scripts/bench_exhibit_classifier.py --repeat 2000 --show-misses
+
+Exits non-zero if the classifier gets any fixture wrong, so it can gate CI.
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+from harvester.exhibits import classify_name
+
+FIXTURE = Path(__file__).resolve().parent.parent / "test-data" / "edgar" / "exhibit-filenames.tsv"
+
+
+def load_corpus(path: Path) -> list:
+    """(filename, expected type or None, expected number or None) rows."""
+    rows = []
+    for line in path.read_text().splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        name, exhibit_type, number = line.split("\t")
+        rows.append((name, None if exhibit_type == "-" else exhibit_type,
+                     None if number == "-" else number))
+    return rows
+
+
+def classify(name: str) -> tuple:
+    match = classify_name(name)
+    return (match.type, match.number) if match else (None, None)
+
+
+def classify_legacy(name: str) -> tuple:
+    """The per-filename regex chain from harvest_edgar.py before harvester.exhibits."""
+    if not any(name.lower().endswith(ext) for ext in ['.htm', '.html', '.txt']):
+        return None, None
+    if re.search(r'ex.*2[-_.]?1', name, re.IGNORECASE):
+        return "main_agreement", "2.1"
+    elif re.search(r'ex.*10[-_.]?\d', name, re.IGNORECASE):
+        ex_num = re.search(r'10[-_.]?(\d+)', name, re.IGNORECASE)
+        if ex_num:
+            return "ancillary", f"10.{int(ex_num.group(1))}"
+    elif re.search(r'ex.*99[-_.]?1', name, re.IGNORECASE):
+        return "press_release", "99.1"
+    return None, None
+
+
+def accuracy(corpus: list, fn) -> tuple:
+    misses = [(name, (exhibit_type, number), fn(name))
+              for name, exhibit_type, number in corpus
+              if fn(name) != (exhibit_type, number)]
+    return 1 - len(misses) / len(corpus), misses
+
+
+def throughput(corpus: list, fn, repeat: int) -> float:
+    names = [name for name, _, _ in corpus]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for name in names:
+            fn(name)
+    return len(names) * repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the exhibit classifier")
+    parser.add_argument("--corpus", type=Path, default=FIXTURE)
+    parser.add_argument("--repeat", type=int, default=500,
+                        help="Timed passes over the corpus")
+    parser.add_argument("--show-misses", action="store_true")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    print(f"{len(corpus)} filenames from {args.corpus}\n")
+    print(f"{'classifier':<12} {'accuracy':>9} {'names/s':>12}")
+    failed = False
+    for label, fn in (("exhibits", classify), ("legacy", classify_legacy)):
+        score, misses = accuracy(corpus, fn)
+        rate = throughput(corpus, fn, args.repeat)
+        print(f"{label:<12} {score:>8.1%} {rate:>12,.0f}")
+        if args.show_misses:
+            for name, expected, got in misses:
+                print(f"    {name}: expected {expected}, got {got}")
+        if label == "exhibits" and misses:
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+End-to-end harvester throughput against an offline EDGAR.
+
+Serves a recording (harvester.replay) from a local ReplayServer with a
+simulated per-request latency, then runs harvest_edgar.py against it
+(--sec-base) for every latency x concurrency combination: search, filing
+indexes, exhibit downloads, text extraction, term extraction, indexing and
+the master index, exactly as a live run does. Each run starts from an empty
+output root; with --warm it is repeated with the first run's HTTP cache
+copied in. Reports deals/s, bytes/s (response bytes the harvester handled,
+cached or not), bytes actually served, and the harvester's peak RSS (the
+text-extraction worker processes are not included).
+
+The recording is, in order of preference: --recording DIR, one built from
+a real run's HTTP cache with --from-cache, or a synthetic corpus.
+
+Usage:
+    python3 scripts/bench_harvest.py
+    python3 scripts/bench_harvest.py --latency 0.05 0.2 --concurrency 1 4 16 --warm
+    python3 scripts/bench_harvest.py --from-cache precedent-database/_http_cache --max-deals 100
+
+Exits non-zero if any harvester run fails.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from harvester.replay import Recording, ReplayServer, from_cache, synthesize
+
+HARVESTER = Path(__file__).resolve().parent / "harvest_edgar.py"
+
+
+def _peak_rss(rusage) -> int:
+    """ru_maxrss in bytes (Linux reports KiB, macOS bytes)."""
+    return rusage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+
+def harvest(server: ReplayServer, output: Path, concurrency: int, args: argparse.Namespace) -> dict:
+    """One harvester run into `output`; its measurements."""
+    recording = server.recording
+    start_date, end_date = recording.date_range()
+    command = [sys.executable, str(HARVESTER), "harvest", "--sec-base", server.url,
+               "--output", str(output), "--concurrency", str(concurrency),
+               "--rate", str(args.rate), "--max-deals", str(args.max_deals),
+               "--start-date", start_date, "--end-date", end_date, "--deal-type", "merger"]
+    for query in recording.queries:
+        command += ["--query", query]
+    served = server.bytes_served
+    with open(output.parent / f"{output.name}.log", "w") as log:
+        started = time.monotonic()
+        process = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT,
+                                   cwd=HARVESTER.parent)
+        _, status, rusage = os.wait4(process.pid, 0)
+        elapsed = time.monotonic() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+    metrics_file = output / "_harvest_metrics.json"
+    metrics = json.loads(metrics_file.read_text()) if metrics_file.exists() else {"stages": {}}
+    index_file = output / "_master_index.json"
+    deals = len(json.loads(index_file.read_text())) if index_file.exists() else 0
+    handled = sum(stage["bytes"] for stage in metrics["stages"].values())
+    return {
+        "returncode": process.returncode,
+        "deals": deals,
+        "seconds": round(elapsed, 3),
+        "deals_per_second": round(deals / elapsed, 3),
+        "bytes": handled,
+        "bytes_per_second": round(handled / elapsed, 1),
+        "bytes_served": server.bytes_served - served,
+        "requests": metrics.get("requests", 0),
+        "peak_rss_bytes": _peak_rss(rusage),
+    }
+
+
+def _load_recording(args: argparse.Namespace, scratch: Path) -> Recording:
+    if args.recording:
+        return Recording(args.recording)
+    if args.from_cache:
+        return from_cache(args.from_cache, scratch / "recording")
+    return synthesize(scratch / "recording", filings=args.filings,
+                      agreement_kb=args.agreement_kb, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Harvester throughput against a replayed EDGAR")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--recording", type=Path, help="Recording directory (harvester.replay)")
+    source.add_argument("--from-cache", type=Path, metavar="HTTP_CACHE",
+                        help="Build the recording from a harvest's _http_cache directory")
+    parser.add_argument("--filings", type=int, default=200,
+                        help="Filings in the synthetic recording (about half have an Ex 2.1)")
+    parser.add_argument("--agreement-kb", type=int, default=200,
+                        help="Size of each synthetic Ex 2.1")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, nargs="+", default=[0.05],
+                        help="Seconds added to every response (one run per value)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8],
+                        help="Harvester --concurrency (one run per value)")
+    parser.add_argument("--max-deals", type=int, default=40)
+    parser.add_argument("--rate", type=float, default=1000,
+                        help="Harvester rate ceiling; high by default so latency is the limit")
+    parser.add_argument("--warm", action="store_true",
+                        help="Repeat each run with the cold run's HTTP cache in place")
+    parser.add_argument("--keep", type=Path, help="Keep output roots and logs here")
+    parser.add_argument("--json", type=Path, help="Write the results here")
+    args = parser.parse_args()
+
+    scratch = Path(tempfile.mkdtemp(prefix="bench-harvest-"))
+    workdir = args.keep or scratch
+    workdir.mkdir(parents=True, exist_ok=True)
+    results = []
+    try:
+        recording = _load_recording(args, scratch)
+        hits = sum(len(h) for h in recording.queries.values())
+        print(f"Recording: {len(recording.queries)} queries, {hits} hits, "
+              f"{len(recording.files)} files; up to {args.max_deals} deals per run\n")
+        print(f"{'latency':>8} {'conc':>5} {'cache':>6} {'deals':>6} {'seconds':>8} {'deals/s':>8} "
+              f"{'MB/s':>7} {'net MB':>7} {'peak MB':>8}")
+        for latency in args.latency:
+            with ReplayServer(recording, latency=latency) as server:
+                for concurrency in args.concurrency:
+                    runs = [("cold", None)] + ([("warm", "cold")] if args.warm else [])
+                    for cache, seed_from in runs:
+                        output = workdir / f"lat{latency:g}-c{concurrency}-{cache}"
+                        shutil.rmtree(output, ignore_errors=True)
+                        if seed_from:
+                            shutil.copytree(workdir / f"lat{latency:g}-c{concurrency}-{seed_from}"
+                                            / "_http_cache", output / "_http_cache")
+                        result = harvest(server, output, concurrency, args)
+                        result.update(latency=latency, concurrency=concurrency, cache=cache)
+                        results.append(result)
+                        print(f"{latency:>8g} {concurrency:>5} {cache:>6} {result['deals']:>6} "
+                              f"{result['seconds']:>8.2f} {result['deals_per_second']:>8.2f} "
+                              f"{result['bytes_per_second'] / 1e6:>7.2f} "
+                              f"{result['bytes_served'] / 1e6:>7.2f} "
+                              f"{result['peak_rss_bytes'] / 2 ** 20:>8.1f}"
+                              + ("" if result["returncode"] == 0
+                                 else f"  FAILED ({result['returncode']}), see {output}.log"))
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    if any(result["returncode"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
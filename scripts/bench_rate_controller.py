@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+How the harvester's rate limiter copes with a throttling server.
+
+Starts harvester.stubserver.StubServer with a server-side limit below the
+client's ceiling (and, optionally, random 503s), then fetches the same batch
+of documents concurrently through EdgarClient twice: once with a fixed
+TokenBucket and once with the AdaptiveTokenBucket the harvester uses. Both
+retry throttled requests; only the adaptive one slows down. Reports
+completed and failed fetches, 429/503 responses, wall time and the rate the
+limiter ended at.
+
+Usage:
+    python3 scripts/bench_rate_controller.py
+    python3 scripts/bench_rate_controller.py --requests 300 --server-rate 6 --error-rate 0.02
+
+Exits non-zero if the adaptive limiter lets any fetch fail.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from harvester.client import EdgarClient
+from harvester.metrics import Metrics
+from harvester.ratelimit import AdaptiveTokenBucket, TokenBucket
+from harvester.stubserver import StubServer
+
+HEADERS = {"User-Agent": "MA-Deal-OS Benchmark bench@example.com"}
+
+
+async def fetch_all(client: EdgarClient, base: str, requests: int, concurrency: int) -> list:
+    limit = asyncio.Semaphore(concurrency)
+
+    async def fetch(i: int) -> int:
+        async with limit:
+            fetched = await client.fetch_async(f"{base}/Archives/edgar/data/1/{i:06d}.htm",
+                                               stage="download")
+            return fetched.status_code
+
+    return await asyncio.gather(*(fetch(i) for i in range(requests)))
+
+
+def run(name: str, limiter: TokenBucket, args: argparse.Namespace) -> dict:
+    with StubServer(rate=args.server_rate, retry_after=args.retry_after,
+                    error_rate=args.error_rate, latency=args.latency) as server:
+        metrics = Metrics()
+        client = EdgarClient(HEADERS, limiter, pool_size=args.concurrency, metrics=metrics)
+        start = time.monotonic()
+        statuses = asyncio.run(fetch_all(client, server.url, args.requests, args.concurrency))
+        elapsed = time.monotonic() - start
+    ok = sum(1 for status in statuses if status == 200)
+    result = {
+        "limiter": name,
+        "ok": ok,
+        "failed": len(statuses) - ok,
+        "429": server.throttled,
+        "503": server.errors,
+        "seconds": elapsed,
+        "goodput": ok / elapsed,
+        "final_rate": limiter.rate,
+    }
+    print(f"{name:<9} {result['ok']:>5} {result['failed']:>7} {result['429']:>6} "
+          f"{result['503']:>6} {elapsed:>8.1f} {result['goodput']:>8.2f} {limiter.rate:>11.2f}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fixed vs adaptive rate limiting against a throttling stub")
+    parser.add_argument("--requests", type=int, default=150)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--ceiling", type=float, default=10, help="Client rate limit (req/s)")
+    parser.add_argument("--server-rate", type=float, default=6,
+                        help="Requests/second the stub serves before answering 429")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction answered 503")
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    print(f"{args.requests} fetches, concurrency {args.concurrency}, client ceiling "
+          f"{args.ceiling:g} req/s, server allows {args.server_rate:g} req/s\n")
+    print(f"{'limiter':<9} {'ok':>5} {'failed':>7} {'429s':>6} {'503s':>6} {'seconds':>8} "
+          f"{'ok/s':>8} {'final rate':>11}")
+    run("fixed", TokenBucket(args.ceiling), args)
+    adaptive = run("adaptive", AdaptiveTokenBucket(args.ceiling), args)
+    if adaptive["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
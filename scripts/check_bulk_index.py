@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Offline check of quarterly full-index discovery.
+
+Parses the fixture indexes in test-data/edgar/full-index/ (2024 QTR1 as a
+fixed-width form.idx, QTR2 as a pipe-delimited master.idx) with
+harvester.bulkindex, loads them into a scratch BulkIndex and selects
+candidates the way harvest_edgar.py --discovery bulk does. Checks the
+row parsing (long company names that push the CIK column right, a "|"
+inside a company name, multi-word form types), the form-type filter and
+the quarter range. No network access.
+
+Usage:
+    python3 scripts/check_bulk_index.py
+    python3 scripts/check_bulk_index.py --index-dir /path/to/full-index
+
+Exits non-zero on any mismatch, so it can gate CI.
+"""
+
+import argparse
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+
+from harvester.bulkindex import (BulkIndex, parse_form_idx, parse_index, parse_master_idx,
+                                 quarter_bounds, quarters)
+
+FIXTURE = Path(__file__).resolve().parent.parent / "test-data" / "edgar" / "full-index"
+
+# harvest_edgar.BULK_FORMS
+FORMS = ["8-K", "S-4", "DEFM14A"]
+
+# Rows the parsers must produce exactly: (accession, cik, company, form, filed).
+EXPECTED_ROWS = [
+    ("0001437749-24-007655", "1900108",
+     "PINECREST REGIONAL BANCORPORATION AND SUBSIDIARIES OF THE MIDWEST AREA", "8-K", "2024-03-11"),
+    ("0000919574-24-000381", "1900017", "HARBOR POINT CAPITAL TRUST", "SC 13D", "2024-01-19"),
+    ("0000950170-24-037455", "1900042", "NORTHWIND LOGISTICS CORP", "8-K/A", "2024-03-29"),
+    ("0001900131-24-000004", "1900131", "CEDAR & STONE BRANDS|INC", "8-K", "2024-05-21"),
+    ("0001437749-24-013980", "1900108", "PINECREST REGIONAL BANCORPORATION", "S-4", "2024-04-30"),
+]
+
+# (start, end) -> candidate accessions, newest first.
+EXPECTED_CANDIDATES = {
+    ("2024-01-01", "2024-06-30"): [
+        "0001193125-24-170332",  # 8-K      2024-06-27
+        "0000950170-24-066101",  # DEFM14A  2024-06-03
+        "0001900131-24-000004",  # 8-K      2024-05-21
+        "0001900001-24-000019",  # 8-K      2024-05-06
+        "0001437749-24-013980",  # S-4      2024-04-30
+        "0001104659-24-045902",  # 8-K      2024-04-12
+        "0000950170-24-037120",  # 8-K      2024-03-28
+        "0001104659-24-033018",  # DEFM14A  2024-03-15
+        "0001437749-24-007655",  # 8-K      2024-03-11
+        "0001104659-24-021877",  # 8-K      2024-02-20
+        "0001193125-24-024601",  # S-4      2024-02-02
+        "0001900001-24-000002",  # 8-K      2024-01-08
+    ],
+    # Straddles the quarter boundary; both ends trim a quarter.
+    ("2024-03-12", "2024-04-30"): [
+        "0001437749-24-013980",
+        "0001104659-24-045902",
+        "0000950170-24-037120",
+        "0001104659-24-033018",
+    ],
+    ("2024-05-07", "2024-05-20"): [],
+}
+
+
+def index_text(index_dir: Path, year: int, quarter: int) -> str:
+    """The quarter's form.idx, else its master.idx — the order harvest_edgar.py tries."""
+    for name in ("form.idx", "master.idx"):
+        path = index_dir / str(year) / f"QTR{quarter}" / name
+        if path.exists():
+            return path.read_text()
+    raise FileNotFoundError(f"no form.idx or master.idx for {year} QTR{quarter} in {index_dir}")
+
+
+def candidates(bulk: BulkIndex, index_dir: Path, start_date: str, end_date: str) -> list:
+    """harvest_edgar.iter_bulk_candidates against the fixture mirror, as accessions."""
+    found = []
+    for year, quarter in quarters(start_date, end_date):
+        first, last = quarter_bounds(year, quarter)
+        if not bulk.is_loaded(year, quarter):
+            bulk.load_quarter(year, quarter, index_text(index_dir, year, quarter))
+        found += [row["accession"]
+                  for row in bulk.candidates(FORMS, max(first, start_date), min(last, end_date))]
+    return found
+
+
+def check(label: str, got, expected) -> bool:
+    ok = got == expected
+    print(f"{'ok  ' if ok else 'FAIL'} {label}")
+    if not ok:
+        print(f"       expected {expected}\n       got      {got}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check full-index parsing and bulk discovery offline")
+    parser.add_argument("--index-dir", type=Path, default=FIXTURE,
+                        help="Mirror of edgar/full-index/ holding 2024 QTR1-QTR2")
+    args = parser.parse_args()
+
+    form_rows = list(parse_form_idx(index_text(args.index_dir, 2024, 1)))
+    master_rows = list(parse_master_idx(index_text(args.index_dir, 2024, 2)))
+    rows = {row[0]: row for row in form_rows + master_rows}
+    results = [
+        check("form.idx rows", len(form_rows), 11),
+        check("master.idx rows", len(master_rows), 7),
+        check("parse_index detects both formats",
+              [list(parse_index(index_text(args.index_dir, 2024, q))) for q in (1, 2)],
+              [form_rows, master_rows]),
+        check("CIKs are digits, dates ISO",
+              [row[0] for row in rows.values()
+               if not row[1].isdigit() or date.fromisoformat(row[4]).isoformat() != row[4]], []),
+    ]
+    for expected in EXPECTED_ROWS:
+        results.append(check(f"row {expected[0]}", rows.get(expected[0]), expected))
+
+    results.append(check("quarters 2024-02-01..2024-05-31",
+                         quarters("2024-02-01", "2024-05-31"), [(2024, 2), (2024, 1)]))
+    with tempfile.TemporaryDirectory() as scratch:
+        bulk = BulkIndex(Path(scratch) / "bulk.sqlite")
+        try:
+            for (start, end), expected in EXPECTED_CANDIDATES.items():
+                results.append(check(f"candidates {start}..{end}",
+                                     candidates(bulk, args.index_dir, start, end), expected))
+            results.append(check("finished quarters are not reloaded",
+                                 [bulk.is_loaded(2024, q, today=date(2024, 7, 1)) for q in (1, 2)],
+                                 [True, True]))
+            bulk.load_quarter(2024, 2, index_text(args.index_dir, 2024, 2), today=date(2024, 5, 1))
+            results.append(check("the current quarter is reloaded the next day",
+                                 [bulk.is_loaded(2024, 2, today=date(2024, d, 1)) for d in (5, 6)],
+                                 [True, False]))
+        finally:
+            bulk.close()
+
+    print(f"\n{sum(results)}/{len(results)} checks passed")
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
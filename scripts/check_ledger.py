@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Offline check of the run ledger's cost accounting.
+
+Writes a scratch ledger with runner.ledger.Ledger the way the runner does
+for a parallel build (build and supervisor turns, escalations, phase_merged
+and phase_failed events carrying the session's total) and checks that the
+`phases` and `runs` queries report each phase's spend as the sum of its
+turns, with nothing counted twice.
+
+Usage:
+    python3 scripts/check_ledger.py
+
+Exits non-zero on any mismatch, so it can gate CI.
+"""
+
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+from runner.ledger import Ledger, phase_stats, runs
+
+# phase -> [(session, cost_usd)] for each turn
+TURNS = {
+    3: [("phase-03", 1.0), ("phase-03", 2.0)],
+    4: [("phase-04", 0.25), ("supervisor", 0.5), ("phase-04", 0.75)],
+    5: [("phase-05", 4.0)],
+}
+MERGED = {3, 4}
+
+
+def write_ledger(path: Path) -> int:
+    ledger = Ledger(path)
+    run = ledger.start_run("parallel", "model", ["--parallel", "3"])
+    try:
+        for phase, turns in TURNS.items():
+            build = f"phase-{phase:02d}"
+            for session, cost in turns:
+                if session == "supervisor":
+                    ledger.record("escalation", session=session, phase=phase, reason="repeated_stuck")
+                ledger.record_turn(session, cost, 1.0, session_id=f"{session}-id", phase=phase)
+            total = sum(cost for session, cost in turns if session == build)
+            kind = "phase_merged" if phase in MERGED else "phase_failed"
+            ledger.record(kind, session=build, phase=phase, total_cost_usd=total,
+                          turns=len(turns), merge_attempts=1)
+    finally:
+        ledger.close()
+    return run
+
+
+def check(label: str, got, expected) -> bool:
+    ok = got == expected
+    print(f"{'ok  ' if ok else 'FAIL'} {label}")
+    if not ok:
+        print(f"       expected {expected}\n       got      {got}")
+    return ok
+
+
+def main():
+    with tempfile.TemporaryDirectory() as scratch:
+        run = write_ledger(Path(scratch) / "ledger.sqlite")
+        db = sqlite3.connect(Path(scratch) / "ledger.sqlite")
+        db.row_factory = sqlite3.Row
+        try:
+            stats = {row["phase"]: row for row in phase_stats(db, run)}
+            results = []
+            for phase, turns in TURNS.items():
+                row = stats.get(phase, {})
+                results += [
+                    check(f"phase {phase} cost is the sum of its turns",
+                          row.get("cost_usd"), round(sum(cost for _, cost in turns), 2)),
+                    check(f"phase {phase} supervisor cost",
+                          row.get("supervisor_usd"),
+                          round(sum(cost for session, cost in turns if session == "supervisor"), 2)),
+                    check(f"phase {phase} turns", row.get("turns"), len(turns)),
+                ]
+            run_row = next((row for row in runs(db) if row["run"] == run), {})
+            results += [
+                check("run cost is the sum of all turns", run_row.get("cost_usd"),
+                      round(sum(cost for turns in TURNS.values() for _, cost in turns), 2)),
+                check("run turns", run_row.get("turns"), sum(map(len, TURNS.values()))),
+            ]
+        finally:
+            db.close()
+
+    print(f"\n{sum(results)}/{len(results)} checks passed")
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
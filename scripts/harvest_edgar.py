@@ -6,17 +6,52 @@ Organizes them into law-firm-style matter folders.
 
 Usage:
     pip3 install requests
-    python3 harvest_edgar.py
+    python3 harvest_edgar.py                      # one request at a time
+    python3 harvest_edgar.py --concurrency 8      # 8 requests in flight
+    python3 harvest_edgar.py --concurrency 8 --rate 5
+    python3 harvest_edgar.py --plan plan.json     # searches from a plan file
+    python3 harvest_edgar.py --discovery bulk     # candidates from quarterly form indexes
+    python3 harvest_edgar.py --archive            # matters kept as compressed blobs
+    python3 harvest_edgar.py --materialize        # write archived matters back out as folders
+
+    python3 harvest_edgar.py harvest --query '"merger agreement" tender' --start-date 2023-01-01 \
+        --max-deals 50 --shard 1/4 --output shard1   # one of four machines' share of the run
+    python3 harvest_edgar.py merge shard1 shard2 shard3 shard4 --output merged
+    python3 harvest_edgar.py search "reverse termination fee" --output merged
+    python3 harvest_edgar.py search --industry software --min-value 1e9
+
+The flag-only forms are the harvest command.
 """
 
 import os
 import json
-import time
-import re
-import requests
+import argparse
+import asyncio
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from typing import Optional
-from dataclasses import dataclass, field, asdict
+from typing import Iterator, Optional
+from dataclasses import dataclass, field, fields, asdict, replace
+
+from harvester.archive import PrecedentArchive
+from harvester.atomic import write_text_atomic
+from harvester.bulkindex import BulkIndex, quarter_bounds, quarters
+from harvester.cache import DEFAULT_MAX_BYTES, HttpCache
+from harvester.client import EdgarClient, Fetched
+from harvester.dedup import DuplicateIndex, document_signature
+from harvester.exhibits import classify_filing
+from harvester.index import PrecedentIndex
+from harvester.journal import HarvestJournal
+from harvester.masterindex import MasterIndex, load_deals, merge_indexes
+from harvester.metrics import Metrics
+from harvester.plan import DISCOVERY_MODES, HarvestSpec, load_plan, parse_shard, shard_of
+from harvester.text import decode_document, extract_exhibits
+from harvester.ratelimit import AdaptiveTokenBucket
+from harvester.shards import ShardedSearch, month_shards
+from harvester.terms import TermsCache, extract_terms, industry
 
 # EDGAR requires a User-Agent header with your name and email
 HEADERS = {
@@ -26,9 +61,93 @@ HEADERS = {
 
 EFTS_BASE = "https://efts.sec.gov/LATEST/search-index"
 EDGAR_BASE = "https://www.sec.gov/Archives/edgar/data"
+FULL_INDEX_BASE = "https://www.sec.gov/Archives/edgar/full-index"
+SUBMISSIONS_BASE = "https://data.sec.gov/submissions"
+EFTS_PAGE_SIZE = 100
+EFTS_RESULT_CAP = 10000   # EFTS will not page past this many hits for one query
 
 OUTPUT_DIR = Path("precedent-database")
 
+# SEC fair-access limit is 10 requests/second for the whole process. Every
+# request — sequential or asyncio — takes a token from this one bucket. It
+# runs at the limit until SEC answers 429/503, backs off, then recovers.
+RATE_LIMIT = 10
+RATE_LIMITER = AdaptiveTokenBucket(RATE_LIMIT)
+
+# Per-stage request statistics (latency, bytes, 429/5xx, limiter wait);
+# main() writes them to METRICS_FILE when the run ends.
+METRICS = Metrics()
+METRICS_FILE = "_harvest_metrics.json"
+
+# Shared keep-alive session; all EDGAR traffic goes through it. main()
+# attaches the on-disk HTTP cache under OUTPUT_DIR.
+CLIENT = EdgarClient(HEADERS, RATE_LIMITER, metrics=METRICS)
+HTTP_CACHE_DIR = "_http_cache"
+
+# This run's slice of the accession space with --shard i/N, as (i, N); None
+# harvests everything.
+SHARD: Optional[tuple] = None
+
+# Checkpoint journal; main() opens it so interrupted runs resume where they
+# stopped. None disables resume bookkeeping (library use).
+JOURNAL: Optional[HarvestJournal] = None
+JOURNAL_FILE = "_harvest_journal.jsonl"
+
+# HTML → text + section map conversion is CPU-bound; main() runs it in a
+# process pool. None extracts in the calling thread.
+EXTRACT_POOL: Optional[ProcessPoolExecutor] = None
+
+# MinHash/LSH index of every Ex 2.1 seen. A filing whose agreement nearly
+# matches an earlier one is flagged with duplicate_of, or skipped outright
+# when COLLAPSE_DUPLICATES is set.
+DEDUP: Optional[DuplicateIndex] = None
+DEDUP_FILE = "_dedup_index.sqlite"
+COLLAPSE_DUPLICATES = False
+
+# Quarterly full-index table for --discovery bulk. BULK_INDEX_DIR, if set,
+# is a local mirror of edgar/full-index/ (YYYY/QTRn/form.idx or master.idx)
+# read instead of sec.gov.
+BULK_INDEX: Optional[BulkIndex] = None
+BULK_INDEX_FILE = "_bulk_index.sqlite"
+BULK_INDEX_DIR: Optional[Path] = None
+BULK_FORMS = "8-K,S-4,DEFM14A"
+
+# Writer stage: folder creation, exhibit materialization and metadata writes
+# run on this pool so disk I/O for many matters overlaps. None does them in
+# the calling thread (asyncio: the default executor).
+WRITER: Optional[ThreadPoolExecutor] = None
+
+# Master index of finished matters: appended as each matter completes,
+# compacted into _master_index.json on close.
+MASTER_INDEX: Optional[MasterIndex] = None
+MASTER_INDEX_LOG = "_master_index.jsonl"
+MASTER_INDEX_FILE = "_master_index.json"
+
+# Compressed, deduplicated archive (--archive). Each finished matter is
+# stored there and its folder removed; --materialize writes folders back.
+ARCHIVE: Optional[PrecedentArchive] = None
+ARCHIVE_DIR = "_archive"
+
+# Deal terms (parties, signing date, price, value, SIC industry) extracted
+# from each finished matter, cached per accession. None extracts every time.
+TERMS: Optional[TermsCache] = None
+TERMS_FILE = "_deal_terms.sqlite"
+
+# Full-text precedent index, updated as each matter is finished.
+INDEX: Optional[PrecedentIndex] = None
+INDEX_FILE = "_precedent_index.sqlite"
+
+EXHIBIT_FOLDERS = {
+    "filing_body": "00_Deal_Summary",
+    "press_release": "01_Press_Release",
+    "additional_exhibit": "01_Press_Release",
+    "main_agreement": "02_Purchase_Agreement",
+    "plan_exhibit": "02_Purchase_Agreement",
+    "ancillary": "03_Ancillary_Agreements",
+    "amendment": "04_Amendments",
+}
+MATTER_SUBFOLDERS = list(dict.fromkeys(EXHIBIT_FOLDERS.values()))
+
 
 @dataclass
 class DealInfo:
@@ -43,129 +162,499 @@ class DealInfo:
     deal_value: Optional[str] = None
     industry: Optional[str] = None
     exhibits: dict = field(default_factory=dict)
+    duplicate_of: Optional[str] = None   # matter holding the canonical copy of this agreement
+    deal_types: list = field(default_factory=list)   # every deal type whose query matched
+    signing_date: Optional[str] = None
+    purchase_price: Optional[str] = None   # "$125,000,000" or "$42.50 per share"
+    deal_value_usd: Optional[float] = None
+    sic: Optional[str] = None
 
 
-def search_edgar(query: str, forms: str = "8-K", start_date: str = "2023-01-01",
-                 end_date: str = "2026-01-31", max_results: int = 20) -> list:
-    """Search EDGAR full-text search for M&A documents."""
-    params = {
-        "q": query,
-        "forms": forms,
-        "dateRange": "custom",
-        "startdt": start_date,
-        "enddt": end_date,
+def _hit_to_result(hit: dict) -> dict:
+    source = hit.get("_source", {})
+    # EFTS API uses 'ciks' (array), 'display_names' (array), 'adsh', 'form'
+    ciks = source.get("ciks", [])
+    display_names = source.get("display_names", [])
+    return {
+        "entity_name": display_names[0] if display_names else "Unknown",
+        "file_date": source.get("file_date", ""),
+        "form_type": source.get("form", ""),
+        "cik": ciks[0].lstrip("0") if ciks else "",
+        "accession": source.get("adsh", ""),
     }
 
-    resp = requests.get(EFTS_BASE, params=params, headers=HEADERS)
+
+def _search_page(params: dict, start_date: str, end_date: str, offset: int) -> tuple:
+    """One EFTS page of a date shard: (results, total hits, whether EFTS capped the total)."""
+    resp = CLIENT.fetch(EFTS_BASE, params={**params, "startdt": start_date,
+                                           "enddt": end_date, "from": offset},
+                        stage="search")
     resp.raise_for_status()
     data = resp.json()
-
     hits = data.get("hits", {}).get("hits", [])
-    results = []
+    total = data.get("hits", {}).get("total", {})
+    value = total.get("value", 0)
+    capped = total.get("relation") == "gte" or value >= EFTS_RESULT_CAP
+    return [_hit_to_result(hit) for hit in hits], value, capped
 
-    for hit in hits[:max_results]:
-        source = hit.get("_source", {})
-        # EFTS API uses 'ciks' (array), 'display_names' (array), 'adsh', 'form'
-        ciks = source.get("ciks", [])
-        display_names = source.get("display_names", [])
-        results.append({
-            "entity_name": display_names[0] if display_names else "Unknown",
-            "file_date": source.get("file_date", ""),
-            "form_type": source.get("form", ""),
-            "cik": ciks[0].lstrip("0") if ciks else "",
-            "accession": source.get("adsh", ""),
-        })
 
-    return results
+def iter_search_edgar(query: str, forms: str = "8-K", start_date: str = "2023-01-01",
+                      end_date: str = "2026-01-31", workers: int = 1) -> Iterator[dict]:
+    """Lazily page through EDGAR full-text search results.
 
+    The date range is searched month by month (newest first), and any month
+    that hits the EFTS result cap is subdivided, so wide ranges are covered
+    completely. Up to `workers` pages are fetched concurrently under
+    RATE_LIMITER while hits stream out in shard order; pages are only
+    requested a little ahead of the caller, so a caller that stops early
+    never pays for the rest of the range. EFTS returns one hit per matching
+    document, so a filing is yielded only for the first of its documents.
+    """
+    params = {"q": query, "forms": forms, "dateRange": "custom"}
+    results = ShardedSearch(
+        lambda start, end, offset: _search_page(params, start, end, offset),
+        month_shards(start_date, end_date),
+        workers=workers, page_size=EFTS_PAGE_SIZE, result_cap=EFTS_RESULT_CAP,
+    )
+    seen = set()
+    try:
+        for result in results:
+            if result["accession"] not in seen:
+                seen.add(result["accession"])
+                yield result
+    finally:
+        results.close()
+        for start, end in results.truncated:
+            print(f"  Warning: EFTS results for {start}..{end} exceed the "
+                  f"{EFTS_RESULT_CAP}-hit cap; some filings were not returned")
 
-def get_filing_exhibits(cik: str, accession: str) -> dict:
-    """Get the exhibit list for a specific filing."""
+
+def search_edgar(query: str, forms: str = "8-K", start_date: str = "2023-01-01",
+                 end_date: str = "2026-01-31", max_results: int = 20) -> list:
+    """Search EDGAR full-text search for M&A documents."""
+    return list(islice(iter_search_edgar(query, forms, start_date, end_date), max_results))
+
+
+def _quarter_index_text(year: int, quarter: int) -> Optional[str]:
+    """A quarter's form.idx (or master.idx) from the local mirror or sec.gov."""
+    for name in ("form.idx", "master.idx"):
+        if BULK_INDEX_DIR:
+            path = BULK_INDEX_DIR / str(year) / f"QTR{quarter}" / name
+            if path.exists():
+                return decode_document(path.read_bytes())
+            continue
+        resp = CLIENT.fetch(f"{FULL_INDEX_BASE}/{year}/QTR{quarter}/{name}", stage="bulk_index")
+        if resp.status_code == 200:
+            return decode_document(resp.content)
+        print(f"  Warning: Could not fetch {year} QTR{quarter} {name}: {resp.status_code}")
+    return None
+
+
+def _load_quarter(year: int, quarter: int):
+    if BULK_INDEX.is_loaded(year, quarter):
+        return
+    text = _quarter_index_text(year, quarter)
+    if text is not None:
+        count = BULK_INDEX.load_quarter(year, quarter, text)
+        print(f"  Loaded {year} QTR{quarter} form index: {count:,} filings")
+
+
+def iter_bulk_candidates(forms: str = BULK_FORMS, start_date: str = "2023-01-01",
+                         end_date: str = "2026-01-31") -> Iterator[dict]:
+    """Candidate filings from the quarterly form indexes, newest first.
+
+    Each quarter's index is downloaded once (finished quarters are never
+    fetched again) and filtered locally by form type and date, so discovery
+    costs one request per quarter instead of one per EFTS page. Results have
+    the same shape as iter_search_edgar's.
+    """
+    wanted = [form.strip() for form in forms.split(",") if form.strip()]
+    for year, quarter in quarters(start_date, end_date):
+        first, last = quarter_bounds(year, quarter)
+        _load_quarter(year, quarter)
+        for row in BULK_INDEX.candidates(wanted, max(first, start_date), min(last, end_date)):
+            yield {
+                "entity_name": row["company"] or "Unknown",
+                "file_date": row["filed"],
+                "form_type": row["form"],
+                "cik": row["cik"].lstrip("0"),
+                "accession": row["accession"],
+            }
+
+
+def _in_shard(results: Iterator[dict]) -> Iterator[dict]:
+    """The results that belong to this run's --shard (all of them when unsharded)."""
+    try:
+        for result in results:
+            if SHARD is None or shard_of(result["accession"], SHARD[1]) == SHARD[0]:
+                yield result
+    finally:
+        close = getattr(results, "close", None)
+        if close:
+            close()
+
+
+def _discover(spec: HarvestSpec, workers: int = 1) -> Iterator[dict]:
+    if spec.discovery == "bulk":
+        return _in_shard(iter_bulk_candidates(spec.forms, spec.start_date, spec.end_date))
+    return _in_shard(iter_search_edgar(spec.query, spec.forms, spec.start_date, spec.end_date,
+                                       workers=workers))
+
+
+def _index_url(cik: str, accession: str) -> str:
     acc_clean = accession.replace("-", "")
-    index_url = f"{EDGAR_BASE}/{cik}/{acc_clean}/index.json"
+    return f"{EDGAR_BASE}/{cik}/{acc_clean}/index.json"
 
-    resp = requests.get(index_url, headers=HEADERS)
-    time.sleep(0.11)  # EDGAR rate limit: 10 requests/second
 
+def _parse_filing_index(cik: str, accession: str, resp: Fetched) -> dict:
+    """Turn an index.json response into the exhibit map used by organize_deal."""
     if resp.status_code != 200:
         print(f"  Warning: Could not fetch index for {accession}: {resp.status_code}")
         return {}
 
+    acc_clean = accession.replace("-", "")
     data = resp.json()
     items = data.get("directory", {}).get("item", [])
 
     exhibits = {}
-    for item in items:
-        name = item.get("name", "")
-        if any(name.lower().endswith(ext) for ext in ['.htm', '.html', '.txt']):
-            url = f"{EDGAR_BASE}/{cik}/{acc_clean}/{name}"
-
-            if re.search(r'ex.*2[-_.]?1', name, re.IGNORECASE):
-                exhibits['ex_2_1'] = {"url": url, "name": name, "type": "main_agreement"}
-            elif re.search(r'ex.*10[-_.]?\d', name, re.IGNORECASE):
-                ex_num = re.search(r'10[-_.]?(\d+)', name, re.IGNORECASE)
-                if ex_num:
-                    key = f"ex_10_{ex_num.group(1)}"
-                    exhibits[key] = {"url": url, "name": name, "type": "ancillary"}
-            elif re.search(r'ex.*99[-_.]?1', name, re.IGNORECASE):
-                exhibits['ex_99_1'] = {"url": url, "name": name, "type": "press_release"}
-            elif name.endswith('.htm') and 'ex' not in name.lower():
-                if '8k_body' not in exhibits:
-                    exhibits['8k_body'] = {"url": url, "name": name, "type": "filing_body"}
-
+    for match in classify_filing(item.get("name", "") for item in items):
+        exhibits[match.key] = {
+            "url": f"{EDGAR_BASE}/{cik}/{acc_clean}/{match.name}",
+            "name": match.name,
+            "type": match.type,
+        }
     return exhibits
 
 
-def download_file(url: str, filepath: Path) -> bool:
-    """Download a file from EDGAR."""
+def get_filing_exhibits(cik: str, accession: str) -> dict:
+    """Get the exhibit list for a specific filing."""
+    resp = CLIENT.fetch(_index_url(cik, accession), stage="index")
+    return _parse_filing_index(cik, accession, resp)
+
+
+async def get_filing_exhibits_async(cik: str, accession: str) -> dict:
+    """Async variant of get_filing_exhibits."""
+    resp = await CLIENT.fetch_async(_index_url(cik, accession), stage="index")
+    return _parse_filing_index(cik, accession, resp)
+
+
+def _report_download(url: str, filepath: Path, fetched: Fetched) -> Optional[Fetched]:
+    if fetched.status_code == 200:
+        source = "cached" if fetched.from_cache else "Downloaded"
+        print(f"  ✓ {source}: {filepath.name} ({fetched.size:,} bytes)")
+        return fetched
+    else:
+        print(f"  ✗ Failed ({fetched.status_code}): {url}")
+        return None
+
+
+def download_file(url: str, filepath: Path) -> Optional[Fetched]:
+    """Download a file from EDGAR (hardlinked from the HTTP cache when present).
+
+    The body is streamed to a temp file and renamed into place, so `filepath`
+    is never left half-written. Returns the byte count and SHA-256 on success,
+    None on failure.
+    """
     try:
-        resp = requests.get(url, headers=HEADERS)
-        time.sleep(0.11)
-        if resp.status_code == 200:
-            filepath.parent.mkdir(parents=True, exist_ok=True)
-            filepath.write_bytes(resp.content)
-            print(f"  ✓ Downloaded: {filepath.name}")
-            return True
-        else:
-            print(f"  ✗ Failed ({resp.status_code}): {url}")
-            return False
+        return _report_download(url, filepath, CLIENT.fetch_to_file(url, filepath, stage="download"))
     except Exception as e:
         print(f"  ✗ Error: {e}")
-        return False
+        return None
 
 
-def organize_deal(deal: DealInfo, exhibits: dict) -> Path:
-    """Create matter folder structure and download all exhibits."""
-    folder_name = f"{deal.matter_number}_{deal.deal_name.replace(' ', '_').replace('/', '_')[:50]}"
-    deal_dir = OUTPUT_DIR / folder_name
+async def download_file_async(url: str, filepath: Path) -> Optional[Fetched]:
+    """Async variant of download_file."""
+    try:
+        return _report_download(url, filepath, await CLIENT.fetch_to_file_async(url, filepath,
+                                                                         stage="download"))
+    except Exception as e:
+        print(f"  ✗ Error: {e}")
+        return None
+
+
+def _deal_folder_name(matter_number: str, deal_name: str) -> str:
+    return f"{matter_number}_{deal_name.replace(' ', '_').replace('/', '_')[:50]}"
+
+
+def _make_deal_dir(deal: DealInfo) -> Path:
+    deal_dir = OUTPUT_DIR / _deal_folder_name(deal.matter_number, deal.deal_name)
     deal_dir.mkdir(parents=True, exist_ok=True)
+    for subfolder in MATTER_SUBFOLDERS:
+        (deal_dir / subfolder).mkdir(exist_ok=True)
+    return deal_dir
 
-    (deal_dir / "00_Deal_Summary").mkdir(exist_ok=True)
-    (deal_dir / "01_Press_Release").mkdir(exist_ok=True)
-    (deal_dir / "02_Purchase_Agreement").mkdir(exist_ok=True)
-    (deal_dir / "03_Ancillary_Agreements").mkdir(exist_ok=True)
-    (deal_dir / "04_Amendments").mkdir(exist_ok=True)
-
-    for key, exhibit in exhibits.items():
-        url = exhibit["url"]
-        name = exhibit["name"]
-
-        if exhibit["type"] == "main_agreement":
-            download_file(url, deal_dir / "02_Purchase_Agreement" / name)
-        elif exhibit["type"] == "ancillary":
-            download_file(url, deal_dir / "03_Ancillary_Agreements" / name)
-        elif exhibit["type"] == "press_release":
-            download_file(url, deal_dir / "01_Press_Release" / name)
-        elif exhibit["type"] == "filing_body":
-            download_file(url, deal_dir / "00_Deal_Summary" / name)
 
+def _write_deal_metadata(deal: DealInfo, exhibits: dict, deal_dir: Path, files: dict):
     metadata = asdict(deal)
     metadata["exhibits"] = {k: v["url"] for k, v in exhibits.items()}
-    (deal_dir / "_deal_metadata.json").write_text(json.dumps(metadata, indent=2))
+    # Size and digest of each stored exhibit, so integrity checks and dedup
+    # never have to re-read the documents.
+    metadata["files"] = files
+    write_text_atomic(deal_dir / "_deal_metadata.json", json.dumps(metadata, indent=2))
+
+
+def _exhibit_dest(deal: DealInfo, deal_dir: Path, exhibit: dict) -> Optional[Path]:
+    subfolder = EXHIBIT_FOLDERS.get(exhibit["type"])
+    if not subfolder:
+        return None
+    return deal_dir / subfolder / exhibit["name"]
+
+
+def _journaled_file(deal: DealInfo, key: str, dest: Path) -> Optional[dict]:
+    """File record for an exhibit an earlier run already stored at `dest`."""
+    recorded = JOURNAL.exhibit(deal.accession, key) if JOURNAL else None
+    if recorded and dest.exists():
+        return {"path": recorded["path"], "bytes": recorded["bytes"], "sha256": recorded["sha256"]}
+    return None
+
+
+def _stored_file(deal: DealInfo, deal_dir: Path, key: str, dest: Path, fetched: Fetched) -> dict:
+    path = str(dest.relative_to(deal_dir))
+    if JOURNAL:
+        JOURNAL.record_exhibit(deal.accession, key, path, fetched.size, fetched.sha256)
+    return {"path": path, "bytes": fetched.size, "sha256": fetched.sha256}
+
+
+def _extract_files(deal_dir: Path, files: dict):
+    """Convert each stored exhibit to text + section map, once, next to the original."""
+    paths = [deal_dir / info["path"] for info in files.values()]
+    for info, extracted in zip(files.values(), extract_exhibits(paths, EXTRACT_POOL)):
+        folder = Path(info["path"]).parent
+        info["text"] = str(folder / extracted["text"])
+        info["sections"] = str(folder / extracted["sections"])
+
+
+_INDUSTRIES: dict = {}   # cik -> (sic, description), for this run
+
+
+def _filer_industry(cik: str) -> Optional[tuple]:
+    """(SIC code, description) of a filer from its submissions JSON; None if unavailable."""
+    if cik not in _INDUSTRIES:
+        try:
+            resp = CLIENT.fetch(f"{SUBMISSIONS_BASE}/CIK{cik.zfill(10)}.json", stage="submissions")
+            resp.raise_for_status()
+            _INDUSTRIES[cik] = industry(resp.json())
+        except Exception as e:
+            print(f"  Warning: Could not fetch SIC code for CIK {cik}: {e}")
+            return None
+    return _INDUSTRIES[cik]
+
+
+def _term_sources(deal_dir: Path, files: dict) -> tuple:
+    """Extracted-text paths of the Ex 2.1 and Ex 99.1, where stored."""
+    return tuple(str(deal_dir / files[key]["text"]) if "text" in files.get(key, {}) else None
+                 for key in ("ex_2_1", "ex_99_1"))
+
+
+def _with_industry(deal: DealInfo, terms: dict) -> dict:
+    """Add the filer's SIC industry and cache the terms (once the lookup has succeeded)."""
+    sic = _filer_industry(deal.cik) if deal.cik else None
+    if sic:
+        terms["sic"], terms["industry"] = sic
+        if TERMS:
+            TERMS.put(deal.accession, terms)
+    return terms
+
 
+def _apply_terms(deal: DealInfo, terms: dict):
+    """Fill DealInfo from extracted terms; anything not found keeps its current value."""
+    deal.buyer = terms.get("buyer") or deal.buyer
+    deal.target = terms.get("target") or deal.target
+    for name in ("signing_date", "purchase_price", "deal_value", "deal_value_usd", "industry", "sic"):
+        if terms.get(name) is not None:
+            setattr(deal, name, terms[name])
+
+
+def _fill_terms(deal: DealInfo, deal_dir: Path, files: dict):
+    terms = TERMS.get(deal.accession) if TERMS else None
+    if terms is None:
+        sources = _term_sources(deal_dir, files)
+        terms = (EXTRACT_POOL.submit(extract_terms, *sources).result() if EXTRACT_POOL
+                 else extract_terms(*sources))
+        terms = _with_industry(deal, terms)
+    _apply_terms(deal, terms)
+
+
+def _record_deal(deal: DealInfo):
+    record = asdict(deal)
+    if JOURNAL:
+        JOURNAL.record_deal(record)
+    if MASTER_INDEX is not None:
+        MASTER_INDEX.append(record)
+
+
+def _finish_deal(deal: DealInfo, exhibits: dict, deal_dir: Path, files: dict):
+    _extract_files(deal_dir, files)
+    _fill_terms(deal, deal_dir, files)
+    _write_deal_metadata(deal, exhibits, deal_dir, files)
+    if INDEX:
+        INDEX.index_deal(deal_dir)
+    if ARCHIVE is not None:
+        ARCHIVE.add_matter(deal_dir, deal.matter_number, deal.accession)
+    _record_deal(deal)
+    if ARCHIVE is not None:
+        # Journaled first: a crash here leaves a stray folder, not a lost matter.
+        shutil.rmtree(deal_dir)
+
+
+def _store_exhibit(deal: DealInfo, deal_dir: Path, key: str, exhibit: dict) -> Optional[dict]:
+    """Put one exhibit in the matter folder; its file record, or None if skipped/failed."""
+    dest = _exhibit_dest(deal, deal_dir, exhibit)
+    if not dest:
+        return None
+    stored = _journaled_file(deal, key, dest)
+    if stored is None:
+        fetched = download_file(exhibit["url"], dest)
+        if fetched:
+            stored = _stored_file(deal, deal_dir, key, dest, fetched)
+    return stored
+
+
+def organize_deal(deal: DealInfo, exhibits: dict) -> Path:
+    """Create matter folder structure and download all exhibits.
+
+    With a WRITER pool the exhibits are materialized concurrently. The whole
+    matter is timed as the "organize" stage.
+    """
+    with METRICS.time_stage("organize"):
+        deal_dir = _make_deal_dir(deal)
+        keys = list(exhibits)
+
+        def store(key: str) -> Optional[dict]:
+            return _store_exhibit(deal, deal_dir, key, exhibits[key])
+
+        stored = WRITER.map(store, keys) if WRITER else map(store, keys)
+        files = {key: record for key, record in zip(keys, stored) if record}
+        _finish_deal(deal, exhibits, deal_dir, files)
     return deal_dir
 
 
+async def _in_writer(fn, *args):
+    """Run a blocking file-system step on the WRITER pool (or the default executor)."""
+    return await asyncio.get_running_loop().run_in_executor(WRITER, partial(fn, *args))
+
+
+async def organize_deal_async(deal: DealInfo, exhibits: dict, limit: asyncio.Semaphore) -> Path:
+    """Async variant of organize_deal: all exhibits of the deal download concurrently."""
+    with METRICS.time_stage("organize"):
+        deal_dir = await _in_writer(_make_deal_dir, deal)
+        files = {}
+
+        async def fetch(key: str, exhibit: dict):
+            dest = _exhibit_dest(deal, deal_dir, exhibit)
+            if not dest:
+                return
+            stored = await _in_writer(_journaled_file, deal, key, dest)
+            if stored is None:
+                async with limit:
+                    fetched = await download_file_async(exhibit["url"], dest)
+                if fetched:
+                    stored = _stored_file(deal, deal_dir, key, dest, fetched)
+            if stored:
+                files[key] = stored
+
+        await asyncio.gather(*(fetch(key, exhibit) for key, exhibit in exhibits.items()))
+        # Keep the metadata's file order identical to the sequential path.
+        files = {key: files[key] for key in exhibits if key in files}
+        await _in_writer(_finish_deal, deal, exhibits, deal_dir, files)
+    return deal_dir
+
+
+def _resumed_deal(result: dict, deal_type: str) -> Optional[DealInfo]:
+    """A matter finished by an earlier run for this filing and deal type, if any."""
+    deal = _journaled_deal(result["accession"])
+    if deal and deal_type in deal.deal_types:
+        return deal
+    return None
+
+
+def _already_processed(result: dict) -> bool:
+    return bool(JOURNAL) and JOURNAL.is_processed(result["accession"])
+
+
+def _skip_filing(result: dict, reason: str):
+    if JOURNAL:
+        JOURNAL.record_skipped(result["accession"], result["file_date"], reason)
+
+
+def _agreement_signature(raw: bytes) -> list:
+    if EXTRACT_POOL:
+        return EXTRACT_POOL.submit(document_signature, raw).result()
+    return document_signature(raw)
+
+
+def _fetch_signature(exhibits: dict) -> Optional[list]:
+    """MinHash signature of a filing's Ex 2.1 (None without DEDUP or if the fetch fails).
+
+    The agreement is fetched through the HTTP cache, so organize_deal links
+    the same bytes instead of downloading them again.
+    """
+    if not DEDUP:
+        return None
+    fetched = CLIENT.fetch(exhibits["ex_2_1"]["url"], stage="download")
+    if fetched.status_code != 200:
+        return None
+    return _agreement_signature(fetched.content)
+
+
+async def _fetch_signatures_async(candidates: list, limit: asyncio.Semaphore) -> dict:
+    """Batch form of _fetch_signature, keyed by accession: fetched and hashed concurrently."""
+    if not DEDUP or not candidates:
+        return {}
+    loop = asyncio.get_running_loop()
+
+    async def signature(exhibits: dict) -> Optional[list]:
+        async with limit:
+            fetched = await CLIENT.fetch_async(exhibits["ex_2_1"]["url"], stage="download")
+        if fetched.status_code != 200:
+            return None
+        return await loop.run_in_executor(EXTRACT_POOL, document_signature, fetched.content)
+
+    signatures = await asyncio.gather(*(signature(e) for _, e in candidates))
+    return {result["accession"]: sig for (result, _), sig in zip(candidates, signatures)}
+
+
+def _near_duplicate(result: dict, signature: Optional[list]) -> Optional[tuple]:
+    """(canonical accession, canonical matter, similarity) if the Ex 2.1 matches an indexed matter."""
+    if not DEDUP or signature is None:
+        return None
+    return DEDUP.find(signature, exclude=result["accession"])
+
+
+def _index_agreement(deal: DealInfo, signature: Optional[list], match: Optional[tuple]):
+    """Add a matter's Ex 2.1 to the LSH index.
+
+    Only filings that became matters are indexed, so every duplicate_of
+    points at a harvested matter.
+    """
+    if DEDUP and signature is not None:
+        DEDUP.add(deal.accession, signature, canonical_id=match[0] if match else None,
+                  matter_number=deal.matter_number)
+
+
+def _duplicate_matter(match: Optional[tuple]) -> Optional[str]:
+    if not match:
+        return None
+    canonical_id, matter, _ = match
+    return matter or DEDUP.matter_number(canonical_id) or canonical_id
+
+
+def _collapse(result: dict, match: Optional[tuple]) -> bool:
+    """Skip a near-duplicate filing entirely when collapsing is enabled."""
+    if not (match and COLLAPSE_DUPLICATES):
+        return False
+    print(f"  Skipping: near-duplicate of matter {_duplicate_matter(match)} ({match[2]:.0%} similar)")
+    _skip_filing(result, f"duplicate_of:{match[0]}")
+    return True
+
+
+def _matter_number(accession: str, matter_num: int) -> str:
+    """Journal-assigned matter number (stable across restarts), else the running counter."""
+    if JOURNAL:
+        return JOURNAL.assign_matter(accession)
+    return f"{matter_num:03d}"
+
+
 def harvest_deals(query: str, deal_type: str, max_deals: int = 10,
                   start_date: str = "2024-01-01", matter_start: int = 1) -> list:
     """Full pipeline: search → get exhibits → download → organize."""
@@ -173,15 +662,24 @@ def harvest_deals(query: str, deal_type: str, max_deals: int = 10,
     print(f"Searching EDGAR: {query}")
     print(f"{'='*60}")
 
-    results = search_edgar(query, max_results=max_deals * 3, start_date=start_date)
-    print(f"Found {len(results)} filings")
+    # Pages are pulled only as fast as filings are examined; the search stops
+    # as soon as enough of them have an Exhibit 2.1.
+    results = _in_shard(iter_search_edgar(query, start_date=start_date))
 
     deals_processed = []
     matter_num = matter_start
+    examined = 0
 
     for result in results:
         if len(deals_processed) >= max_deals:
             break
+        examined += 1
+
+        if _already_processed(result):
+            resumed = _resumed_deal(result, deal_type)
+            if resumed:
+                deals_processed.append(resumed)
+            continue
 
         entity = result["entity_name"]
         cik = result["cik"]
@@ -194,10 +692,16 @@ def harvest_deals(query: str, deal_type: str, max_deals: int = 10,
 
         if 'ex_2_1' not in exhibits:
             print(f"  Skipping: no Exhibit 2.1 found")
+            _skip_filing(result, "no_ex_2_1")
+            continue
+
+        signature = _fetch_signature(exhibits)
+        match = _near_duplicate(result, signature)
+        if _collapse(result, match):
             continue
 
         deal = DealInfo(
-            matter_number=f"{matter_num:03d}",
+            matter_number=_matter_number(accession, matter_num),
             deal_name=entity[:50],
             deal_type=deal_type,
             buyer="TBD",
@@ -205,7 +709,12 @@ def harvest_deals(query: str, deal_type: str, max_deals: int = 10,
             filing_date=file_date,
             cik=cik,
             accession=accession,
+            duplicate_of=_duplicate_matter(match),
+            deal_types=[deal_type],
         )
+        _index_agreement(deal, signature, match)
+        if deal.duplicate_of:
+            print(f"  Near-duplicate of matter {deal.duplicate_of} ({match[2]:.0%} similar)")
 
         deal_dir = organize_deal(deal, exhibits)
         deals_processed.append(deal)
@@ -213,57 +722,632 @@ def harvest_deals(query: str, deal_type: str, max_deals: int = 10,
 
         print(f"  ✓ Organized in: {deal_dir}")
 
+    print(f"\nExamined {examined} filings for {len(deals_processed)} deals")
     return deals_processed
 
 
-def main():
-    OUTPUT_DIR.mkdir(exist_ok=True)
-    all_deals = []
-    next_matter = 1
+async def harvest_deals_async(query: str, deal_type: str, max_deals: int = 10,
+                              start_date: str = "2024-01-01", matter_start: int = 1,
+                              concurrency: int = 8) -> list:
+    """Concurrent pipeline for a single query; see harvest_plan_async."""
+    spec = HarvestSpec(query=query, deal_type=deal_type, max_deals=max_deals, start_date=start_date)
+    return await harvest_plan_async([spec], concurrency=concurrency, matter_start=matter_start)
+
+
+def _journaled_deal(accession: str) -> Optional[DealInfo]:
+    done = JOURNAL.completed_deal(accession) if JOURNAL else None
+    if not done:
+        return None
+    deal = DealInfo(**done)
+    if not deal.deal_types:
+        deal.deal_types = [deal.deal_type]
+    return deal
+
 
-    # Harvest merger agreements
-    deals = harvest_deals(
+async def harvest_plan_async(specs: list, concurrency: int = 8, matter_start: int = 1) -> list:
+    """Run several searches as one harvest, fetching each filing only once.
+
+    Works in rounds. Each round pulls the next `concurrency` hits from every
+    spec that still needs deals, merges them by accession (a filing matched by
+    several queries keeps all their deal types), then fetches the new filings'
+    index.json files and exhibits in one concurrent batch. A filing counts
+    toward the quota of every spec that matched it. Matter numbers follow
+    spec order, then search rank. Throughput is bounded by RATE_LIMITER, not
+    by per-request latency.
+    """
+    for spec in specs:
+        print(f"\n{'='*60}")
+        source = spec.query if spec.discovery == "efts" else "quarterly form index"
+        print(f"Searching EDGAR: {source}  [{spec.deal_type}, {spec.forms}, "
+              f"{spec.start_date}..{spec.end_date}, max {spec.max_deals}]")
+    print(f"{'='*60}")
+
+    searches = [_discover(spec, workers=concurrency) for spec in specs]
+    found = [0] * len(specs)
+    seen: dict = {}          # accession -> DealInfo, or None if not made a matter
+    relabeled: dict = {}     # accession -> DealInfo whose labels grew after organizing
+    limit = asyncio.Semaphore(concurrency)
+    deals_processed = []
+    organize_tasks = []
+    matter_num = matter_start
+    examined = 0
+
+    def open_specs() -> list:
+        return [i for i, spec in enumerate(specs)
+                if searches[i] is not None and found[i] < spec.max_deals]
+
+    def wants(spec_ids: list) -> list:
+        """The specs among these that still have room."""
+        return [i for i in spec_ids if found[i] < specs[i].max_deals]
+
+    def claim(deal: DealInfo, spec_ids: list):
+        """Count a matter toward each matching spec and record its labels."""
+        for i in spec_ids:
+            if specs[i].deal_type not in deal.deal_types:
+                deal.deal_types.append(specs[i].deal_type)
+                relabeled[deal.accession] = deal
+            if found[i] < specs[i].max_deals:
+                found[i] += 1
+
+    async def fetch_index(result: dict) -> dict:
+        async with limit:
+            return await get_filing_exhibits_async(result["cik"], result["accession"])
+
+    while open_specs():
+        # 1. Search: next window of hits from every spec still short of deals.
+        batch: dict = {}     # accession -> (result, [spec ids]), in spec/rank order
+        for i in open_specs():
+            hits = await asyncio.to_thread(lambda: list(islice(searches[i], concurrency)))
+            if not hits:
+                searches[i].close()
+                searches[i] = None
+                continue
+            for result in hits:
+                accession = result["accession"]
+                if accession in seen:
+                    if seen[accession]:
+                        claim(seen[accession], [i])
+                    continue
+                batch.setdefault(accession, (result, []))[1].append(i)
+        examined += len(batch)
+
+        # 2. Merge with earlier runs: journaled filings are not fetched again.
+        pending = []
+        for accession, (result, spec_ids) in batch.items():
+            if _already_processed(result):
+                deal = _journaled_deal(accession)
+                seen[accession] = deal
+                if deal:
+                    claim(deal, spec_ids)
+                    deals_processed.append(deal)
+            else:
+                pending.append(result)
+
+        # 3. One batched pass over the new filings' indexes.
+        indexes = dict(zip(
+            (r["accession"] for r in pending),
+            await asyncio.gather(*(fetch_index(r) for r in pending)),
+        ))
+        for result in pending:
+            seen[result["accession"]] = None
+            if 'ex_2_1' not in indexes[result["accession"]]:
+                print(f"  Skipping {result['entity_name']} ({result['file_date']}): no Exhibit 2.1 found")
+                _skip_filing(result, "no_ex_2_1")
+        queue = [r for r in pending if 'ex_2_1' in indexes[r["accession"]]]
+
+        while queue:
+            # 4. Agreements are fetched only for filings that fit the remaining
+            #    quotas; a collapsed duplicate frees its slot for the next pass.
+            room = list(found)
+            chosen, queue = [], [r for r in queue if wants(batch[r["accession"]][1])]
+            for result in queue:
+                spec_ids = [i for i in batch[result["accession"]][1] if room[i] < specs[i].max_deals]
+                if spec_ids:
+                    chosen.append(result)
+                    for i in spec_ids:
+                        room[i] += 1
+            queue = [r for r in queue if r not in chosen]
+            signatures = await _fetch_signatures_async(
+                [(r, indexes[r["accession"]]) for r in chosen], limit)
+
+            # 5. Assign matters in order while some matching spec still has room.
+            #    Duplicates are looked up here, in search order, so a pair inside
+            #    one window is still caught.
+            for result in chosen:
+                accession = result["accession"]
+                spec_ids = batch[accession][1]
+                wanted = wants(spec_ids)
+                if not wanted:
+                    continue
+                entity = result["entity_name"]
+                signature = signatures.get(accession)
+                match = _near_duplicate(result, signature)
+                if _collapse(result, match):
+                    continue
+
+                deal = DealInfo(
+                    matter_number=_matter_number(accession, matter_num),
+                    deal_name=entity[:50],
+                    deal_type=specs[wanted[0]].deal_type,
+                    buyer="TBD",
+                    target=entity,
+                    filing_date=result["file_date"],
+                    cik=result["cik"],
+                    accession=accession,
+                    duplicate_of=_duplicate_matter(match),
+                    deal_types=list(dict.fromkeys(specs[i].deal_type for i in spec_ids)),
+                )
+                _index_agreement(deal, signature, match)
+                claim(deal, wanted)
+                seen[accession] = deal
+                labels = ", ".join(deal.deal_types)
+                print(f"\n--- Processing: {entity} ({deal.filing_date}) → matter {deal.matter_number} [{labels}] ---")
+                organize_tasks.append(asyncio.create_task(organize_deal_async(deal, indexes[accession], limit)))
+                deals_processed.append(deal)
+                matter_num += 1
+
+    for search in searches:
+        if search is not None:
+            await asyncio.to_thread(search.close)
+
+    for deal_dir in await asyncio.gather(*organize_tasks):
+        print(f"  ✓ Organized in: {deal_dir}")
+
+    # Matters picked up by another query after their metadata was written.
+    await asyncio.gather(*(_in_writer(_relabel_deal, deal) for deal in relabeled.values()))
+
+    print(f"\nExamined {examined} filings for {len(deals_processed)} deals")
+    return deals_processed
+
+
+def _relabel_deal(deal: DealInfo):
+    """Rewrite an organized matter's deal_types after another query matched it."""
+    manifest = ARCHIVE.manifest(deal.matter_number) if ARCHIVE is not None else None
+    if manifest and manifest["accession"] == deal.accession:
+        metadata = json.loads(ARCHIVE.read_file(deal.matter_number, "_deal_metadata.json"))
+        metadata["deal_types"] = deal.deal_types
+        ARCHIVE.replace_file(deal.matter_number, "_deal_metadata.json",
+                             json.dumps(metadata, indent=2).encode("utf-8"))
+        _record_deal(deal)
+        print(f"  ✓ Relabeled matter {deal.matter_number}: {', '.join(deal.deal_types)}")
+        return
+    for metadata_file in OUTPUT_DIR.glob(f"{deal.matter_number}_*/_deal_metadata.json"):
+        metadata = json.loads(metadata_file.read_text())
+        if metadata.get("accession") != deal.accession:
+            continue
+        metadata["deal_types"] = deal.deal_types
+        write_text_atomic(metadata_file, json.dumps(metadata, indent=2))
+        _record_deal(deal)
+        print(f"  ✓ Relabeled matter {deal.matter_number}: {', '.join(deal.deal_types)}")
+
+
+DEFAULT_PLAN = [
+    HarvestSpec(
         query='"agreement and plan of merger" "closing conditions" "indemnification"',
         deal_type="merger",
         max_deals=5,
         start_date="2024-01-01",
-        matter_start=next_matter
-    )
-    all_deals.extend(deals)
-    next_matter += len(deals)
-
-    # Harvest stock purchase agreements
-    deals = harvest_deals(
+    ),
+    HarvestSpec(
         query='"stock purchase agreement" "purchase price" "indemnification"',
         deal_type="stock_purchase",
         max_deals=5,
         start_date="2024-01-01",
-        matter_start=next_matter
-    )
-    all_deals.extend(deals)
-    next_matter += len(deals)
-
-    # Harvest asset purchase agreements
-    deals = harvest_deals(
+    ),
+    HarvestSpec(
         query='"asset purchase agreement" "assumed liabilities" "purchase price"',
         deal_type="asset_purchase",
         max_deals=3,
         start_date="2024-01-01",
-        matter_start=next_matter
-    )
-    all_deals.extend(deals)
+    ),
+]
+
+# --discovery bulk without a plan: every merger-related filing, typed later.
+BULK_PLAN = [
+    HarvestSpec(query="", deal_type="unclassified", max_deals=13, forms=BULK_FORMS,
+                discovery="bulk"),
+]
+
+
+async def _run_plan(specs: list, concurrency: int) -> list:
+    # Size the worker pool so every in-flight request has a thread to block in.
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=concurrency + 4))
+    CLIENT.set_pool_size(concurrency)
+    return await harvest_plan_async(specs, concurrency=concurrency)
+
+
+COMMANDS = ("harvest", "search", "merge")
+
+
+def _add_harvest_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--output", type=Path, default=OUTPUT_DIR,
+                        help=f"Output root for matters, indexes and caches (default: {OUTPUT_DIR})")
+    parser.add_argument("--query", action="append", metavar="QUERY",
+                        help="EFTS full-text query to harvest (repeatable); replaces the plan. "
+                             "Matters are labelled with --deal-type")
+    parser.add_argument("--forms", help="Form types to search, comma-separated (default: 8-K)")
+    parser.add_argument("--start-date", help="Earliest filing date (YYYY-MM-DD), for every search")
+    parser.add_argument("--end-date", help="Latest filing date (YYYY-MM-DD), for every search")
+    parser.add_argument("--max-deals", type=int,
+                        help="Deals to harvest per search (per shard with --shard)")
+    parser.add_argument("--shard", metavar="I/N",
+                        help="Harvest only the filings whose accession hashes to shard I of N "
+                             "(1-based); run each shard into its own --output and combine them "
+                             "with the merge command")
+    parser.add_argument("--plan", type=Path,
+                        help="JSON harvest plan (list of query/deal_type/date-range specs); "
+                             "defaults to the built-in merger/SPA/APA plan")
+    parser.add_argument("--discovery", choices=DISCOVERY_MODES,
+                        help="Find candidate filings via EFTS full-text search or the quarterly "
+                             "form indexes (bulk); overrides the plan's discovery setting")
+    parser.add_argument("--bulk-index-dir", type=Path,
+                        help="Local mirror of edgar/full-index/ to read instead of sec.gov")
+    parser.add_argument("--list-candidates", action="store_true",
+                        help="Print the plan's candidate filings and exit without fetching them")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Requests in flight at once")
+    parser.add_argument("--rate", type=float, default=RATE_LIMIT,
+                        help="Process-wide request rate ceiling (requests/second); the rate "
+                             "drops below it while SEC is throttling")
+    parser.add_argument("--since", action="store_true",
+                        help="Only harvest filings dated on/after the last journal checkpoint")
+    parser.add_argument("--search", metavar="QUERY",
+                        help="Query the precedent index (FTS5 syntax) instead of harvesting")
+    parser.add_argument("--deal-type",
+                        help="Deal type for --query matters (default: unclassified); "
+                             "with --search: only matters of this deal type")
+    parser.add_argument("--reindex", action="store_true",
+                        help="Bring the precedent index up to date with the matter folders and exit")
+    parser.add_argument("--extract-terms", action="store_true",
+                        help="Extract deal terms (parties, dates, price, value, industry) for "
+                             "every matter folder that lacks them, then exit")
+    parser.add_argument("--list-deals", action="store_true",
+                        help="List indexed matters by deal terms, largest first (filter with "
+                             "--deal-type, --industry, --party, --min-value)")
+    parser.add_argument("--industry", help="With --list-deals: SIC industry description")
+    parser.add_argument("--party", help="With --list-deals: buyer or target name contains this")
+    parser.add_argument("--min-value", type=float, help="With --list-deals: minimum deal value (USD)")
+    parser.add_argument("--extract-workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes for HTML-to-text extraction")
+    parser.add_argument("--writer-workers", type=int, default=8,
+                        help="Threads for matter-folder, exhibit and metadata writes")
+    parser.add_argument("--collapse-duplicates", action="store_true",
+                        help="Skip filings whose Ex 2.1 nearly matches an earlier matter "
+                             "(default: keep them, flagged with duplicate_of)")
+    parser.add_argument("--sec-base", metavar="URL",
+                        help="Send every SEC request (EFTS, archives, submissions) to this host "
+                             "instead, e.g. a harvester.replay server")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Bypass the on-disk HTTP cache")
+    parser.add_argument("--cache-max-gb", type=float, default=DEFAULT_MAX_BYTES / 1024 ** 3,
+                        help="Evict least-recently-used cache entries above this size")
+    parser.add_argument("--archive", action="store_true",
+                        help=f"Store finished matters zstd-compressed and deduplicated under "
+                             f"{OUTPUT_DIR / ARCHIVE_DIR} instead of as folders "
+                             f"(needs the zstandard package)")
+    parser.add_argument("--materialize", type=Path, nargs="?", const=True, metavar="DIR",
+                        help="Write every archived matter out as a folder under DIR "
+                             "(default: the output root) and exit")
+    parser.add_argument("--metrics", type=Path,
+                        help=f"Write the per-stage JSON run summary here "
+                             f"(default: {OUTPUT_DIR / METRICS_FILE})")
+    parser.add_argument("--prometheus", type=Path,
+                        help="Also write the run summary in Prometheus text format "
+                             "(e.g. for the node_exporter textfile collector)")
+
+
+def parse_args(argv: Optional[list] = None) -> argparse.Namespace:
+    """harvest (the default when no command is given), search or merge."""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in (*COMMANDS, "-h", "--help"):
+        argv.insert(0, "harvest")
+    parser = argparse.ArgumentParser(description="EDGAR M&A Document Harvester")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    _add_harvest_arguments(commands.add_parser(
+        "harvest", help="Search EDGAR and build matter folders (default command)"))
+
+    search = commands.add_parser(
+        "search", help="Query the precedent index: full text with QUERY, else by deal terms")
+    search.add_argument("query", nargs="?", help="FTS5 query over exhibit text")
+    search.add_argument("--output", type=Path, default=OUTPUT_DIR, help="Output root to search")
+    search.add_argument("--deal-type", help="Only matters of this deal type")
+    search.add_argument("--industry", help="Without QUERY: SIC industry description")
+    search.add_argument("--party", help="Without QUERY: buyer or target name contains this")
+    search.add_argument("--min-value", type=float, help="Without QUERY: minimum deal value (USD)")
+
+    merge = commands.add_parser(
+        "merge", help="Combine sharded runs into one _master_index.json with global matter numbers")
+    merge.add_argument("shards", nargs="+", type=Path, help="Output roots of the shard runs")
+    merge.add_argument("--output", type=Path, default=OUTPUT_DIR,
+                       help=f"Where to write the merged index (default: {OUTPUT_DIR})")
+    return parser.parse_args(argv)
+
+
+def search_precedents(query: str, deal_type: Optional[str] = None):
+    results = INDEX.search(query, deal_type=deal_type)
+    for hit in results:
+        print(f"{hit['matter_number']}  {hit['deal_name']} ({hit['deal_type']}, {hit['filing_date']})"
+              f"  {hit['path']}")
+        print(f"    {hit['snippet']}")
+    print(f"\n{len(results)} matches")
+
+
+def list_candidates(specs: list):
+    """Print each spec's candidate filings, up to its max_deals, without fetching indexes."""
+    for spec in specs:
+        print(f"\n{spec.deal_type}  ({spec.discovery}: {spec.query or spec.forms})")
+        for result in islice(_discover(spec), spec.max_deals):
+            print(f"  {result['file_date']}  {result['form_type']:<8} {result['accession']}  "
+                  f"CIK {result['cik']:<8} {result['entity_name']}")
+
+
+def _open_archive() -> PrecedentArchive:
+    try:
+        return PrecedentArchive(OUTPUT_DIR / ARCHIVE_DIR)
+    except RuntimeError as e:
+        raise SystemExit(f"Error: {e}")
+
+
+def print_archive_stats():
+    stats = ARCHIVE.stats()
+    ratio = stats["files_bytes"] / stats["stored_bytes"] if stats["stored_bytes"] else 0
+    print(f"Archive: {stats['matters']} matters, {stats['files_bytes'] / 1e6:.1f} MB of files "
+          f"in {stats['blobs']} blobs, {stats['stored_bytes'] / 1e6:.1f} MB on disk ({ratio:.1f}x)")
+
+
+def materialize_archive(dest_root: Path):
+    """Write the folder view of every archived matter under dest_root."""
+    for matter_number in ARCHIVE.matters():
+        deal_dir = ARCHIVE.materialize(matter_number, dest_root)
+        print(f"  ✓ {matter_number} → {deal_dir}")
+    print_archive_stats()
+
+
+def list_deals(args: argparse.Namespace):
+    deals = INDEX.find_deals(deal_type=args.deal_type, industry=args.industry, party=args.party,
+                             min_value=args.min_value)
+    for deal in deals:
+        print(f"{deal['matter_number']}  {deal['buyer']} / {deal['target']}  "
+              f"{deal['deal_value'] or '-'}  signed {deal['signing_date'] or '?'}  "
+              f"({deal['deal_type']}; {deal['industry'] or 'industry unknown'})")
+    print(f"\n{len(deals)} matters")
+
+
+def extract_corpus_terms():
+    """Extract deal terms for every matter folder not yet in the terms cache.
+
+    Documents are parsed in EXTRACT_POOL; metadata, the precedent index, the
+    journal and the master index are then updated matter by matter.
+    """
+    pending = []
+    for metadata_file in sorted(OUTPUT_DIR.glob("*/_deal_metadata.json")):
+        metadata = json.loads(metadata_file.read_text())
+        if TERMS.get(metadata["accession"]) is None:
+            pending.append((metadata_file, metadata))
+    sources = [_term_sources(path.parent, metadata.get("files", {})) for path, metadata in pending]
+    extracted = EXTRACT_POOL.map(extract_terms, *zip(*sources), chunksize=4) if sources else []
+    names = {f.name for f in fields(DealInfo)}
+    for (metadata_file, metadata), terms in zip(pending, extracted):
+        deal = DealInfo(**{k: v for k, v in metadata.items() if k in names})
+        _apply_terms(deal, _with_industry(deal, terms))
+        metadata.update({k: v for k, v in asdict(deal).items() if k != "exhibits"})
+        write_text_atomic(metadata_file, json.dumps(metadata, indent=2))
+        INDEX.index_deal(metadata_file.parent, force=True)
+        _record_deal(deal)
+        print(f"  ✓ {deal.matter_number}: {deal.buyer} / {deal.target}, {deal.deal_value or 'no value'}")
+    print(f"Extracted terms for {len(pending)} matters")
+
+
+def _matter_location(root: Path, deal: dict, output: Path) -> Optional[dict]:
+    """Where a shard keeps a matter, relative to `output`: its folder, else its
+    entry in the shard's --archive; None if it has neither."""
+    number = deal["shard_matter_number"]
+    folder = root / _deal_folder_name(number, deal["deal_name"])
+    if not folder.is_dir():
+        folder = next((path for path in sorted(root.glob(f"{number}_*")) if path.is_dir()), folder)
+    if folder.is_dir():
+        return {"matter_dir": os.path.relpath(folder, output)}
+    # The manifest path, not PrecedentArchive, so merging needs no zstandard.
+    archive = root / ARCHIVE_DIR
+    if (archive / "manifests" / f"{number}.json").is_file():
+        return {"matter_dir": None, "archive": os.path.relpath(archive, output),
+                "archive_matter": number}
+    return None
+
+
+def merge_shards(shard_roots: list, output: Path):
+    """Write one _master_index.json for several --shard runs, numbered globally.
+
+    Records point at their matters inside the shard roots, relative to
+    `output`: the folder (matter_dir), or for an --archive shard the archive
+    and the shard-local matter number in it (archive, archive_matter).
+    Nothing is copied. Matters found in neither place are reported and
+    keep matter_dir null.
+    """
+    sources = []
+    for root in shard_roots:
+        deals = load_deals(root / MASTER_INDEX_LOG, root / MASTER_INDEX_FILE)
+        if not deals:
+            print(f"  Warning: no master index in {root}")
+        sources.append((str(root), deals))
+    merged = merge_indexes(sources)
+    output.mkdir(parents=True, exist_ok=True)
+    missing = []
+    for deal in merged:
+        location = _matter_location(Path(deal["shard"]), deal, output)
+        if location is None:
+            missing.append(deal)
+            location = {"matter_dir": None}
+        deal.update(location)
+    write_text_atomic(output / MASTER_INDEX_FILE, json.dumps(merged, indent=2))
+    for root, deals in sources:
+        print(f"  {root}: {len(deals)} matters")
+    for deal in missing:
+        print(f"  Warning: matter {deal['shard_matter_number']} ({deal['deal_name']}) is in "
+              f"{deal['shard']}'s index but has no folder or archive entry there")
+    print(f"Merged {len(merged)} matters into {output / MASTER_INDEX_FILE}"
+          + (f"; {len(missing)} not found" if missing else ""))
+
+
+def reindex_precedents():
+    """Extract any exhibits missing text/section files, then refresh the index."""
+    exhibit_paths = []
+    for metadata_file in sorted(OUTPUT_DIR.glob("*/_deal_metadata.json")):
+        files = json.loads(metadata_file.read_text()).get("files", {})
+        exhibit_paths.extend(metadata_file.parent / info["path"] for info in files.values())
+    extract_exhibits(exhibit_paths, EXTRACT_POOL)
+    changed = INDEX.index_tree(OUTPUT_DIR)
+    print(f"Extracted {len(exhibit_paths)} exhibits; re-indexed {changed} matters "
+          f"into {OUTPUT_DIR / INDEX_FILE}")
+
+
+def write_metrics(json_path: Path, prometheus_path: Optional[Path] = None):
+    """Write the run's per-stage summary and print it as a table."""
+    summary = METRICS.summary()
+    summary["rate_limiter"] = {
+        "ceiling": RATE_LIMITER.ceiling,
+        "final_rate": round(RATE_LIMITER.rate, 3),
+        "throttle_events": RATE_LIMITER.throttle_events,
+    }
+    write_text_atomic(json_path, json.dumps(summary, indent=2))
+    if prometheus_path:
+        write_text_atomic(prometheus_path, METRICS.to_prometheus())
+    print(f"\n{'stage':<12} {'requests':>8} {'cached':>7} {'req/s':>7} {'MB':>8} "
+          f"{'p50 s':>6} {'p90 s':>6} {'429':>5} {'5xx':>5} {'wait s':>7}")
+    for name, stage in summary["stages"].items():
+        latency = stage["latency_seconds"]
+        print(f"{name:<12} {stage['requests']:>8} {stage['cache_hits']:>7} "
+              f"{stage['requests_per_second']:>7} {stage['bytes'] / 1e6:>8.2f} "
+              f"{latency['p50'] or 0:>6} {latency['p90'] or 0:>6} {stage['throttled_429']:>5} "
+              f"{stage['server_errors_5xx']:>5} {stage['limiter_wait_seconds']:>7}")
+    if RATE_LIMITER.throttle_events:
+        print(f"Throttled {RATE_LIMITER.throttle_events} times; rate ended at "
+              f"{RATE_LIMITER.rate:.1f}/{RATE_LIMITER.ceiling:g} req/s")
+    print(f"Run metrics saved to: {json_path}")
+
+
+def use_sec_base(base: str):
+    """Serve EFTS, the archives and the submissions API from one host (see harvester.replay)."""
+    global EFTS_BASE, EDGAR_BASE, FULL_INDEX_BASE, SUBMISSIONS_BASE
+    base = base.rstrip("/")
+    EFTS_BASE = f"{base}/LATEST/search-index"
+    EDGAR_BASE = f"{base}/Archives/edgar/data"
+    FULL_INDEX_BASE = f"{base}/Archives/edgar/full-index"
+    SUBMISSIONS_BASE = f"{base}/submissions"
+
+
+def _harvest_specs(args: argparse.Namespace) -> list:
+    """The run's searches: --query, else --plan, else a built-in plan, with CLI overrides."""
+    if args.query:
+        specs = [HarvestSpec(query=query, deal_type=args.deal_type or "unclassified")
+                 for query in args.query]
+    elif args.plan:
+        specs = load_plan(args.plan)
+    else:
+        specs = BULK_PLAN if args.discovery == "bulk" else DEFAULT_PLAN
+    overrides = {
+        "discovery": args.discovery, "forms": args.forms, "max_deals": args.max_deals,
+        "start_date": args.start_date, "end_date": args.end_date,
+    }
+    overrides = {key: value for key, value in overrides.items() if value is not None}
+    return [replace(spec, **overrides) for spec in specs]
+
+
+def main():
+    global JOURNAL, INDEX, EXTRACT_POOL, DEDUP, COLLAPSE_DUPLICATES, BULK_INDEX, BULK_INDEX_DIR
+    global WRITER, MASTER_INDEX, ARCHIVE, TERMS, OUTPUT_DIR, SHARD
+    args = parse_args()
+    OUTPUT_DIR = args.output
+    if args.command == "merge":
+        merge_shards(args.shards, OUTPUT_DIR)
+        return
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    INDEX = PrecedentIndex(OUTPUT_DIR / INDEX_FILE)
+    if args.command == "search":
+        if args.query:
+            search_precedents(args.query, args.deal_type)
+        else:
+            list_deals(args)
+        return
+
+    RATE_LIMITER.set_rate(args.rate)
+    if args.sec_base:
+        use_sec_base(args.sec_base)
+    if args.shard:
+        try:
+            SHARD = parse_shard(args.shard)
+        except ValueError as e:
+            raise SystemExit(f"Error: {e}")
+    if args.search:
+        search_precedents(args.search, args.deal_type)
+        return
+    if args.list_deals:
+        list_deals(args)
+        return
+    if args.archive or args.materialize:
+        ARCHIVE = _open_archive()
+    if args.materialize:
+        materialize_archive(OUTPUT_DIR if args.materialize is True else args.materialize)
+        return
+
+    specs = _harvest_specs(args)
+    BULK_INDEX_DIR = args.bulk_index_dir
+    BULK_INDEX = BulkIndex(OUTPUT_DIR / BULK_INDEX_FILE)
+    if not args.no_cache:
+        CLIENT.cache = HttpCache(OUTPUT_DIR / HTTP_CACHE_DIR, int(args.cache_max_gb * 1024 ** 3))
+    if args.list_candidates:
+        list_candidates(specs)
+        return
+
+    EXTRACT_POOL = ProcessPoolExecutor(max_workers=args.extract_workers)
+    if args.reindex:
+        with EXTRACT_POOL:
+            reindex_precedents()
+        return
+    JOURNAL = HarvestJournal(OUTPUT_DIR / JOURNAL_FILE)
+    TERMS = TermsCache(OUTPUT_DIR / TERMS_FILE)
+    DEDUP = DuplicateIndex(OUTPUT_DIR / DEDUP_FILE)
+    COLLAPSE_DUPLICATES = args.collapse_duplicates
+    WRITER = ThreadPoolExecutor(max_workers=max(1, args.writer_workers), thread_name_prefix="writer")
+    MASTER_INDEX = MasterIndex(OUTPUT_DIR / MASTER_INDEX_LOG, OUTPUT_DIR / MASTER_INDEX_FILE)
+    # Output directories from before the incremental index: start from the journal.
+    MASTER_INDEX.seed(JOURNAL.completed_deals())
+
+    checkpoint = JOURNAL.last_checkpoint()
+    if args.since and checkpoint and checkpoint["latest_filing_date"]:
+        since = checkpoint["latest_filing_date"]
+        print(f"Incremental run: filings on/after {since}")
+        specs = [replace(spec, start_date=max(spec.start_date, since)) for spec in specs]
+
+    try:
+        if args.extract_terms:
+            extract_corpus_terms()
+        else:
+            asyncio.run(_run_plan(specs, max(1, args.concurrency)))
+            JOURNAL.checkpoint()
+    finally:
+        # Every matter finished so far — this run and earlier ones — was
+        # appended as it completed, so the index is complete even after a
+        # crash; closing compacts it into _master_index.json.
+        WRITER.shutdown()
+        all_deals = MASTER_INDEX.deals()
+        MASTER_INDEX.close()
+        JOURNAL.close()
+        TERMS.close()
+        EXTRACT_POOL.shutdown()
+        write_metrics(args.metrics or OUTPUT_DIR / METRICS_FILE, args.prometheus)
 
     # Summary
     print(f"\n{'='*60}")
-    print(f"HARVESTING COMPLETE")
+    print(f"HARVESTING COMPLETE" + (f" (shard {SHARD[0]}/{SHARD[1]})" if SHARD else ""))
     print(f"{'='*60}")
     print(f"Total deals downloaded: {len(all_deals)}")
     for deal in all_deals:
-        print(f"  {deal.matter_number}: {deal.deal_name} ({deal.deal_type}) — {deal.filing_date}")
-
-    index = [asdict(d) for d in all_deals]
-    (OUTPUT_DIR / "_master_index.json").write_text(json.dumps(index, indent=2))
-    print(f"\nMaster index saved to: {OUTPUT_DIR / '_master_index.json'}")
+        print(f"  {deal['matter_number']}: {deal['deal_name']} ({deal['deal_type']}) — {deal['filing_date']}")
+    print(f"\nMaster index saved to: {OUTPUT_DIR / MASTER_INDEX_FILE}")
+    if ARCHIVE is not None:
+        print_archive_stats()
 
 
 if __name__ == "__main__":
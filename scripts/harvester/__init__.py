@@ -0,0 +1,6 @@
+"""
+Support modules for scripts/harvest_edgar.py.
+
+harvest_edgar.py stays the entry point; the pieces that are shared between its
+synchronous and asyncio harvest modes live here.
+"""
@@ -0,0 +1,204 @@
+"""
+Compressed, content-addressed archive of finished matters.
+
+A matter folder is mostly EDGAR HTML, which compresses about 10x, and form
+documents (voting agreements, press-release boilerplate) recur across
+matters. The archive stores every file once, zstd-compressed, under
+blobs/<sha256[:2]>/<sha256>.zst, where the digest is that of the original
+bytes. Each matter gets a small manifest, manifests/<matter_number>.json,
+listing its files by relative path, digest and size.
+
+Readers decompress on demand: open() streams one file of a matter,
+read_file() returns its bytes. The familiar folder layout is a materialized
+view: materialize() writes a matter's folder back out from the blobs,
+checking every digest on the way.
+
+zstandard is an optional dependency, needed only when an archive is opened.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+from .atomic import write_atomic, write_temp, write_text_atomic
+
+DEFAULT_LEVEL = 10
+CHUNK_SIZE = 256 * 1024
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError(
+            "the precedent archive needs the zstandard package: pip3 install zstandard"
+        ) from None
+    return zstandard
+
+
+def _file_digest(path: Path) -> tuple:
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+class PrecedentArchive:
+    """zstd blob store plus one manifest per matter."""
+
+    def __init__(self, root: Path, level: int = DEFAULT_LEVEL):
+        self._zstd = _zstd()
+        self.root = Path(root)
+        self.level = level
+        for sub in ("blobs", "manifests", "tmp"):
+            (self.root / sub).mkdir(parents=True, exist_ok=True)
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.root / "blobs" / sha256[:2] / f"{sha256}.zst"
+
+    def manifest_path(self, matter_number: str) -> Path:
+        return self.root / "manifests" / f"{matter_number}.json"
+
+    def has(self, sha256: str) -> bool:
+        return self.blob_path(sha256).exists()
+
+    # ------------------------------------------------------------------
+    # Store
+    # ------------------------------------------------------------------
+
+    def _put(self, sha256: str, chunks) -> int:
+        """Compress chunks into the blob for sha256 unless it exists; its stored size."""
+        blob = self.blob_path(sha256)
+        if not blob.exists():
+            # Compressor objects are not thread-safe; matters are archived on the writer pool.
+            compressor = self._zstd.ZstdCompressor(level=self.level, write_checksum=True)
+            chunker = compressor.chunker(chunk_size=CHUNK_SIZE)
+
+            def compressed():
+                for chunk in chunks:
+                    yield from chunker.compress(chunk)
+                yield from chunker.finish()
+
+            tmp, _, _ = write_temp(self.root / "tmp", compressed())
+            blob.parent.mkdir(exist_ok=True)
+            os.chmod(tmp, 0o444)
+            os.replace(tmp, blob)   # a concurrent writer of the same digest wrote the same bytes
+        return blob.stat().st_size
+
+    def put_file(self, path: Path) -> dict:
+        """Store one file; its {sha256, bytes, stored_bytes} record."""
+        sha256, size = _file_digest(path)
+
+        def chunks():
+            with open(path, "rb") as f:
+                yield from iter(lambda: f.read(CHUNK_SIZE), b"")
+
+        return {"sha256": sha256, "bytes": size, "stored_bytes": self._put(sha256, chunks())}
+
+    def put_bytes(self, data: bytes) -> dict:
+        sha256 = hashlib.sha256(data).hexdigest()
+        return {"sha256": sha256, "bytes": len(data), "stored_bytes": self._put(sha256, [data])}
+
+    def add_matter(self, deal_dir: Path, matter_number: str, accession: str) -> dict:
+        """Store every file under a matter folder and write the matter's manifest."""
+        deal_dir = Path(deal_dir)
+        files, folders = {}, []
+        for path in sorted(deal_dir.rglob("*")):
+            if path.is_dir():
+                folders.append(path.relative_to(deal_dir).as_posix())
+            elif path.is_file():
+                files[path.relative_to(deal_dir).as_posix()] = self.put_file(path)
+        manifest = {
+            "matter_number": matter_number,
+            "accession": accession,
+            "folder": deal_dir.name,
+            "folders": folders,     # kept so empty subfolders reappear in the view
+            "files": files,
+        }
+        write_text_atomic(self.manifest_path(matter_number), json.dumps(manifest, indent=2))
+        return manifest
+
+    def replace_file(self, matter_number: str, path: str, data: bytes):
+        """Point one file of an archived matter at new contents (e.g. updated metadata)."""
+        manifest = self.manifest(matter_number)
+        if manifest is None:
+            raise KeyError(matter_number)
+        manifest["files"][path] = self.put_bytes(data)
+        write_text_atomic(self.manifest_path(matter_number), json.dumps(manifest, indent=2))
+
+    # ------------------------------------------------------------------
+    # Read
+    # ------------------------------------------------------------------
+
+    def manifest(self, matter_number: str) -> Optional[dict]:
+        path = self.manifest_path(matter_number)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def matters(self) -> list:
+        """Matter numbers in the archive, in order."""
+        return sorted((p.stem for p in (self.root / "manifests").glob("*.json")), key=int)
+
+    def _record(self, matter_number: str, path: str) -> dict:
+        manifest = self.manifest(matter_number)
+        if manifest is None or path not in manifest["files"]:
+            raise FileNotFoundError(f"{matter_number}/{path} is not in the archive")
+        return manifest["files"][path]
+
+    def open_blob(self, sha256: str) -> BinaryIO:
+        """A read-only stream of a blob's original bytes, decompressed as it is read."""
+        return self._zstd.ZstdDecompressor().stream_reader(open(self.blob_path(sha256), "rb"),
+                                                           closefd=True)
+
+    def iter_blob(self, sha256: str) -> Iterator[bytes]:
+        with self.open_blob(sha256) as reader:
+            yield from iter(lambda: reader.read(CHUNK_SIZE), b"")
+
+    def open(self, matter_number: str, path: str) -> BinaryIO:
+        """Stream one file of a matter, e.g. open("003", "02_Purchase_Agreement/ex2-1.htm")."""
+        return self.open_blob(self._record(matter_number, path)["sha256"])
+
+    def read_file(self, matter_number: str, path: str) -> bytes:
+        with self.open(matter_number, path) as reader:
+            return reader.read()
+
+    # ------------------------------------------------------------------
+    # Materialized view
+    # ------------------------------------------------------------------
+
+    def materialize(self, matter_number: str, dest_root: Path) -> Path:
+        """Write a matter's folder under dest_root from its blobs; returns the folder."""
+        manifest = self.manifest(matter_number)
+        if manifest is None:
+            raise KeyError(matter_number)
+        deal_dir = Path(dest_root) / manifest["folder"]
+        for folder in manifest["folders"]:
+            (deal_dir / folder).mkdir(parents=True, exist_ok=True)
+        for path, record in manifest["files"].items():
+            dest = deal_dir / path
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            _, sha256 = write_atomic(dest, self.iter_blob(record["sha256"]))
+            if sha256 != record["sha256"]:
+                dest.unlink()
+                raise ValueError(f"archive blob {record['sha256']} is corrupt ({matter_number}/{path})")
+        return deal_dir
+
+    def stats(self) -> dict:
+        """Original bytes referenced by manifests vs. bytes actually stored."""
+        referenced, blobs = 0, {}
+        for matter_number in self.matters():
+            for record in self.manifest(matter_number)["files"].values():
+                referenced += record["bytes"]
+                blobs[record["sha256"]] = record["stored_bytes"]
+        return {
+            "matters": len(self.matters()),
+            "files_bytes": referenced,
+            "blobs": len(blobs),
+            "stored_bytes": sum(blobs.values()),
+        }
@@ -0,0 +1,63 @@
+"""
+Crash-safe file writes.
+
+Bodies are streamed into a temp file in the destination directory, hashed on
+the way, fsync'ed, then renamed into place. A reader therefore sees either the
+previous file or the complete new one — never a truncated document that looks
+valid — and the SHA-256 and byte count come for free from the single pass.
+"""
+
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import Iterable, Tuple
+
+
+def _fsync_dir(directory: Path):
+    """Persist a rename. Not supported on every platform; best effort."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_temp(directory: Path, chunks: Iterable[bytes]) -> Tuple[Path, int, str]:
+    """Stream chunks to a fresh, fsync'ed temp file in `directory`.
+
+    Returns (temp_path, size, sha256). The caller renames or deletes it.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp = directory / f".{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp, "wb") as f:
+            for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return tmp, size, digest.hexdigest()
+
+
+def write_atomic(dest: Path, chunks: Iterable[bytes]) -> Tuple[int, str]:
+    """Atomically replace `dest` with the streamed chunks. Returns (size, sha256)."""
+    tmp, size, sha256 = write_temp(dest.parent, chunks)
+    os.replace(tmp, dest)
+    _fsync_dir(dest.parent)
+    return size, sha256
+
+
+def write_text_atomic(dest: Path, text: str) -> Tuple[int, str]:
+    return write_atomic(dest, [text.encode("utf-8")])
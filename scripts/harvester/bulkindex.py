@@ -0,0 +1,186 @@
+"""
+Offline filing discovery from EDGAR's quarterly full-index files.
+
+SEC publishes every filing of a quarter in edgar/full-index/YYYY/QTRn/, as
+form.idx (fixed-width, sorted by form type) and master.idx (pipe-delimited,
+sorted by CIK). One download per quarter replaces thousands of EFTS search
+pages. Each quarter is parsed into a local SQLite table of
+(accession, cik, company, form, filed) so candidate filings can be selected
+by form type and date without touching the network again.
+
+Finished quarters never change and are loaded once; the current quarter is
+reloaded at most once a day.
+"""
+
+import re
+import sqlite3
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Iterator
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS filings (
+    accession TEXT PRIMARY KEY,
+    cik       TEXT NOT NULL,
+    company   TEXT,
+    form      TEXT NOT NULL,
+    filed     TEXT NOT NULL,
+    quarter   TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS filings_form_date ON filings (form, filed);
+CREATE TABLE IF NOT EXISTS quarters (
+    quarter   TEXT PRIMARY KEY,
+    loaded_on TEXT NOT NULL,
+    complete  INTEGER NOT NULL,
+    filings   INTEGER NOT NULL
+);
+"""
+
+_RIGHT_COLUMNS = re.compile(
+    r"\s(?P<cik>\d+)\s+(?P<filed>\d{4}-?\d{2}-?\d{2})\s+(?P<path>edgar/\S+)\s*$"
+)
+
+
+def quarter_key(year: int, quarter: int) -> str:
+    return f"{year}Q{quarter}"
+
+
+def quarter_bounds(year: int, quarter: int) -> tuple:
+    """First and last day of a calendar quarter, as ISO dates."""
+    first = date(year, 3 * quarter - 2, 1)
+    last = date(year + 1, 1, 1) if quarter == 4 else date(year, 3 * quarter + 1, 1)
+    return first.isoformat(), date.fromordinal(last.toordinal() - 1).isoformat()
+
+
+def quarters(start_date: str, end_date: str) -> list:
+    """(year, quarter) pairs covering [start_date, end_date], newest first."""
+    start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    year, quarter = start.year, (start.month - 1) // 3 + 1
+    result = []
+    while (year, quarter) <= (end.year, (end.month - 1) // 3 + 1):
+        result.append((year, quarter))
+        year, quarter = (year + 1, 1) if quarter == 4 else (year, quarter + 1)
+    result.reverse()
+    return result
+
+
+def _normalize_date(filed: str) -> str:
+    filed = filed.replace("-", "")
+    return f"{filed[:4]}-{filed[4:6]}-{filed[6:8]}"
+
+
+def _accession(path: str) -> str:
+    """edgar/data/1000045/0000950170-24-039513.txt -> 0000950170-24-039513"""
+    return path.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+
+
+def _data_lines(text: str, header_test) -> tuple:
+    """Split an index file into its column header line and the rows after the dashes."""
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        if header_test(line):
+            start = i + 1
+            if start < len(lines) and set(lines[start].strip()) == {"-"}:
+                start += 1
+            return line, lines[start:]
+    raise ValueError("not an EDGAR full-index file: column header not found")
+
+
+def parse_master_idx(text: str) -> Iterator[tuple]:
+    """Rows of a master.idx file as (accession, cik, company, form, filed)."""
+    _, rows = _data_lines(text, lambda line: line.startswith("CIK|"))
+    for line in rows:
+        # Split from both ends so a stray "|" in a company name stays in the name.
+        cik, _, rest = line.partition("|")
+        parts = rest.rsplit("|", 3)
+        if len(parts) != 4:
+            continue
+        cik = cik.strip()
+        company, form, filed, path = (part.strip() for part in parts)
+        yield _accession(path), cik, company, form, _normalize_date(filed)
+
+
+def parse_form_idx(text: str) -> Iterator[tuple]:
+    """Rows of a form.idx file as (accession, cik, company, form, filed).
+
+    Columns are fixed-width, but long company names can push the CIK column
+    right, so the CIK, date and path are matched from the end of the line and
+    only the form/company boundary is taken from the header.
+    """
+    header, rows = _data_lines(text, lambda line: line.startswith("Form Type"))
+    company_at = header.index("Company Name")
+    for line in rows:
+        match = _RIGHT_COLUMNS.search(line)
+        if not match:
+            continue
+        form = line[:company_at].strip()
+        company = line[company_at:match.start()].strip()
+        yield (_accession(match["path"]), match["cik"], company, form,
+               _normalize_date(match["filed"]))
+
+
+def parse_index(text: str) -> Iterator[tuple]:
+    """Parse either full-index format, detected from its column header."""
+    if re.search(r"^CIK\|", text, re.MULTILINE):
+        return parse_master_idx(text)
+    return parse_form_idx(text)
+
+
+class BulkIndex:
+    """Local table of every filing in the quarters loaded so far."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    def is_loaded(self, year: int, quarter: int, today: date = None) -> bool:
+        """True if the quarter needs no reload: finished when loaded, or loaded today."""
+        today = today or date.today()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT loaded_on, complete FROM quarters WHERE quarter = ?",
+                (quarter_key(year, quarter),),
+            ).fetchone()
+        return bool(row) and (bool(row["complete"]) or row["loaded_on"] == today.isoformat())
+
+    def load_quarter(self, year: int, quarter: int, text: str, today: date = None) -> int:
+        """Replace a quarter's rows with the contents of its form.idx or master.idx."""
+        today = today or date.today()
+        key = quarter_key(year, quarter)
+        complete = quarter_bounds(year, quarter)[1] < today.isoformat()
+        rows = [(*row, key) for row in parse_index(text)]
+        with self._lock:
+            self._db.execute("DELETE FROM filings WHERE quarter = ?", (key,))
+            self._db.executemany(
+                "INSERT OR REPLACE INTO filings (accession, cik, company, form, filed, quarter) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO quarters (quarter, loaded_on, complete, filings) "
+                "VALUES (?, ?, ?, ?)",
+                (key, today.isoformat(), int(complete), len(rows)),
+            )
+            self._db.commit()
+        return len(rows)
+
+    def candidates(self, forms: list, start_date: str, end_date: str) -> list:
+        """Filings of the given form types filed in [start_date, end_date], newest first."""
+        marks = ", ".join("?" for _ in forms)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT accession, cik, company, form, filed FROM filings "
+                f"WHERE form IN ({marks}) AND filed BETWEEN ? AND ? "
+                f"ORDER BY filed DESC, accession DESC",
+                (*forms, start_date, end_date),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
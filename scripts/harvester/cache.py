@@ -0,0 +1,242 @@
+"""
+Persistent, content-addressed HTTP cache for EDGAR responses.
+
+Bodies are stored once under objects/<sha256[:2]>/<sha256>, no matter how many
+URLs (or matters) point at them. A small SQLite table maps each request key
+(URL + query string) to its blob plus the validators needed to revalidate it.
+
+Filed EDGAR archives (/Archives/edgar/data/...) never change, so those entries
+are served without touching the network. Everything else — EFTS search pages
+in particular — is revalidated with If-None-Match / If-Modified-Since.
+
+Total blob size is kept under `max_bytes` by evicting least-recently-used
+entries. Files hardlinked out of the cache (see link_to) survive eviction:
+removing the cache's link leaves the matter folder's copy intact.
+"""
+
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+from urllib.parse import urlencode, urlparse
+
+from .atomic import write_temp
+
+IMMUTABLE_PREFIX = "/Archives/edgar/data/"
+
+DEFAULT_MAX_BYTES = 5 * 1024 ** 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key           TEXT PRIMARY KEY,
+    url           TEXT NOT NULL,
+    sha256        TEXT NOT NULL,
+    size          INTEGER NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    immutable     INTEGER NOT NULL,
+    last_access   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_sha256 ON entries (sha256);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+"""
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    url: str
+    sha256: str
+    size: int
+    etag: Optional[str]
+    last_modified: Optional[str]
+    immutable: bool
+
+
+def cache_key(url: str, params: dict = None) -> str:
+    """Stable key for a GET request: the URL plus its sorted query parameters."""
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()))}"
+
+
+def is_immutable(url: str) -> bool:
+    """Filed EDGAR archive documents never change once accepted."""
+    return IMMUTABLE_PREFIX in urlparse(url).path
+
+
+class HttpCache:
+    """URL-keyed, content-addressed response cache with LRU size bound."""
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        (self.root / "objects").mkdir(parents=True, exist_ok=True)
+        (self.root / "tmp").mkdir(exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.root / "index.sqlite", check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        self._total_bytes = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT sha256, size FROM entries)"
+        ).fetchone()[0]
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.root / "objects" / sha256[:2] / sha256
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for `key` if its blob is still on disk."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT key, url, sha256, size, etag, last_modified, immutable "
+                "FROM entries WHERE key = ?", (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        entry = CacheEntry(*row[:6], immutable=bool(row[6]))
+        if not self.blob_path(entry.sha256).exists():
+            self._delete(key)
+            return None
+        return entry
+
+    def touch(self, key: str):
+        with self._lock:
+            self._db.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+
+    def read(self, entry: CacheEntry) -> bytes:
+        self.touch(entry.key)
+        return self.blob_path(entry.sha256).read_bytes()
+
+    def revalidation_headers(self, entry: Optional[CacheEntry]) -> dict:
+        """Conditional-request headers for a stale entry."""
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    # ------------------------------------------------------------------
+    # Store
+    # ------------------------------------------------------------------
+
+    def store(self, key: str, url: str, content: bytes, headers: dict = None) -> CacheEntry:
+        return self.store_stream(key, url, [content], headers)
+
+    def store_stream(self, key: str, url: str, chunks: Iterable[bytes],
+                     headers: dict = None) -> CacheEntry:
+        """Write a body into the object store, hashing as it streams."""
+        headers = headers or {}
+        tmp, size, sha256 = write_temp(self.root / "tmp", chunks)
+        try:
+            blob = self.blob_path(sha256)
+            blob.parent.mkdir(exist_ok=True)
+            if blob.exists():
+                tmp.unlink()
+            else:
+                os.chmod(tmp, 0o444)
+                os.replace(tmp, blob)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+        entry = CacheEntry(
+            key=key,
+            url=url,
+            sha256=sha256,
+            size=size,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            immutable=is_immutable(url),
+        )
+        with self._lock:
+            new_blob = self._db.execute(
+                "SELECT 1 FROM entries WHERE sha256 = ? LIMIT 1", (sha256,)
+            ).fetchone() is None
+            old = self._db.execute("SELECT sha256 FROM entries WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, sha256, size, entry.etag, entry.last_modified,
+                 int(entry.immutable), time.time()),
+            )
+            self._db.commit()
+            if new_blob:
+                self._total_bytes += size
+            if old and old[0] != sha256:
+                self._release_blob(old[0])
+        self._evict()
+        return entry
+
+    # ------------------------------------------------------------------
+    # Materialize
+    # ------------------------------------------------------------------
+
+    def link_to(self, entry: CacheEntry, dest: Path):
+        """Hardlink a cached blob to `dest` (copy if the filesystem can't link)."""
+        self.touch(entry.key)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            os.link(self.blob_path(entry.sha256), tmp)
+        except OSError:
+            shutil.copyfile(self.blob_path(entry.sha256), tmp)
+        os.replace(tmp, dest)
+
+    # ------------------------------------------------------------------
+    # Eviction
+    # ------------------------------------------------------------------
+
+    def _release_blob(self, sha256: str):
+        """Drop a blob once no entry references it. Caller holds the lock."""
+        still_used = self._db.execute(
+            "SELECT 1 FROM entries WHERE sha256 = ? LIMIT 1", (sha256,)
+        ).fetchone()
+        if still_used:
+            return
+        blob = self.blob_path(sha256)
+        try:
+            size = blob.stat().st_size
+            blob.unlink()
+            self._total_bytes -= size
+        except FileNotFoundError:
+            pass
+
+    def _delete(self, key: str):
+        with self._lock:
+            row = self._db.execute("SELECT sha256 FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._db.commit()
+            self._release_blob(row[0])
+
+    def _evict(self):
+        """Evict least-recently-used entries until the store fits in max_bytes."""
+        with self._lock:
+            if self._total_bytes <= self.max_bytes:
+                return
+            rows = self._db.execute(
+                "SELECT key, sha256 FROM entries ORDER BY last_access"
+            ).fetchall()
+            for key, sha256 in rows:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._release_blob(sha256)
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,288 @@
+"""
+Pooled HTTP client for SEC EDGAR.
+
+One requests.Session is shared by every harvest call, with a dedicated
+connection pool per SEC host. Connections are kept alive between requests,
+so a harvest pays the TCP+TLS handshake once per pooled connection instead of
+once per file. Response bodies can be streamed with gzip decoded on the fly.
+
+Nothing is retried inside the adapter, where a retry would skip the rate
+limiter: every retry is a new request that takes a token first. Throttling
+(429, 503) is retried after the limiter's backoff(), which is how an
+AdaptiveTokenBucket learns to slow down; transient failures (connection
+errors, 500/502/504) after a jittered delay that leaves the rate alone.
+Each clean response is reported with record_success() so the limiter can
+speed up again.
+
+With a Metrics registry attached, every fetch is recorded against the stage
+the caller names (latency, bytes, status, rate-limiter wait, cache hits),
+and so is every response that was retried.
+
+When an HttpCache is attached, fetch() and fetch_to_file() consult it first:
+immutable archive documents are served from disk with no request at all, and
+other URLs are revalidated with a conditional GET.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .atomic import write_atomic
+from .cache import CacheEntry, HttpCache, cache_key
+from .metrics import Metrics
+from .ratelimit import TokenBucket, backoff_delay
+
+SEC_HOSTS = ("www.sec.gov", "efts.sec.gov", "data.sec.gov")
+
+# (connect, read) seconds
+DEFAULT_TIMEOUT = (10, 60)
+CHUNK_SIZE = 64 * 1024
+
+# Statuses meaning "slow down": retried by EdgarClient through the limiter.
+THROTTLE_STATUSES = (429, 503)
+THROTTLE_RETRIES = 6
+
+# Server hiccups: retried by EdgarClient through the limiter, without slowing it.
+TRANSIENT_STATUSES = (500, 502, 504)
+TRANSIENT_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+
+@dataclass
+class Fetched:
+    """Outcome of a fetch()/fetch_to_file() call, whether from network or cache."""
+    url: str
+    status_code: int
+    content: bytes = b""
+    size: int = 0
+    sha256: str = ""
+    from_cache: bool = False
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds asked for by a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class EdgarClient:
+    """Keep-alive, rate-limited HTTP client shared by threads and asyncio tasks."""
+
+    def __init__(self, headers: dict, limiter: TokenBucket, pool_size: int = 10,
+                 retries: int = 3, timeout: tuple = DEFAULT_TIMEOUT,
+                 cache: Optional[HttpCache] = None, metrics: Optional[Metrics] = None,
+                 throttle_retries: int = THROTTLE_RETRIES):
+        self.limiter = limiter
+        self.throttle_retries = throttle_retries
+        self.cache = cache
+        self.metrics = metrics
+        self.timeout = timeout
+        self.retries = retries
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        self.set_pool_size(pool_size)
+
+    def set_metrics(self, metrics: Optional[Metrics]):
+        """Attach (or detach) a Metrics registry."""
+        self.metrics = metrics
+
+    def set_pool_size(self, pool_size: int):
+        """(Re)mount one adapter per SEC host, each holding up to `pool_size` live connections."""
+        self.pool_size = pool_size
+        for host in SEC_HOSTS:
+            self.session.mount(f"https://{host}/", self._adapter())
+        # Anything else (local stand-ins, mirrors) still gets pooling.
+        self.session.mount("https://", self._adapter())
+        self.session.mount("http://", self._adapter())
+
+    def _adapter(self) -> HTTPAdapter:
+        return HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            pool_block=True,
+            max_retries=0,   # retries go through the limiter, in _request()
+        )
+
+    def get(self, url: str, params: dict = None, stream: bool = False) -> requests.Response:
+        """Rate-limited GET. With stream=True the caller must consume or close the response."""
+        self.limiter.acquire()
+        return self._request(url, params, None, stream=stream)
+
+    async def get_async(self, url: str, params: dict = None, stream: bool = False) -> requests.Response:
+        """Rate-limited GET that waits on the event loop and blocks only a worker thread."""
+        await self.limiter.acquire_async()
+        return await asyncio.to_thread(self._request, url, params, None, stream=stream)
+
+    @staticmethod
+    def iter_body(resp: requests.Response, chunk_size: int = CHUNK_SIZE):
+        """Yield the decoded (gunzipped) body in chunks without buffering it whole."""
+        try:
+            yield from resp.iter_content(chunk_size=chunk_size)
+        finally:
+            resp.close()
+
+    # ------------------------------------------------------------------
+    # Cache-aware fetches
+    # ------------------------------------------------------------------
+
+    def _cached(self, url: str, params: dict = None) -> Optional[CacheEntry]:
+        if self.cache is None:
+            return None
+        return self.cache.lookup(cache_key(url, params))
+
+    def _request(self, url: str, params: dict, entry: Optional[CacheEntry],
+                 stream: bool = True) -> requests.Response:
+        """GET with retries, each of which takes a token first. The caller already holds one.
+
+        429/503 are retried after the limiter's backoff; connection errors and
+        500/502/504 up to `retries` times after a plain jittered delay. Runs
+        in a worker thread on the async path, so only this request waits out
+        its backoff; the limiter slows the other requests down.
+        """
+        headers = self.cache.revalidation_headers(entry) if self.cache else {}
+        throttled = transient = 0
+        while True:
+            try:
+                resp = self.session.get(url, params=params, headers=headers, stream=stream,
+                                        timeout=self.timeout)
+            except TRANSIENT_ERRORS:
+                if transient >= self.retries:
+                    raise
+                time.sleep(backoff_delay(transient))
+                self.limiter.acquire()
+                transient += 1
+                continue
+            if resp.status_code in THROTTLE_STATUSES:
+                if throttled >= self.throttle_retries:
+                    return resp
+                delay = self.limiter.backoff(throttled, _retry_after(resp.headers.get("Retry-After")))
+                throttled += 1
+            elif resp.status_code in TRANSIENT_STATUSES and transient < self.retries:
+                delay = backoff_delay(transient)
+                transient += 1
+            else:
+                self.limiter.record_success()
+                return resp
+            resp.close()
+            if self.metrics is not None:
+                self.metrics.record_retry(resp.status_code)
+            time.sleep(delay)
+            self.limiter.acquire()
+
+    def _fetch_network(self, url: str, params: dict, entry: Optional[CacheEntry]) -> Fetched:
+        resp = self._request(url, params, entry)
+        if resp.status_code == 304 and entry is not None:
+            resp.close()
+            content = self.cache.read(entry)
+            return Fetched(url, 200, content, entry.size, entry.sha256, from_cache=True)
+        content = b"".join(self.iter_body(resp))
+        if resp.status_code == 200 and self.cache is not None:
+            stored = self.cache.store(cache_key(url, params), url, content, resp.headers)
+            return Fetched(url, 200, content, stored.size, stored.sha256)
+        return Fetched(url, resp.status_code, content, len(content),
+                       hashlib.sha256(content).hexdigest())
+
+    def _fetch_file_network(self, url: str, dest: Path, entry: Optional[CacheEntry]) -> Fetched:
+        resp = self._request(url, None, entry)
+        if resp.status_code == 304 and entry is not None:
+            resp.close()
+            self.cache.link_to(entry, dest)
+            return Fetched(url, 200, size=entry.size, sha256=entry.sha256, from_cache=True)
+        if resp.status_code != 200:
+            resp.close()
+            return Fetched(url, resp.status_code)
+        if self.cache is not None:
+            stored = self.cache.store_stream(cache_key(url), url, self.iter_body(resp), resp.headers)
+            self.cache.link_to(stored, dest)
+            return Fetched(url, 200, size=stored.size, sha256=stored.sha256)
+        size, sha256 = write_atomic(dest, self.iter_body(resp))
+        return Fetched(url, 200, size=size, sha256=sha256)
+
+    def _observed(self, stage: str, waited: float, network, *args) -> Fetched:
+        """Run a network fetch, recording it against `stage` when metrics are on."""
+        if self.metrics is None:
+            return network(*args)
+        start = time.monotonic()
+        try:
+            with self.metrics.in_stage(stage):
+                fetched = network(*args)
+        except Exception:
+            self.metrics.record_request(stage, time.monotonic() - start, None, limiter_wait=waited)
+            raise
+        if fetched.from_cache:   # 304: body came from the cache, but a request was made
+            self.metrics.record_request(stage, time.monotonic() - start, 304, limiter_wait=waited)
+        else:
+            self.metrics.record_request(stage, time.monotonic() - start, fetched.status_code,
+                                        fetched.size, limiter_wait=waited)
+        return fetched
+
+    def _cache_hit(self, stage: str, fetched: Fetched) -> Fetched:
+        if self.metrics is not None:
+            self.metrics.record_cache_hit(stage, fetched.size)
+        return fetched
+
+    def fetch(self, url: str, params: dict = None, stage: str = "other") -> Fetched:
+        """GET a small body (JSON pages, indexes) through the cache."""
+        entry = self._cached(url, params)
+        if entry is not None and entry.immutable:
+            return self._cache_hit(stage, Fetched(url, 200, self.cache.read(entry), entry.size,
+                                                  entry.sha256, from_cache=True))
+        waited = self.limiter.acquire()
+        return self._observed(stage, waited, self._fetch_network, url, params, entry)
+
+    async def fetch_async(self, url: str, params: dict = None, stage: str = "other") -> Fetched:
+        entry = await asyncio.to_thread(self._cached, url, params)
+        if entry is not None and entry.immutable:
+            content = await asyncio.to_thread(self.cache.read, entry)
+            return self._cache_hit(stage, Fetched(url, 200, content, entry.size, entry.sha256,
+                                                  from_cache=True))
+        waited = await self.limiter.acquire_async()
+        return await asyncio.to_thread(self._observed, stage, waited,
+                                       self._fetch_network, url, params, entry)
+
+    def fetch_to_file(self, url: str, dest: Path, stage: str = "other") -> Fetched:
+        """Stream a document to `dest`; cached documents are hardlinked instead of fetched."""
+        entry = self._cached(url)
+        if entry is not None and entry.immutable:
+            self.cache.link_to(entry, dest)
+            return self._cache_hit(stage, Fetched(url, 200, size=entry.size, sha256=entry.sha256,
+                                                  from_cache=True))
+        waited = self.limiter.acquire()
+        return self._observed(stage, waited, self._fetch_file_network, url, dest, entry)
+
+    async def fetch_to_file_async(self, url: str, dest: Path, stage: str = "other") -> Fetched:
+        entry = await asyncio.to_thread(self._cached, url)
+        if entry is not None and entry.immutable:
+            await asyncio.to_thread(self.cache.link_to, entry, dest)
+            return self._cache_hit(stage, Fetched(url, 200, size=entry.size, sha256=entry.sha256,
+                                                  from_cache=True))
+        waited = await self.limiter.acquire_async()
+        return await asyncio.to_thread(self._observed, stage, waited,
+                                       self._fetch_file_network, url, dest, entry)
+
+    def close(self):
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
@@ -0,0 +1,162 @@
+"""
+Near-duplicate agreement detection with MinHash + LSH.
+
+The same merger agreement is routinely filed twice (as Ex 2.1 on both the
+buyer's and the target's 8-K), and amended-and-restated agreements repeat most
+of the original. Each agreement is reduced to a MinHash signature over word
+5-gram shingles; signatures are split into LSH bands and each band is stored
+as a bucket key in SQLite. Looking up a new document touches only the
+documents that share a bucket with it — `bands` indexed lookups — so the cost
+per document stays flat as the corpus grows.
+
+Signatures use one-permutation hashing: every shingle is hashed once and
+falls into one of NUM_HASHES bins, keeping the per-bin minimum. That is one
+pass over the shingles instead of one pass per hash function.
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+from array import array
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .text import decode_document, html_to_text
+
+NUM_HASHES = 128
+SHINGLE_WORDS = 5
+DEFAULT_BANDS = 16          # 16 bands x 8 rows: candidate threshold ≈ 0.7
+DEFAULT_THRESHOLD = 0.85    # estimated Jaccard at which a document is a duplicate
+
+_WORD = re.compile(r"[a-z0-9]+")
+_EMPTY = (1 << 64) - 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id        TEXT PRIMARY KEY,
+    canonical_id  TEXT NOT NULL,
+    matter_number TEXT,
+    signature     BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    band    INTEGER NOT NULL,
+    bucket  BLOB NOT NULL,
+    doc_id  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS buckets_lookup ON buckets (band, bucket);
+"""
+
+
+def shingles(text: str) -> set:
+    words = _WORD.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def minhash(text: str) -> list:
+    """One-permutation MinHash signature of a document's shingles."""
+    bins = [_EMPTY] * NUM_HASHES
+    for shingle in shingles(text):
+        h = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "little")
+        b = h % NUM_HASHES
+        if h < bins[b]:
+            bins[b] = h
+    # Densify: an empty bin borrows the next filled bin's value so short
+    # documents still compare bin-for-bin.
+    filled = [i for i, v in enumerate(bins) if v != _EMPTY]
+    if filled and len(filled) < NUM_HASHES:
+        for i in range(NUM_HASHES):
+            if bins[i] == _EMPTY:
+                j = next((f for f in filled if f > i), filled[0])
+                bins[i] = bins[j]
+    return bins
+
+
+def document_signature(raw: bytes) -> list:
+    """Signature of a downloaded exhibit. Module-level so it can run in a process pool."""
+    return minhash(html_to_text(decode_document(raw)))
+
+
+def similarity(a: list, b: list) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_HASHES
+
+
+class DuplicateIndex:
+    """Persistent LSH index mapping documents to their canonical original."""
+
+    def __init__(self, path: Path, threshold: float = DEFAULT_THRESHOLD,
+                 bands: int = DEFAULT_BANDS):
+        if NUM_HASHES % bands:
+            raise ValueError(f"bands must divide {NUM_HASHES}")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = NUM_HASHES // bands
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(Path(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    def _band_keys(self, signature: list):
+        for band in range(self.bands):
+            rows = signature[band * self.rows:(band + 1) * self.rows]
+            yield band, hashlib.blake2b(array("Q", rows).tobytes(), digest_size=8).digest()
+
+    def find(self, signature: list, exclude: Optional[str] = None
+             ) -> Optional[Tuple[str, Optional[str], float]]:
+        """Best near-duplicate already indexed: (canonical_id, canonical matter, similarity)."""
+        with self._lock:
+            candidates = set()
+            for band, bucket in self._band_keys(signature):
+                candidates.update(row[0] for row in self._db.execute(
+                    "SELECT doc_id FROM buckets WHERE band = ? AND bucket = ?", (band, bucket),
+                ))
+            candidates.discard(exclude)
+            best = None
+            for doc_id in candidates:
+                canonical_id, stored = self._db.execute(
+                    "SELECT canonical_id, signature FROM documents WHERE doc_id = ?", (doc_id,),
+                ).fetchone()
+                score = similarity(signature, array("Q", stored).tolist())
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (canonical_id, score)
+            if best is None:
+                return None
+            matter = self._db.execute(
+                "SELECT matter_number FROM documents WHERE doc_id = ?", (best[0],),
+            ).fetchone()
+            return best[0], matter[0] if matter else None, best[1]
+
+    def add(self, doc_id: str, signature: list, canonical_id: Optional[str] = None,
+            matter_number: Optional[str] = None):
+        """Index a document; duplicates point at their original's canonical id."""
+        with self._lock, self._db:
+            if self._db.execute("SELECT 1 FROM documents WHERE doc_id = ?", (doc_id,)).fetchone():
+                return
+            self._db.execute(
+                "INSERT INTO documents VALUES (?, ?, ?, ?)",
+                (doc_id, canonical_id or doc_id, matter_number, array("Q", signature).tobytes()),
+            )
+            self._db.executemany(
+                "INSERT INTO buckets VALUES (?, ?, ?)",
+                ((band, bucket, doc_id) for band, bucket in self._band_keys(signature)),
+            )
+
+    def matter_number(self, doc_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT matter_number FROM documents WHERE doc_id = ?", (doc_id,),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_matter(self, doc_id: str, matter_number: str):
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE documents SET matter_number = ? WHERE doc_id = ?", (matter_number, doc_id),
+            )
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,160 @@
+"""
+Exhibit classification from EDGAR document filenames.
+
+A filing's index.json lists its documents by filename only, and every filing
+agent spells exhibit numbers differently:
+
+    ex2-1.htm  ex2_1.htm  ex-2.1.htm  exhibit21.htm   (in-house, Workiva)
+    d816523dex21.htm  d816523dex101.htm               (Donnelley: dex + compact number)
+    tm2412345d1_ex2-1.htm  ea020123401ex99-1_acme.htm (Toppan Merrill, EdgarAgents)
+    ex_584401.htm                                     (sequence number, not an exhibit number)
+
+Filenames are matched against SPELLINGS (precompiled into one pattern)
+to recover the exhibit number, and the number is looked up in TAXONOMY, which
+follows the convention in docs/EDGAR_HARVESTING_STRATEGY.md. Filenames that
+mention an amendment are classified as amendments whatever their number.
+classify_filing returns every exhibit in a filing; two documents with the
+same exhibit number both appear, the second with a "-2" key suffix.
+"""
+
+import re
+from typing import Iterable, NamedTuple, Optional
+
+DOCUMENT_SUFFIXES = (".htm", ".html", ".txt")
+
+_PREFIX = r"ex(?:hibit|h)?[-_ .]?"
+
+# Exhibit-number spellings after the "ex"/"exhibit" prefix, most explicit
+# first. Each has a major group and usually a minor one; a missing minor
+# means .1 (ex99.htm is Exhibit 99.1). They are compiled into NUMBER_PATTERN
+# as one alternation, so a filename costs a single regex search.
+SPELLINGS = (
+    # ex2-1, ex10_12, exhibit99.1, ex-2.1, ex10-01
+    r"(?P<major>99|10|2)[-_.](?P<minor>\d{1,2})(?!\d)",
+    # ex101, dex991, ex1001, ex1010 — but not ex101-1 (Exhibit 101.1)
+    r"(?P<major>99|10)(?P<minor>\d{1,2})(?!\d|[-_.]\d)",
+    # ex21, dex22. Exhibit 2 takes a single-digit minor so dex211 (21.1) and
+    # dex231 (23.1) are not read as 2.11 / 2.31, and ex21-1 does not match.
+    r"(?P<major>2)(?P<minor>\d)(?!\d|[-_.]\d)",
+    # ex2, ex99
+    r"(?P<major>99|10|2)(?![-\d_.])",
+)
+
+
+def _compile_spellings(spellings: tuple):
+    """One regex for all spellings; group names get the spelling's index appended."""
+    alternatives, groups = [], []
+    for i, spelling in enumerate(spellings):
+        alternatives.append(spelling.replace("?P<major>", f"?P<major{i}>")
+                            .replace("?P<minor>", f"?P<minor{i}>"))
+        groups.append((f"major{i}", f"minor{i}" if "?P<minor>" in spelling else None))
+    pattern = re.compile(_PREFIX + "(?:" + "|".join(alternatives) + ")", re.IGNORECASE)
+    return pattern, tuple(groups)
+
+
+NUMBER_PATTERN, _NUMBER_GROUPS = _compile_spellings(SPELLINGS)
+
+# Any exhibit-like name, recognised or not; such files are never the filing body.
+_ANY_EXHIBIT = re.compile(_PREFIX + r"\d", re.IGNORECASE)
+_AMENDMENT = re.compile(r"amend|amnd|amdt", re.IGNORECASE)
+# Index pages and XBRL viewer pages that sit next to the primary document.
+_NOT_BODY = re.compile(r"-index(?:-headers)?\.html?$|^R\d+\.htm$", re.IGNORECASE)
+
+# (major, minors or None for any, type, description), first match wins.
+TAXONOMY = (
+    (2, {1}, "main_agreement", "Agreement and plan of merger / stock or asset purchase agreement"),
+    (2, None, "plan_exhibit", "Further plan-of-acquisition documents (Exhibit 2.2 and up)"),
+    (10, None, "ancillary", "Material contract: employment, escrow, support, non-compete, "
+                            "TSA, stockholders, registration rights, seller note"),
+    (99, {1}, "press_release", "Press release announcing the transaction"),
+    (99, None, "additional_exhibit", "Investor presentation, call transcript or other 99.x"),
+)
+
+
+class ExhibitMatch(NamedTuple):
+    name: str
+    key: str            # ex_2_1, ex_10_3, amendment_2_1, 8k_body
+    type: str           # a TAXONOMY type, "amendment" or "filing_body"
+    number: str = ""    # "2.1"; empty for the filing body
+    amendment: bool = False
+
+
+def _flatten_taxonomy(taxonomy: tuple) -> tuple:
+    """TAXONOMY as two lookups: exact (major, minor) types, then per-major fallbacks."""
+    exact, by_major = {}, {}
+    for major, minors, kind, _ in taxonomy:
+        if minors is None:
+            by_major.setdefault(major, kind)
+        else:
+            for minor in minors:
+                exact.setdefault((major, minor), kind)
+    return exact, by_major
+
+
+_EXACT_TYPES, _MAJOR_TYPES = _flatten_taxonomy(TAXONOMY)
+
+
+def exhibit_number(name: str) -> Optional[tuple]:
+    """(major, minor) exhibit number spelled in a filename, or None."""
+    dot = name.rfind(".")
+    match = NUMBER_PATTERN.search(name, 0, dot if dot >= 0 else len(name))
+    if not match:
+        return None
+    for major_group, minor_group in _NUMBER_GROUPS:
+        major = match.group(major_group)
+        if major:
+            minor = match.group(minor_group) if minor_group else None
+            return int(major), int(minor) if minor else 1
+    return None
+
+
+def exhibit_type(major: int, minor: int) -> Optional[str]:
+    """The TAXONOMY type of an exhibit number, or None if the harvester ignores it."""
+    return _EXACT_TYPES.get((major, minor)) or _MAJOR_TYPES.get(major)
+
+
+def classify_name(name: str) -> Optional[ExhibitMatch]:
+    """Classify one exhibit filename; None if it is not an exhibit in TAXONOMY."""
+    if not name.lower().endswith(DOCUMENT_SUFFIXES):
+        return None
+    number = exhibit_number(name)
+    if not number:
+        return None
+    major, minor = number
+    kind = exhibit_type(major, minor)
+    if not kind:
+        return None
+    if _AMENDMENT.search(name):
+        return ExhibitMatch(name, f"amendment_{major}_{minor}", "amendment", f"{major}.{minor}", True)
+    return ExhibitMatch(name, f"ex_{major}_{minor}", kind, f"{major}.{minor}")
+
+
+def _is_body(name: str) -> bool:
+    lower = name.lower()
+    return (lower.endswith((".htm", ".html"))
+            and not _ANY_EXHIBIT.search(lower.rsplit(".", 1)[0])
+            and not _NOT_BODY.search(name))
+
+
+def classify_filing(names: Iterable[str]) -> list:
+    """Every classified document of a filing, in index order.
+
+    Exhibits keep their own key; a repeated key gets a "-2", "-3", ... suffix
+    rather than replacing the earlier document. The first HTML document that
+    is not an exhibit or an index page is the filing body (key 8k_body).
+    """
+    matches = []
+    seen: dict = {}
+    body = None
+    for name in names:
+        match = classify_name(name)
+        if match:
+            count = seen.get(match.key, 0) + 1
+            seen[match.key] = count
+            if count > 1:
+                match = match._replace(key=f"{match.key}-{count}")
+            matches.append(match)
+        elif body is None and _is_body(name):
+            body = ExhibitMatch(name, "8k_body", "filing_body")
+            matches.append(body)
+    return matches
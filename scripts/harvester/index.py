@@ -0,0 +1,268 @@
+"""
+SQLite/FTS5 search index over the harvested precedent database.
+
+One row per matter in `deals` (the DealInfo fields), one row per stored
+exhibit in `documents`, and the exhibit text in the `documents_fts` full-text
+table. Indexing is incremental and keyed on accession: a matter is re-indexed
+only when the SHA-256 of one of its files changes.
+
+The extracted deal terms (buyer, target, signing date, price, value, SIC
+industry) are ordinary columns, so filtering and ranking matters by them is
+an indexed lookup (find_deals) rather than a full-text scan.
+
+Example:
+    index = PrecedentIndex(Path("precedent-database/_precedent_index.sqlite"))
+    index.search('"reverse termination fee"', deal_type="merger")
+    index.find_deals(industry="SERVICES-PREPACKAGED SOFTWARE", min_value=1e8)
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from .text import extract_text, read_extracted_text
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS deals (
+    accession     TEXT PRIMARY KEY,
+    matter_number TEXT NOT NULL,
+    deal_name     TEXT,
+    deal_type     TEXT,
+    buyer         TEXT,
+    target        TEXT,
+    filing_date   TEXT,
+    cik           TEXT,
+    deal_value    TEXT,
+    industry      TEXT,
+    duplicate_of  TEXT,
+    signing_date  TEXT,
+    purchase_price TEXT,
+    deal_value_usd REAL,
+    sic           TEXT,
+    deal_dir      TEXT NOT NULL,
+    indexed_at    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS deals_deal_type ON deals (deal_type);
+CREATE INDEX IF NOT EXISTS deals_filing_date ON deals (filing_date);
+CREATE INDEX IF NOT EXISTS deals_cik ON deals (cik);
+CREATE INDEX IF NOT EXISTS deals_industry ON deals (industry);
+
+CREATE TABLE IF NOT EXISTS documents (
+    id          INTEGER PRIMARY KEY,
+    accession   TEXT NOT NULL REFERENCES deals (accession),
+    exhibit_key TEXT NOT NULL,
+    path        TEXT NOT NULL,
+    sha256      TEXT,
+    bytes       INTEGER,
+    UNIQUE (accession, exhibit_key)
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    text,
+    tokenize = 'porter unicode61'
+);
+"""
+
+DEAL_COLUMNS = ("matter_number", "deal_name", "deal_type", "buyer", "target",
+                "filing_date", "cik", "deal_value", "industry", "duplicate_of",
+                "signing_date", "purchase_price", "deal_value_usd", "sic")
+NUMERIC_COLUMNS = {"deal_value_usd"}
+
+# Created after _migrate, since older index files lack the columns.
+TERM_INDEXES = """
+CREATE INDEX IF NOT EXISTS deals_value ON deals (deal_value_usd);
+CREATE INDEX IF NOT EXISTS deals_signing_date ON deals (signing_date);
+CREATE INDEX IF NOT EXISTS deals_sic ON deals (sic);
+"""
+
+
+class PrecedentIndex:
+    """Full-text + metadata index of matter folders."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Add deal columns introduced after an index file was created."""
+        existing = {row["name"] for row in self._db.execute("PRAGMA table_info(deals)")}
+        for column in DEAL_COLUMNS:
+            if column not in existing:
+                kind = "REAL" if column in NUMERIC_COLUMNS else "TEXT"
+                self._db.execute(f"ALTER TABLE deals ADD COLUMN {column} {kind}")
+        self._db.executescript(TERM_INDEXES)
+        self._db.commit()
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    def _indexed_files(self, accession: str) -> dict:
+        rows = self._db.execute(
+            "SELECT exhibit_key, sha256 FROM documents WHERE accession = ?", (accession,)
+        ).fetchall()
+        return {row["exhibit_key"]: row["sha256"] for row in rows}
+
+    def index_deal(self, deal_dir: Path, force: bool = False) -> bool:
+        """Index one matter folder. Returns False if it was already up to date.
+
+        force re-indexes even when no file changed (e.g. new deal terms).
+        """
+        deal_dir = Path(deal_dir)
+        metadata = json.loads((deal_dir / "_deal_metadata.json").read_text())
+        accession = metadata["accession"]
+        files = metadata.get("files", {})
+
+        with self._lock:
+            current = self._indexed_files(accession)
+        wanted = {key: info.get("sha256") for key, info in files.items()}
+        if current == wanted and current and not force:
+            return False
+
+        # Read text outside the lock. The harvester's extraction stage has
+        # normally stored it already; parse the HTML only as a fallback.
+        texts = {}
+        for key, info in files.items():
+            path = deal_dir / info["path"]
+            if path.exists():
+                texts[key] = read_extracted_text(path) or extract_text(path)
+
+        with self._lock, self._db:
+            self._delete(accession)
+            self._db.execute(
+                f"INSERT INTO deals (accession, {', '.join(DEAL_COLUMNS)}, deal_dir, indexed_at) "
+                f"VALUES (?, {', '.join('?' for _ in DEAL_COLUMNS)}, ?, ?)",
+                (accession, *(metadata.get(col) for col in DEAL_COLUMNS), str(deal_dir), time.time()),
+            )
+            for key, text in texts.items():
+                info = files[key]
+                cur = self._db.execute(
+                    "INSERT INTO documents (accession, exhibit_key, path, sha256, bytes) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (accession, key, info["path"], info.get("sha256"), info.get("bytes")),
+                )
+                self._db.execute(
+                    "INSERT INTO documents_fts (rowid, text) VALUES (?, ?)", (cur.lastrowid, text),
+                )
+        return True
+
+    def _delete(self, accession: str):
+        """Remove a matter and its documents. Caller holds the lock and a transaction."""
+        self._db.execute(
+            "DELETE FROM documents_fts WHERE rowid IN "
+            "(SELECT id FROM documents WHERE accession = ?)", (accession,),
+        )
+        self._db.execute("DELETE FROM documents WHERE accession = ?", (accession,))
+        self._db.execute("DELETE FROM deals WHERE accession = ?", (accession,))
+
+    def index_tree(self, root: Path) -> int:
+        """Index every matter folder under `root`. Returns how many changed."""
+        changed = 0
+        for metadata in sorted(Path(root).glob("*/_deal_metadata.json")):
+            if self.index_deal(metadata.parent):
+                changed += 1
+        return changed
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, deal_type: Optional[str] = None, industry: Optional[str] = None,
+               since: Optional[str] = None, until: Optional[str] = None,
+               include_duplicates: bool = False, limit: int = 20) -> list:
+        """FTS5 query over exhibit text, filtered by deal fields, best matches first.
+
+        Matters flagged as near-duplicates of another matter are left out
+        unless include_duplicates is set.
+        """
+        clauses = ["documents_fts MATCH ?"]
+        params: list = [query]
+        if not include_duplicates:
+            clauses.append("deals.duplicate_of IS NULL")
+        if deal_type:
+            clauses.append("deals.deal_type = ?")
+            params.append(deal_type)
+        if industry:
+            clauses.append("deals.industry = ?")
+            params.append(industry)
+        if since:
+            clauses.append("deals.filing_date >= ?")
+            params.append(since)
+        if until:
+            clauses.append("deals.filing_date <= ?")
+            params.append(until)
+        params.append(limit)
+
+        sql = f"""
+            SELECT deals.matter_number, deals.deal_name, deals.deal_type, deals.filing_date,
+                   deals.accession, deals.deal_dir, documents.exhibit_key, documents.path,
+                   snippet(documents_fts, 0, '[', ']', ' … ', 16) AS snippet
+            FROM documents_fts
+            JOIN documents ON documents.id = documents_fts.rowid
+            JOIN deals ON deals.accession = documents.accession
+            WHERE {' AND '.join(clauses)}
+            ORDER BY bm25(documents_fts)
+            LIMIT ?
+        """
+        with self._lock:
+            return [dict(row) for row in self._db.execute(sql, params).fetchall()]
+
+    def find_deals(self, deal_type: Optional[str] = None, industry: Optional[str] = None,
+                   sic: Optional[str] = None, party: Optional[str] = None,
+                   min_value: Optional[float] = None, max_value: Optional[float] = None,
+                   since: Optional[str] = None, until: Optional[str] = None,
+                   include_duplicates: bool = False, order_by: str = "value",
+                   limit: int = 50) -> list:
+        """Matters filtered by deal terms alone, largest deal (or newest signing) first.
+
+        party matches buyer or target as a case-insensitive substring.
+        """
+        clauses, params = [], []
+        if not include_duplicates:
+            clauses.append("duplicate_of IS NULL")
+        for column, value in (("deal_type", deal_type), ("industry", industry), ("sic", sic)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if party:
+            clauses.append("(buyer LIKE ? OR target LIKE ?)")
+            params += [f"%{party}%"] * 2
+        if min_value is not None:
+            clauses.append("deal_value_usd >= ?")
+            params.append(min_value)
+        if max_value is not None:
+            clauses.append("deal_value_usd <= ?")
+            params.append(max_value)
+        if since:
+            clauses.append("COALESCE(signing_date, filing_date) >= ?")
+            params.append(since)
+        if until:
+            clauses.append("COALESCE(signing_date, filing_date) <= ?")
+            params.append(until)
+        order = {
+            "value": "deal_value_usd IS NULL, deal_value_usd DESC",
+            "date": "COALESCE(signing_date, filing_date) DESC",
+        }[order_by]
+        params.append(limit)
+        sql = f"""
+            SELECT matter_number, deal_name, deal_type, buyer, target, signing_date, filing_date,
+                   purchase_price, deal_value, deal_value_usd, industry, sic, accession, deal_dir
+            FROM deals
+            {'WHERE ' + ' AND '.join(clauses) if clauses else ''}
+            ORDER BY {order}, matter_number
+            LIMIT ?
+        """
+        with self._lock:
+            return [dict(row) for row in self._db.execute(sql, params).fetchall()]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
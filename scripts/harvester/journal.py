@@ -0,0 +1,132 @@
+"""
+Append-only checkpoint journal for resumable harvests.
+
+Every unit of harvest progress is appended to a JSONL file as soon as it
+happens: each examined accession, each matter-number assignment, each
+downloaded exhibit, each finished matter, and a checkpoint at the end of a
+clean run. Replaying the file on startup tells a restarted harvest which
+filings it can skip, which matter numbers are already taken, and where the
+last complete run stopped (for --since refreshes).
+
+A crash can leave a torn final line; it is ignored on replay.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+
+class HarvestJournal:
+    """JSONL journal of accessions, matter assignments, exhibits and checkpoints."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.skipped: dict = {}        # accession -> filing date
+        self.matters: dict = {}        # accession -> matter number
+        self.deals: dict = {}          # accession -> DealInfo dict
+        self.exhibits: dict = {}       # (accession, exhibit key) -> exhibit record
+        self.checkpoints: list = []
+        self._replay()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _replay(self):
+        if not self.path.exists():
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self._apply(record)
+
+    def _apply(self, record: dict):
+        event = record.get("event")
+        if event == "skipped":
+            self.skipped[record["accession"]] = record.get("filing_date", "")
+        elif event == "matter":
+            self.matters[record["accession"]] = record["matter_number"]
+        elif event == "exhibit":
+            self.exhibits[(record["accession"], record["key"])] = record
+        elif event == "deal":
+            self.deals[record["deal"]["accession"]] = record["deal"]
+        elif event == "checkpoint":
+            self.checkpoints.append(record)
+
+    def _write(self, record: dict):
+        """Apply and persist one record. Caller holds the lock."""
+        record = {"event": record.pop("event"), "ts": time.time(), **record}
+        self._apply(record)
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def _append(self, record: dict):
+        with self._lock:
+            self._write(record)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def is_processed(self, accession: str) -> bool:
+        """True once a filing has been skipped or fully organized."""
+        return accession in self.skipped or accession in self.deals
+
+    def completed_deal(self, accession: str) -> Optional[dict]:
+        return self.deals.get(accession)
+
+    def exhibit(self, accession: str, key: str) -> Optional[dict]:
+        """The recorded download (path, bytes, sha256) of an exhibit, if any."""
+        return self.exhibits.get((accession, key))
+
+    def next_matter_number(self) -> int:
+        numbers = [int(m) for m in self.matters.values()]
+        return max(numbers, default=0) + 1
+
+    def last_checkpoint(self) -> Optional[dict]:
+        return self.checkpoints[-1] if self.checkpoints else None
+
+    def latest_filing_date(self) -> str:
+        dates = list(self.skipped.values()) + [d["filing_date"] for d in self.deals.values()]
+        return max((d for d in dates if d), default="")
+
+    def completed_deals(self) -> list:
+        """Finished matters in matter-number order."""
+        return sorted(self.deals.values(), key=lambda d: int(d["matter_number"]))
+
+    # ------------------------------------------------------------------
+    # Records
+    # ------------------------------------------------------------------
+
+    def record_skipped(self, accession: str, filing_date: str, reason: str):
+        self._append({"event": "skipped", "accession": accession,
+                      "filing_date": filing_date, "reason": reason})
+
+    def assign_matter(self, accession: str) -> str:
+        """Return the matter number for a filing, allocating the next free one if new."""
+        with self._lock:
+            existing = self.matters.get(accession)
+            if existing:
+                return existing
+            matter_number = f"{self.next_matter_number():03d}"
+            self._write({"event": "matter", "accession": accession, "matter_number": matter_number})
+            return matter_number
+
+    def record_exhibit(self, accession: str, key: str, path: Path, size: int, sha256: str):
+        self._append({"event": "exhibit", "accession": accession, "key": key,
+                      "path": str(path), "bytes": size, "sha256": sha256})
+
+    def record_deal(self, deal: dict):
+        self._append({"event": "deal", "deal": deal})
+
+    def checkpoint(self):
+        """Mark the end of a clean run; --since resumes from here."""
+        self._append({"event": "checkpoint", "latest_filing_date": self.latest_filing_date()})
+
+    def close(self):
+        with self._lock:
+            self._file.close()
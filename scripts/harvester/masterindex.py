@@ -0,0 +1,161 @@
+"""
+The master index of finished matters, maintained incrementally.
+
+Each finished (or relabelled) matter is appended to _master_index.jsonl as
+one line the moment it is done, so the index never has to be rebuilt in
+memory and is current even after a crash. Later lines for the same
+accession supersede earlier ones. Compaction rewrites the log with one line
+per matter and materializes _master_index.json (a JSON array in matter
+order, the format readers expect); both are written atomically and streamed
+matter by matter. Compaction runs on close and whenever superseded lines
+outnumber live ones.
+
+merge_indexes() combines the indexes of several sharded runs into one list
+with globally consistent matter numbers.
+"""
+
+import json
+import textwrap
+import threading
+from pathlib import Path
+
+from .atomic import write_atomic
+
+COMPACT_SLACK = 256     # superseded lines tolerated before compacting mid-run
+
+
+class MasterIndex:
+    """Append-only JSONL log of deal records, compacted into a JSON array."""
+
+    def __init__(self, path: Path, json_path: Path):
+        self.path = Path(path)
+        self.json_path = Path(json_path)
+        self._lock = threading.Lock()
+        self._deals: dict = {}      # accession -> deal dict
+        self._lines = 0
+        torn = self._replay()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = None
+        if torn:
+            self._compact()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _replay(self) -> bool:
+        """Load the log; True if it ends in a torn line that must be compacted away."""
+        if not self.path.exists():
+            return False
+        data = self.path.read_text(encoding="utf-8")
+        for line in data.splitlines():
+            try:
+                deal = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            self._deals[deal["accession"]] = deal
+            self._lines += 1
+        return bool(data) and not data.endswith("\n")
+
+    def __len__(self) -> int:
+        return len(self._deals)
+
+    def deals(self) -> list:
+        """Current record of every matter, in matter-number order."""
+        with self._lock:
+            return sorted(self._deals.values(), key=lambda d: int(d["matter_number"]))
+
+    def append(self, deal: dict):
+        """Record a finished matter (or a newer version of one)."""
+        with self._lock:
+            self._file.write(json.dumps(deal) + "\n")
+            self._file.flush()
+            self._deals[deal["accession"]] = deal
+            self._lines += 1
+            if self._lines - len(self._deals) > max(len(self._deals), COMPACT_SLACK):
+                self._compact()
+
+    def seed(self, deals: list):
+        """Populate an empty index, e.g. from the journal of a run that predates it."""
+        with self._lock:
+            if self._deals:
+                return
+            for deal in deals:
+                self._deals[deal["accession"]] = deal
+            self._compact()
+
+    def compact(self):
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the log and the JSON array from the live records. Caller holds the lock."""
+        deals = sorted(self._deals.values(), key=lambda d: int(d["matter_number"]))
+        if self._file:
+            self._file.close()
+        write_atomic(self.path, ((json.dumps(deal) + "\n").encode("utf-8") for deal in deals))
+        write_atomic(self.json_path, _json_array_chunks(deals))
+        self._lines = len(deals)
+        if self._file:
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def close(self):
+        with self._lock:
+            self._compact()
+            self._file.close()
+
+
+def load_deals(path: Path, json_path: Path) -> list:
+    """Read an index without opening it for writing: the log if present, else the JSON array."""
+    path, json_path = Path(path), Path(json_path)
+    if not path.exists():
+        return json.loads(json_path.read_text()) if json_path.exists() else []
+    deals = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            deal = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        deals[deal["accession"]] = deal
+    return sorted(deals.values(), key=lambda d: int(d["matter_number"]))
+
+
+def merge_indexes(sources: list) -> list:
+    """Merge (shard label, deals) pairs into one renumbered list.
+
+    A filing present in several shards (overlapping runs) is kept once, with
+    the union of its deal types. Matters are numbered by filing date, then
+    accession, so the numbering depends only on which filings were
+    harvested, never on shard order, and later filings append at the end.
+    Each record keeps its shard and shard-local matter number; duplicate_of
+    is rewritten to the canonical matter's new number.
+    """
+    merged: dict = {}
+    for label, deals in sources:
+        for deal in deals:
+            existing = merged.get(deal["accession"])
+            if existing:
+                existing["deal_types"] = list(dict.fromkeys(
+                    existing.get("deal_types", []) + deal.get("deal_types", [])))
+                continue
+            merged[deal["accession"]] = {**deal, "shard": label,
+                                         "shard_matter_number": deal["matter_number"]}
+    ordered = sorted(merged.values(), key=lambda d: (d["filing_date"], d["accession"]))
+    width = max(3, len(str(len(ordered))))
+    renumbered = {}
+    for n, deal in enumerate(ordered, 1):
+        deal["matter_number"] = f"{n:0{width}d}"
+        renumbered[(deal["shard"], deal["shard_matter_number"])] = deal["matter_number"]
+    for deal in ordered:
+        if deal.get("duplicate_of"):
+            deal["duplicate_of"] = renumbered.get((deal["shard"], deal["duplicate_of"]),
+                                                  deal["duplicate_of"])
+    return ordered
+
+
+def _json_array_chunks(deals: list):
+    """json.dumps(deals, indent=2), one element at a time."""
+    if not deals:
+        yield b"[]"
+        return
+    for i, deal in enumerate(deals):
+        element = textwrap.indent(json.dumps(deal, indent=2), "  ")
+        yield (("[\n" if i == 0 else ",\n") + element).encode("utf-8")
+    yield b"\n]"
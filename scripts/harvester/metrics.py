@@ -0,0 +1,225 @@
+"""
+Per-stage harvest instrumentation.
+
+Every EDGAR request is recorded against the stage that made it (search,
+index, download, ...): latency, bytes, final status, cache hits, and the
+time it spent waiting on the rate limiter. Throttling and server errors
+that the client retried are counted too, so a run that looked
+fine but spent minutes in 429 back-off shows up. Whole-matter timings
+(organize) go through time_stage().
+
+At the end of a run summary() gives a JSON-ready dict with per-stage
+request counts, req/s, bytes/s, latency histograms and percentiles, and
+to_prometheus() renders the same numbers in Prometheus text format.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Optional
+
+# Upper bounds (seconds) of the latency histogram buckets; the last is +Inf.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (cumulative on export, like Prometheus)."""
+
+    def __init__(self, bounds: tuple = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Bucket upper bound below which a fraction q of observations fall."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def cumulative(self) -> list:
+        total, result = 0, []
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            result.append(("+Inf" if bound == float("inf") else bound, total))
+        return result
+
+
+class StageStats:
+    def __init__(self):
+        self.requests = 0           # network requests (after retries)
+        self.cache_hits = 0         # answered from the HTTP cache with no request
+        self.bytes = 0
+        self.statuses: dict = {}    # final status code -> count
+        self.retried: dict = {}     # status code retried on -> count
+        self.errors = 0             # exceptions (connection failures after retries)
+        self.limiter_wait = 0.0
+        self.latency = Histogram()
+
+
+class Metrics:
+    """Thread-safe registry of per-stage request statistics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: dict = {}
+        self._local = threading.local()
+        self.started = time.monotonic()
+
+    def _stage(self, name: str) -> StageStats:
+        stats = self._stages.get(name)
+        if stats is None:
+            stats = self._stages[name] = StageStats()
+        return stats
+
+    # Current stage of the calling thread, for events (retries) that arrive
+    # from inside the client's retry loop with no stage attached.
+    @property
+    def current_stage(self) -> str:
+        return getattr(self._local, "stage", "other")
+
+    @contextmanager
+    def in_stage(self, name: str):
+        previous = getattr(self._local, "stage", None)
+        self._local.stage = name
+        try:
+            yield
+        finally:
+            self._local.stage = previous
+
+    def record_request(self, stage: str, seconds: float, status: Optional[int],
+                       size: int = 0, limiter_wait: float = 0.0):
+        """One request that reached the network; status None means it raised."""
+        with self._lock:
+            stats = self._stage(stage)
+            stats.requests += 1
+            stats.bytes += size
+            stats.limiter_wait += limiter_wait
+            stats.latency.observe(seconds)
+            if status is None:
+                stats.errors += 1
+            else:
+                stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    def record_cache_hit(self, stage: str, size: int = 0):
+        with self._lock:
+            stats = self._stage(stage)
+            stats.cache_hits += 1
+            stats.bytes += size
+
+    def record_retry(self, status: int):
+        """A response the client discarded and retried (429/5xx)."""
+        with self._lock:
+            stats = self._stage(self.current_stage)
+            stats.retried[status] = stats.retried.get(status, 0) + 1
+
+    def record_duration(self, stage: str, seconds: float):
+        """A timed unit of work that is not a single request (e.g. a whole matter)."""
+        with self._lock:
+            self._stage(stage).latency.observe(seconds)
+
+    @contextmanager
+    def time_stage(self, stage: str):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record_duration(stage, time.monotonic() - start)
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def summary(self) -> dict:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        stages = {}
+        with self._lock:
+            for name, stats in sorted(self._stages.items()):
+                throttled = stats.statuses.get(429, 0) + stats.retried.get(429, 0)
+                server_errors = sum(n for code, n in list(stats.statuses.items())
+                                    + list(stats.retried.items()) if code >= 500)
+                stages[name] = {
+                    "requests": stats.requests,
+                    "cache_hits": stats.cache_hits,
+                    "observations": stats.latency.count,
+                    "requests_per_second": round(stats.requests / elapsed, 3),
+                    "bytes": stats.bytes,
+                    "bytes_per_second": round(stats.bytes / elapsed, 1),
+                    "status_codes": {str(code): n for code, n in sorted(stats.statuses.items())},
+                    "retried": {str(code): n for code, n in sorted(stats.retried.items())},
+                    "throttled_429": throttled,
+                    "server_errors_5xx": server_errors,
+                    "errors": stats.errors,
+                    "limiter_wait_seconds": round(stats.limiter_wait, 3),
+                    "latency_seconds": {
+                        "sum": round(stats.latency.sum, 4),
+                        "mean": round(stats.latency.sum / stats.latency.count, 4)
+                        if stats.latency.count else None,
+                        "p50": stats.latency.quantile(0.5),
+                        "p90": stats.latency.quantile(0.9),
+                        "p99": stats.latency.quantile(0.99),
+                        "buckets": stats.latency.cumulative(),
+                    },
+                }
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "requests": sum(s["requests"] for s in stages.values()),
+            "limiter_wait_seconds": round(sum(s["limiter_wait_seconds"] for s in stages.values()), 3),
+            "stages": stages,
+        }
+
+    def to_prometheus(self, prefix: str = "edgar_harvest") -> str:
+        """The summary in Prometheus text exposition format (for a node_exporter textfile)."""
+        summary = self.summary()
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples: list):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{prefix}_{name}{_labels(labels)} {value}")
+
+        stages = summary["stages"]
+        metric("requests_total", "counter", "Network requests by stage and final status.",
+               [({"stage": s, "code": code}, n) for s, st in stages.items()
+                for code, n in st["status_codes"].items()])
+        metric("retries_total", "counter", "Responses retried by the client, by status.",
+               [({"stage": s, "code": code}, n) for s, st in stages.items()
+                for code, n in st["retried"].items()])
+        metric("cache_hits_total", "counter", "Requests answered from the HTTP cache.",
+               [({"stage": s}, st["cache_hits"]) for s, st in stages.items()])
+        metric("errors_total", "counter", "Requests that failed without a response.",
+               [({"stage": s}, st["errors"]) for s, st in stages.items()])
+        metric("bytes_total", "counter", "Response bytes by stage.",
+               [({"stage": s}, st["bytes"]) for s, st in stages.items()])
+        metric("limiter_wait_seconds_total", "counter", "Time spent waiting on the rate limiter.",
+               [({"stage": s}, st["limiter_wait_seconds"]) for s, st in stages.items()])
+        lines.append(f"# HELP {prefix}_latency_seconds Request (or whole-stage) latency.")
+        lines.append(f"# TYPE {prefix}_latency_seconds histogram")
+        for s, st in stages.items():
+            latency = st["latency_seconds"]
+            lines += [f"{prefix}_latency_seconds_bucket{_labels({'stage': s, 'le': le})} {n}"
+                      for le, n in latency["buckets"]]
+            lines.append(f"{prefix}_latency_seconds_sum{_labels({'stage': s})} {latency['sum']}")
+            lines.append(f"{prefix}_latency_seconds_count{_labels({'stage': s})} {st['observations']}")
+        metric("elapsed_seconds", "gauge", "Wall time of the run.",
+               [({}, summary["elapsed_seconds"])])
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()) + "}"
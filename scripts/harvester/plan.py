@@ -0,0 +1,78 @@
+"""
+Harvest plans: the list of searches one harvest run covers.
+
+A plan is a JSON file holding a list of specs (or {"queries": [...]}):
+
+    [
+      {"query": "\"agreement and plan of merger\"", "deal_type": "merger",
+       "max_deals": 25, "forms": "8-K", "start_date": "2024-01-01"},
+      {"query": "\"stock purchase agreement\"", "deal_type": "stock_purchase",
+       "max_deals": 25}
+    ]
+
+The harvester runs every spec's search before fetching anything, merges the
+hits by accession, and then fetches each filing's index and exhibits once,
+labelling the resulting matter with every deal type whose query matched it.
+
+A spec with "discovery": "bulk" takes its candidates from the quarterly
+full-index files instead of EFTS: every filing of the listed forms in the
+date range, newest first. The query is not applied to bulk candidates.
+
+A run can also be one shard of a larger harvest (--shard i/N): it keeps only
+the filings whose accession hashes to slice i, so N processes or machines
+with separate output roots harvest disjoint sets. The partition depends on
+the accession alone, never on search order or timing.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, fields
+from pathlib import Path
+
+DISCOVERY_MODES = ("efts", "bulk")
+
+
+@dataclass(frozen=True)
+class HarvestSpec:
+    query: str
+    deal_type: str
+    max_deals: int = 10
+    forms: str = "8-K"
+    start_date: str = "2024-01-01"
+    end_date: str = "2026-01-31"
+    discovery: str = "efts"     # "efts" (full-text search) or "bulk" (quarterly form index)
+
+
+def load_plan(path: Path) -> list:
+    """Read a plan file into HarvestSpecs. Unknown keys are an error, not silently dropped."""
+    data = json.loads(Path(path).read_text())
+    if isinstance(data, dict):
+        data = data.get("queries", [])
+    known = {f.name for f in fields(HarvestSpec)}
+    specs = []
+    for i, entry in enumerate(data):
+        unknown = set(entry) - known
+        if unknown:
+            raise ValueError(f"{path}: spec {i} has unknown keys: {', '.join(sorted(unknown))}")
+        spec = HarvestSpec(**entry)
+        if spec.discovery not in DISCOVERY_MODES:
+            raise ValueError(f"{path}: spec {i} has unknown discovery mode {spec.discovery!r}")
+        specs.append(spec)
+    return specs
+
+
+def parse_shard(text: str) -> tuple:
+    """'2/4' -> (2, 4). Shards are numbered from 1."""
+    try:
+        index, count = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise ValueError(f"shard must look like i/N, got {text!r}") from None
+    if not 1 <= index <= count:
+        raise ValueError(f"shard {text!r} is out of range: need 1 <= i <= N")
+    return index, count
+
+
+def shard_of(accession: str, count: int) -> int:
+    """The shard (1..count) an accession belongs to."""
+    digest = hashlib.sha256(accession.replace("-", "").encode()).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
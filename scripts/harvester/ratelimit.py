@@ -0,0 +1,149 @@
+"""
+Process-wide request rate limiting for SEC EDGAR.
+
+SEC asks automated clients to stay at or below 10 requests/second across the
+whole process, not per thread or per task. TokenBucket hands out reservations
+under a lock, so blocking callers (threads) and asyncio callers draw from the
+same budget and the combined request rate never exceeds `rate`.
+
+AdaptiveTokenBucket starts at that ceiling and reacts to SEC's own signals:
+a 429 or 503 cuts the rate by 10%, and the rate then climbs back toward the
+ceiling in small steps while responses keep succeeding. The request that was
+throttled is retried on its own after an exponential, jittered delay (never
+shorter than its Retry-After), so the rest of the pipeline keeps going at
+the lower rate; other callers are not held back for the Retry-After window,
+which would idle the whole pipeline on every throttling event.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Optional
+
+BACKOFF_BASE = 0.5     # seconds; first retry waits up to this long
+BACKOFF_CAP = 30.0     # seconds; no single retry waits longer (unless told to)
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Seconds before retry number `attempt` (from 0): exponential with full jitter,
+    but never less than the server's Retry-After."""
+    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+    return max(delay, retry_after or 0.0)
+
+
+class TokenBucket:
+    """Token bucket shared by synchronous and asyncio callers."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reserve(self) -> float:
+        """Take one token and return how long the caller must wait before using it.
+
+        Tokens may go negative: each caller reserves the next free slot, so
+        concurrent callers are spaced exactly 1/rate seconds apart.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def set_rate(self, rate: float):
+        """Change the refill rate; outstanding reservations keep their slot."""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+
+    def acquire(self) -> float:
+        """Block the calling thread until a request may be sent. Returns seconds waited."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self) -> float:
+        """Suspend the calling task until a request may be sent. Returns seconds waited."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds a throttled request should wait before retry number `attempt` (from 0)."""
+        return backoff_delay(attempt, retry_after)
+
+    def record_success(self):
+        """A request completed without being throttled (no-op for a fixed rate)."""
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """Token bucket whose rate backs off on throttling and recovers on success.
+
+    Multiplicative decrease, additive increase: each throttling event multiplies
+    the rate by `decrease` (at most once per `cooldown` seconds, so a burst of 429s
+    from requests already in flight counts once), and every `recovery_interval`
+    seconds without one adds `step` requests/second, up to `ceiling`.
+    """
+
+    def __init__(self, ceiling: float, floor: float = 0.5, decrease: float = 0.9,
+                 step: Optional[float] = None, recovery_interval: float = 1.0,
+                 cooldown: float = 1.0, burst: int = 1):
+        super().__init__(ceiling, burst)
+        if floor <= 0 or floor > ceiling:
+            raise ValueError("floor must be positive and no higher than the ceiling")
+        self.ceiling = float(ceiling)
+        self.floor = float(floor)
+        self.decrease = decrease
+        self.step = step or self.ceiling / 10
+        self.recovery_interval = recovery_interval
+        self.cooldown = cooldown
+        self.throttle_events = 0
+        now = time.monotonic()
+        self._last_decrease = now - cooldown
+        self._last_step = now
+
+    def set_rate(self, rate: float):
+        """Set the ceiling (and the current rate) to `rate`."""
+        super().set_rate(rate)
+        with self._lock:
+            self.ceiling = float(rate)
+            self.floor = min(self.floor, self.ceiling)
+            self.step = self.ceiling / 10
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Slow everyone down, then return the throttled request's own retry delay."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now - self._last_decrease >= self.cooldown:
+                self.rate = max(self.floor, self.rate * self.decrease)
+                self.throttle_events += 1
+                self._last_decrease = now
+            self._last_step = now       # no recovery while still being throttled
+        return super().backoff(attempt, retry_after)
+
+    def record_success(self):
+        with self._lock:
+            if self.rate >= self.ceiling:
+                return
+            now = time.monotonic()
+            if now - self._last_step < self.recovery_interval:
+                return
+            self._refill(now)
+            self.rate = min(self.ceiling, self.rate + self.step)
+            self._last_step = now
@@ -0,0 +1,270 @@
+"""
+Offline EDGAR: recorded responses served back over HTTP.
+
+A recording is a directory:
+
+    recording.json    {"queries": {q: [EFTS hit _source, ...]},
+                       "files": {path: {"sha256", "content_type"}}}
+    bodies/<sha256>   response bodies, stored once
+
+`files` holds everything fetched by path -- filing index.json files,
+exhibits, submissions JSON, quarterly form indexes -- keyed by URL path
+(/Archives/edgar/data/..., /submissions/CIK##########.json). EFTS is not
+recorded page by page, since the harvester splits a date range into month
+shards whose boundaries depend on the run; instead each query's hits are
+kept and ReplayServer answers any startdt/enddt/forms/from combination from
+them, paging and capping the total the way EFTS does.
+
+Recordings come from two places:
+
+    from_cache()    a real harvest's _http_cache (run once against sec.gov)
+    synthesize()    a generated corpus of EDGAR-shaped filings, for when no
+                    real run is at hand
+
+ReplayServer is a harvester.stubserver.StubServer answering from a
+recording, so its latency, rate and error_rate knobs apply unchanged. Point
+harvest_edgar.py at it with --sec-base. See scripts/bench_harvest.py.
+"""
+
+import hashlib
+import json
+import random
+import sqlite3
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+from .atomic import write_atomic, write_text_atomic
+from .stubserver import StubServer, json_response
+
+RECORDING_FILE = "recording.json"
+EFTS_PATH = "/LATEST/search-index"
+EFTS_PAGE_SIZE = 100
+EFTS_RESULT_CAP = 10000
+
+
+def _content_type(path: str) -> str:
+    if path.endswith(".json"):
+        return "application/json"
+    if path.endswith((".idx", ".txt")):
+        return "text/plain"
+    return "text/html"
+
+
+class Recording:
+    """A recording directory, loaded for serving or being written."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.queries: dict = {}
+        self.files: dict = {}
+        manifest = self.root / RECORDING_FILE
+        if manifest.exists():
+            data = json.loads(manifest.read_text())
+            self.queries, self.files = data["queries"], data["files"]
+
+    def add_file(self, path: str, body: bytes, content_type: Optional[str] = None):
+        sha256 = hashlib.sha256(body).hexdigest()
+        blob = self.root / "bodies" / sha256
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(blob, [body])
+        self.files[path] = {"sha256": sha256, "content_type": content_type or _content_type(path)}
+
+    def add_hits(self, query: str, hits: list):
+        """Record EFTS hit sources for a query; repeats of a document are dropped."""
+        known = self.queries.setdefault(query, [])
+        seen = {(hit.get("adsh"), hit.get("file_name")) for hit in known}
+        for hit in hits:
+            if (hit.get("adsh"), hit.get("file_name")) not in seen:
+                seen.add((hit.get("adsh"), hit.get("file_name")))
+                known.append(hit)
+
+    def save(self):
+        for hits in self.queries.values():
+            hits.sort(key=lambda hit: (hit.get("file_date", ""), hit.get("adsh", "")), reverse=True)
+        self.root.mkdir(parents=True, exist_ok=True)
+        write_text_atomic(self.root / RECORDING_FILE,
+                          json.dumps({"queries": self.queries, "files": self.files}))
+
+    def body(self, path: str) -> Optional[bytes]:
+        record = self.files.get(path)
+        if record is None:
+            return None
+        return (self.root / "bodies" / record["sha256"]).read_bytes()
+
+    def date_range(self) -> tuple:
+        """(earliest, latest) filing date over every recorded hit."""
+        dates = [hit["file_date"] for hits in self.queries.values() for hit in hits]
+        return (min(dates), max(dates)) if dates else (None, None)
+
+    # ------------------------------------------------------------------
+    # Serving
+    # ------------------------------------------------------------------
+
+    def search(self, query: dict) -> tuple:
+        """An EFTS response for the request's q/forms/startdt/enddt/from."""
+        first = lambda name, default="": query.get(name, [default])[0]
+        forms = {form.strip() for form in first("forms").split(",") if form.strip()}
+        start, end = first("startdt", "0000-00-00"), first("enddt", "9999-99-99")
+        hits = [hit for hit in self.queries.get(first("q"), [])
+                if start <= hit.get("file_date", "") <= end
+                and (not forms or hit.get("form") in forms)]
+        offset = int(first("from", "0"))
+        total = {"value": min(len(hits), EFTS_RESULT_CAP),
+                 "relation": "gte" if len(hits) > EFTS_RESULT_CAP else "eq"}
+        page = hits[offset:min(offset + EFTS_PAGE_SIZE, EFTS_RESULT_CAP)]
+        return json_response({"hits": {"total": total, "hits": [
+            {"_id": f"{hit.get('adsh')}:{hit.get('file_name', '')}", "_source": hit} for hit in page
+        ]}})
+
+    def respond(self, path: str, query: dict) -> tuple:
+        if path.endswith(EFTS_PATH):
+            return self.search(query)
+        body = self.body(path)
+        if body is None:
+            return 404, {"Content-Type": "text/plain"}, b"Not recorded"
+        return 200, {"Content-Type": self.files[path]["content_type"]}, body
+
+
+class ReplayServer(StubServer):
+    """StubServer answering from a Recording; .url is what --sec-base takes."""
+
+    def __init__(self, recording: Recording, **kwargs):
+        super().__init__(respond=recording.respond, **kwargs)
+        self.recording = recording
+        self.bytes_served = 0
+
+    def _count_bytes(self, path: str, query: dict) -> tuple:
+        status, headers, body = self.recording.respond(path, query)
+        with self._lock:
+            self.bytes_served += len(body)
+        return status, headers, body
+
+    def start(self) -> "ReplayServer":
+        self.respond = self._count_bytes
+        return super().start()
+
+
+# ----------------------------------------------------------------------
+# Sources
+# ----------------------------------------------------------------------
+
+def from_cache(cache_root: Path, dest: Path) -> Recording:
+    """A recording of every response in a harvest's HTTP cache (_http_cache)."""
+    cache_root = Path(cache_root)
+    recording = Recording(dest)
+    db = sqlite3.connect(cache_root / "index.sqlite")
+    try:
+        rows = db.execute("SELECT key, sha256 FROM entries").fetchall()
+    finally:
+        db.close()
+    for key, sha256 in rows:   # key: URL plus its query string
+        blob = cache_root / "objects" / sha256[:2] / sha256
+        if not blob.exists():
+            continue
+        parsed = urlparse(key)
+        if parsed.path.endswith(EFTS_PATH):
+            query = parse_qs(parsed.query).get("q", [""])[0]
+            hits = json.loads(blob.read_bytes()).get("hits", {}).get("hits", [])
+            recording.add_hits(query, [hit["_source"] for hit in hits if "_source" in hit])
+        else:
+            recording.add_file(parsed.path, blob.read_bytes())
+    recording.save()
+    return recording
+
+
+_FIRST = ("Acme", "Northwind", "Globex", "Initech", "Umbrella", "Stark", "Wayne", "Hooli",
+          "Vandelay", "Soylent", "Cyberdyne", "Tyrell", "Wonka", "Gringotts", "Oscorp", "Aperture")
+_SECOND = ("Holdings", "Technologies", "Therapeutics", "Energy", "Financial", "Industries",
+           "Systems", "Brands", "Logistics", "Bancorp")
+_SICS = (("7372", "SERVICES-PREPACKAGED SOFTWARE"), ("2834", "PHARMACEUTICAL PREPARATIONS"),
+         ("6022", "STATE COMMERCIAL BANKS"), ("1311", "CRUDE PETROLEUM & NATURAL GAS"),
+         ("3674", "SEMICONDUCTORS & RELATED DEVICES"))
+# Agreement bodies are drawn from this vocabulary so that no two synthetic
+# agreements look like near-duplicates to harvester.dedup.
+_LEGALESE = (
+    "party parties shall agreement merger company parent sub effective time closing conditions "
+    "representations warranties covenants indemnification material adverse effect consent "
+    "approval termination fee stockholders board directors recommendation superior proposal "
+    "financing regulatory antitrust waiting period governmental authority law order lien "
+    "subsidiary subsidiaries capital stock shares option award consideration payment escrow "
+    "notice breach cure reasonable best efforts commercially ordinary course business employee "
+    "benefit plan tax return intellectual property contract permit liability insurance"
+).split()
+
+
+def _company(rnd: random.Random) -> str:
+    return f"{rnd.choice(_FIRST)} {rnd.choice(_SECOND)}, Inc."
+
+
+def _agreement(rnd: random.Random, buyer: str, target: str, signed: date, price: int,
+               size: int) -> bytes:
+    head = (
+        f"<html><body><p>AGREEMENT AND PLAN OF MERGER</p><p>This AGREEMENT AND PLAN OF MERGER, "
+        f"dated as of {signed:%B} {signed.day}, {signed.year} (this \"Agreement\"), is entered "
+        f"into by and among {buyer}, a Delaware corporation (\"Parent\"), {buyer.split()[0]} "
+        f"Merger Sub, Inc., a Delaware corporation (\"Merger Sub\"), and {target}, a "
+        f"Delaware corporation (the \"Company\").</p><p>RECITALS</p>"
+        f"<p>The aggregate purchase price shall be ${price:,} (the \"Purchase Price\").</p>\n"
+    )
+    clauses, n, length = [], 1, len(head)
+    while length < size:
+        clauses.append(f"<p>Section {n}. {' '.join(rnd.choices(_LEGALESE, k=60))}.</p>\n")
+        length += len(clauses[-1])
+        n += 1
+    return (head + "".join(clauses) + "</body></html>").encode()
+
+
+def synthesize(dest: Path, filings: int = 200, query: str = '"agreement and plan of merger"',
+               start: str = "2024-01-01", days: int = 365, agreement_kb: int = 200,
+               seed: int = 0) -> Recording:
+    """A generated recording: `filings` 8-Ks matching `query`, about half with an Ex 2.1.
+
+    Each filing has an index.json, an 8-K body, an Ex 99.1 press release and
+    an Ex 10.1; the Ex 2.1 agreements carry a parseable preamble and price
+    and are padded to roughly agreement_kb. Every filer has a submissions
+    JSON with a SIC code. The same arguments always produce the same bytes.
+    """
+    rnd = random.Random(seed)
+    recording = Recording(dest)
+    first_day = date.fromisoformat(start)
+    hits = []
+    for i in range(filings):
+        cik = str(1_000_000 + rnd.randrange(9_000_000))
+        accession = f"{rnd.randrange(10 ** 10):010d}-{first_day.year % 100:02d}-{i:06d}"
+        folder = f"/Archives/edgar/data/{cik}/{accession.replace('-', '')}"
+        filed = first_day + timedelta(days=rnd.randrange(days))
+        buyer, target = _company(rnd), _company(rnd)
+        has_agreement = rnd.random() < 0.5
+        names = ["d8k.htm", "ex99-1.htm", "ex10-1.htm"] + (["ex2-1.htm"] if has_agreement else [])
+        hits.append({"ciks": [cik.zfill(10)], "display_names": [f"{target} (CIK {cik.zfill(10)})"],
+                     "file_date": filed.isoformat(), "form": "8-K", "adsh": accession,
+                     "file_name": names[0]})
+        recording.add_file(f"{folder}/index.json", json.dumps(
+            {"directory": {"name": folder, "item": [{"name": name, "type": "text.gif"}
+                                                    for name in names]}}).encode())
+        recording.add_file(f"{folder}/d8k.htm", (
+            f"<html><body><p>FORM 8-K</p><p>Item 1.01 Entry into a Material Definitive Agreement. "
+            f"{target} entered into an Agreement and Plan of Merger with {buyer}.</p></body></html>"
+        ).encode())
+        price = rnd.randrange(50, 20_000) * 1_000_000
+        recording.add_file(f"{folder}/ex99-1.htm", (
+            f"<html><body><p>{buyer} to Acquire {target} in a transaction valued at "
+            f"approximately ${price / 1e9:.1f} billion.</p>{'<p>Forward-looking statements.</p>' * 40}"
+            f"</body></html>").encode())
+        recording.add_file(f"{folder}/ex10-1.htm",
+                           b"<html><body><p>VOTING AND SUPPORT AGREEMENT</p>"
+                           + b"<p>Each Stockholder agrees to vote its Shares.</p>" * 200
+                           + b"</body></html>")
+        if has_agreement:
+            signed = filed - timedelta(days=rnd.randrange(1, 5))
+            recording.add_file(f"{folder}/ex2-1.htm",
+                               _agreement(rnd, buyer, target, signed, price, agreement_kb * 1024))
+        sic, description = rnd.choice(_SICS)
+        recording.add_file(f"/submissions/CIK{cik.zfill(10)}.json", json.dumps(
+            {"cik": cik, "name": target, "sic": sic, "sicDescription": description}).encode())
+    recording.add_hits(query, hits)
+    recording.save()
+    return recording
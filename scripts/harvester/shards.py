@@ -0,0 +1,164 @@
+"""
+Date-range sharding for EDGAR full-text search.
+
+EFTS stops paging at 10,000 hits per query, so a broad query over several
+years silently loses everything past the cap. Splitting the date range into
+calendar-month shards keeps most shards well under it; a shard that still
+reports a capped total is halved until it fits or is down to a single day.
+
+ShardedSearch fetches pages for many shards at once through a small thread
+pool (the caller's rate limiter still sets the pace) and hands hits back in
+shard order, newest month first, so results are deterministic. Once a
+shard's first page reports its total, its remaining pages are known and are
+fetched in parallel too. The number of pages requested ahead of the consumer
+is bounded, so a caller that stops early wastes at most a few requests.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Callable, Iterator, Optional
+
+
+def _parse(day: str) -> date:
+    return date.fromisoformat(day)
+
+
+def month_shards(start_date: str, end_date: str) -> list:
+    """Split [start_date, end_date] (inclusive, ISO dates) into calendar months, newest first."""
+    start, end = _parse(start_date), _parse(end_date)
+    shards = []
+    cursor = start
+    while cursor <= end:
+        next_month = (cursor.replace(day=1) + timedelta(days=32)).replace(day=1)
+        last = min(end, next_month - timedelta(days=1))
+        shards.append((cursor.isoformat(), last.isoformat()))
+        cursor = next_month
+    shards.reverse()
+    return shards
+
+
+def split_shard(start_date: str, end_date: str) -> list:
+    """Halve a shard, newer half first. A single-day shard cannot be split."""
+    start, end = _parse(start_date), _parse(end_date)
+    if start >= end:
+        return []
+    middle = start + (end - start) // 2
+    return [
+        ((middle + timedelta(days=1)).isoformat(), end.isoformat()),
+        (start.isoformat(), middle.isoformat()),
+    ]
+
+
+class _Shard:
+    def __init__(self, start: str, end: str):
+        self.start = start
+        self.end = end
+        self.total: Optional[int] = None   # hits to page through, known after the first page
+        self.next_offset = 0               # next page to request
+        self.read_offset = 0               # next page to hand to the consumer
+        self.pages: dict = {}              # offset -> Future of fetch_page(...)
+
+
+class ShardedSearch:
+    """Iterate the hits of several date shards, fetching pages concurrently.
+
+    `fetch_page(start, end, offset)` returns (hits, total, capped) for one
+    page of one shard and runs in a worker thread. A shard whose first page
+    is capped is replaced by split_shard's halves. At most `lookahead` pages
+    are requested or buffered ahead of the consumer (default 2 x workers).
+    """
+
+    def __init__(self, fetch_page: Callable[[str, str, int], tuple], shards: list,
+                 workers: int = 4, page_size: int = 100, result_cap: int = 10000,
+                 lookahead: int = 0):
+        self._fetch_page = fetch_page
+        self._shards = [_Shard(start, end) for start, end in shards]
+        self._page_size = page_size
+        self._result_cap = result_cap
+        self._lookahead = lookahead or 2 * max(1, workers)
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers),
+                                        thread_name_prefix="efts-shard")
+        self.truncated: list = []   # single-day shards still over the cap
+        self._items = self._iterate()
+
+    def _submit(self, shard: _Shard, offset: int) -> Future:
+        future = self._pool.submit(self._fetch_page, shard.start, shard.end, offset)
+        shard.pages[offset] = future
+        return future
+
+    def _resolve(self, index: int, first_page: tuple) -> bool:
+        """Act on a shard's first page: split it if capped, otherwise learn its total.
+
+        Returns True if the shard was split (its first page is then discarded).
+        """
+        shard = self._shards[index]
+        _, total, capped = first_page
+        halves = split_shard(shard.start, shard.end) if capped else []
+        if halves:
+            self._shards[index:index + 1] = [_Shard(start, end) for start, end in halves]
+            return True
+        if capped:
+            self.truncated.append((shard.start, shard.end))
+        shard.total = min(total, self._result_cap)
+        shard.next_offset = self._page_size
+        return False
+
+    def _schedule(self):
+        """Top up page requests, earliest shards first, within the lookahead budget."""
+        outstanding = sum(len(shard.pages) for shard in self._shards)
+        i = 0
+        while i < len(self._shards) and outstanding < self._lookahead:
+            shard = self._shards[i]
+            if shard.total is None:
+                first = shard.pages.get(0)
+                if first is None:
+                    self._submit(shard, 0)
+                    outstanding += 1
+                elif first.done() and first.exception() is None:
+                    if self._resolve(i, first.result()):
+                        outstanding -= 1
+                    continue
+                i += 1
+                continue
+            while shard.next_offset < shard.total and outstanding < self._lookahead:
+                self._submit(shard, shard.next_offset)
+                shard.next_offset += self._page_size
+                outstanding += 1
+            i += 1
+
+    def _iterate(self) -> Iterator:
+        try:
+            while True:
+                self._schedule()
+                if not self._shards:
+                    return
+                shard = self._shards[0]
+                if shard.total is None:
+                    first = shard.pages.get(0) or self._submit(shard, 0)
+                    self._resolve(0, first.result())
+                    continue
+                if shard.read_offset >= shard.total:
+                    self._shards.pop(0)
+                    continue
+                page = shard.pages.pop(shard.read_offset, None)
+                if page is None:
+                    page = self._submit(shard, shard.read_offset)
+                    shard.pages.pop(shard.read_offset)
+                    shard.next_offset = max(shard.next_offset, shard.read_offset + self._page_size)
+                hits = page.result()[0]
+                shard.read_offset += self._page_size
+                if not hits:
+                    shard.read_offset = shard.total
+                yield from hits
+        finally:
+            self.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._items)
+
+    def close(self):
+        """Stop fetching; pages not yet started are cancelled."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,125 @@
+"""
+Local stand-in for SEC's HTTP endpoints, with throttling on demand.
+
+StubServer serves on 127.0.0.1 in a background thread and answers every GET
+through a `respond(path, query)` callable (by default a synthetic HTML
+document per path). It can make itself look like sec.gov under load:
+
+    rate          requests/second allowed per sliding one-second window;
+                  anything over it gets 429 with a Retry-After header
+    error_rate    fraction of requests answered 503 at random
+    latency       seconds added to every response
+
+Counters (requests, throttled, errors) let a caller check how a client
+behaved. Used by scripts/bench_rate_controller.py and, serving recorded
+EDGAR responses, by harvester.replay; nothing here touches the network
+beyond the loopback interface.
+"""
+
+import json
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+def synthetic_document(path: str, query: dict) -> tuple:
+    """(status, headers, body) of a small HTML document named after the path."""
+    body = f"<html><body><p>{path}</p>{'<p>lorem ipsum</p>' * 200}</body></html>".encode()
+    return 200, {"Content-Type": "text/html"}, body
+
+
+def json_response(data, status: int = 200) -> tuple:
+    return status, {"Content-Type": "application/json"}, json.dumps(data).encode()
+
+
+class StubServer:
+    """Threaded HTTP server on a free loopback port."""
+
+    def __init__(self, respond: Callable[[str, dict], tuple] = synthetic_document,
+                 rate: Optional[float] = None, retry_after: float = 1.0,
+                 error_rate: float = 0.0, latency: float = 0.0, seed: int = 0):
+        self.respond = respond
+        self.rate = rate
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.latency = latency
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+        self._window: deque = deque()   # send times of requests served in the last second
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_port}"
+
+    def _admit(self) -> Optional[int]:
+        """Count a request; the status to fail it with (429/503), or None to serve it."""
+        with self._lock:
+            self.requests += 1
+            now = time.monotonic()
+            if self.rate is not None:
+                while self._window and now - self._window[0] >= 1.0:
+                    self._window.popleft()
+                if len(self._window) >= self.rate:
+                    self.throttled += 1
+                    return 429
+                self._window.append(now)
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.errors += 1
+                return 503
+        return None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                failure = server._admit()
+                if failure:
+                    headers = {"Retry-After": f"{server.retry_after:g}"} if failure == 429 else {}
+                    self._send(failure, headers, b"")
+                    return
+                parsed = urlparse(self.path)
+                self._send(*server.respond(parsed.path, parse_qs(parsed.query)))
+
+            def _send(self, status: int, headers: dict, body: bytes):
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True,
+                                        name="stub-server")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
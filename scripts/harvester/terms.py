@@ -0,0 +1,257 @@
+"""
+Deal terms read from the harvested documents.
+
+Every matter's basic facts are in predictable places:
+
+    Ex 2.1 preamble   "This AGREEMENT AND PLAN OF MERGER, dated as of March 3,
+                      2024, is entered into by and among Acme Corp., a Delaware
+                      corporation ("Parent"), ..., and Widget Inc., a Delaware
+                      corporation (the "Company")."  -> buyer, target, signing date
+    Ex 2.1 body       "... the aggregate purchase price of $125,000,000 ..."
+                      -> purchase price
+    Ex 99.1           "... a transaction valued at approximately $1.2 billion"
+                      -> deal value
+    submissions JSON  data.sec.gov/submissions/CIK##########.json -> SIC industry
+
+extract_terms() works on the stored .extracted.txt files and returns plain
+values, so it runs in the harvester's process pool. TermsCache keeps the
+result per accession (tagged with EXTRACTOR_VERSION, so improving a pattern
+re-extracts old matters on the next pass). Fields that cannot be found are
+None; nothing here guesses.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+EXTRACTOR_VERSION = 1
+
+# The preamble and party block sit at the top; prices can be anywhere.
+PREAMBLE_CHARS = 6000
+
+# Defined-term roles, by side of the deal. The first party found in a role
+# wins; "Seller" only names the target when no "Company" is defined (asset
+# and stock purchases where the seller's business is the thing acquired).
+BUYER_ROLES = ("Parent", "Buyer", "Purchaser", "Acquirer", "Acquiror", "Acquiring Company")
+TARGET_ROLES = ("Company", "Target", "Seller", "Sellers")
+
+MONTHS = ("january", "february", "march", "april", "may", "june", "july", "august",
+          "september", "october", "november", "december")
+_MONTH = r"(?P<month>January|February|March|April|May|June|July|August|September|October|November|December)"
+_DATE = re.compile(
+    r"(?:dated|entered\s+into|made)(?:\s+and\s+entered\s+into)?(?:\s+(?:as\s+of|on|effective))?,?\s+"
+    r"(?:(?:this|the)\s+(?P<ordinal>\d{1,2})(?:st|nd|rd|th)?\s+day\s+of\s+" + _MONTH + r",?\s+(?P<year1>\d{4})"
+    r"|" + _MONTH.replace("month", "month2") + r"\s+(?P<day>\d{1,2}),?\s+(?P<year2>\d{4}))",
+    re.IGNORECASE,
+)
+_PARTIES_START = re.compile(r"\b(?:by\s+and\s+)?(?:among|between)\b\s*:?", re.IGNORECASE)
+_PARTIES_END = re.compile(r"\b(?:W\s*I\s*T\s*N\s*E\s*S\s*S\s*E\s*T\s*H|RECITALS|WHEREAS|BACKGROUND)\b")
+# ("Parent") / (the "Company") / (together with ..., "Buyer") / (each a "Seller" ...)
+_DEFINED_TERM = re.compile(
+    r"\((?:[^()\"“”]{0,80}?)[\"“”](?P<role>[A-Z][A-Za-z .&'-]{0,40}?)[\"“”][^()]{0,40}\)"
+)
+_PARTY_LEAD = re.compile(r"^(?:[\s,;:]|and\b|or\b)+", re.IGNORECASE)
+# Name ends where its description starts: ", a Delaware corporation", ", an individual".
+_PARTY_DESCRIPTION = re.compile(
+    r",?\s+(?:an?|the)\s+(?=[A-Za-z ,.-]*(?:corporation|company|partnership|limited|trust|"
+    r"individual|entity|société|GmbH|organized|formed|incorporated|existing|association|bank))",
+    re.IGNORECASE,
+)
+
+_AMOUNT = (r"\$\s?(?P<amount>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)"
+           r"(?:\s*(?P<scale>million|billion|thousand|mm|bn|m|b)\b)?")
+_PRICE = re.compile(
+    r"(?P<label>aggregate\s+(?:purchase\s+price|consideration|merger\s+consideration)|"
+    r"purchase\s+price|merger\s+consideration|per\s+share\s+merger\s+consideration|"
+    r"offer\s+price)"
+    r"[^$.;]{0,160}?" + _AMOUNT + r"(?P<per_share>\s+(?:in\s+cash\s+)?per\s+(?:share|Share))?",
+    re.IGNORECASE,
+)
+# Amount first, defined term after: "$42.50 in cash per share (the "Merger Consideration")".
+_PRICE_DEFINED = re.compile(
+    _AMOUNT + r"(?P<per_share>(?:\s+in\s+cash)?,?\s+per\s+(?:share|Share))?[^.;$]{0,80}?"
+    r"\(\s*the\s+[\"“](?P<label>(?:Per\s+Share\s+)?(?:Merger\s+Consideration|Purchase\s+Price|"
+    r"Offer\s+Price|Closing\s+Consideration))[\"”]",
+    re.IGNORECASE,
+)
+_VALUE = re.compile(
+    r"(?:valued\s+at|(?:enterprise|equity|transaction|total|aggregate)\s+value\s+of|"
+    r"(?:deal|transaction|acquisition|merger)\s+(?:is\s+)?(?:valued\s+at|worth)|"
+    r"for\s+(?:total\s+|aggregate\s+)?(?:consideration\s+of\s+)?)"
+    r"\s*(?:approximately|about|roughly|up\s+to|nearly|over|more\s+than)?\s*" + _AMOUNT,
+    re.IGNORECASE,
+)
+_SCALES = {"thousand": 1e3, "million": 1e6, "mm": 1e6, "m": 1e6, "billion": 1e9, "bn": 1e9, "b": 1e9}
+
+
+def _squash(text: str) -> str:
+    return re.sub(r"\s+", " ", text)
+
+
+def signing_date(preamble: str) -> Optional[str]:
+    """ISO date the agreement is 'dated as of', or None."""
+    match = _DATE.search(preamble)
+    if not match:
+        return None
+    month = match["month"] or match["month2"]
+    day = match["ordinal"] or match["day"]
+    year = match["year1"] or match["year2"]
+    try:
+        return date(int(year), MONTHS.index(month.lower()) + 1, int(day)).isoformat()
+    except ValueError:
+        return None
+
+
+def _party_name(chunk: str) -> Optional[str]:
+    chunk = _PARTY_LEAD.sub("", chunk)
+    chunk = _PARTY_DESCRIPTION.split(chunk, 1)[0]
+    name = chunk.strip(" ,;:").strip()
+    if not name or len(name) > 120 or not name[0].isupper():
+        return None
+    return name
+
+
+def parse_parties(preamble: str) -> list:
+    """(name, defined role) pairs from the opening 'by and among ...' clause."""
+    preamble = _squash(preamble)
+    start = _PARTIES_START.search(preamble)
+    if not start:
+        return []
+    end = _PARTIES_END.search(preamble, start.end())
+    block = preamble[start.end():end.start() if end else len(preamble)]
+    parties, previous = [], 0
+    for term in _DEFINED_TERM.finditer(block):
+        name = _party_name(block[previous:term.start()])
+        previous = term.end()
+        if name:
+            parties.append((name, term["role"].strip()))
+    return parties
+
+
+def _first_in_role(parties: list, roles: tuple) -> Optional[str]:
+    for role in roles:
+        for name, party_role in parties:
+            if party_role.lower() == role.lower():
+                return name
+    return None
+
+
+def parse_preamble(text: str) -> dict:
+    """Buyer, target and signing date from the start of an acquisition agreement."""
+    preamble = text[:PREAMBLE_CHARS]
+    parties = parse_parties(preamble)
+    return {
+        "buyer": _first_in_role(parties, BUYER_ROLES),
+        "target": _first_in_role(parties, TARGET_ROLES),
+        "signing_date": signing_date(_squash(preamble)),
+        "parties": [list(party) for party in parties],
+    }
+
+
+def amount_usd(amount: str, scale: Optional[str]) -> float:
+    return float(amount.replace(",", "")) * _SCALES.get((scale or "").lower(), 1.0)
+
+
+def _format_amount(match: re.Match) -> str:
+    text = f"${match['amount']}"
+    return f"{text} {match['scale'].lower()}" if match["scale"] else text
+
+
+def purchase_price(text: str) -> Optional[dict]:
+    """The agreement's headline price: {"text", "usd", "per_share"}, or None.
+
+    An aggregate amount is preferred over a per-share one; among several
+    aggregate amounts the first stated wins (definitions come before
+    adjustment mechanics).
+    """
+    text = _squash(text)
+    matches = sorted([*_PRICE.finditer(text), *_PRICE_DEFINED.finditer(text)], key=lambda m: m.start())
+    per_share = None
+    for match in matches:
+        found = {"text": _format_amount(match), "usd": amount_usd(match["amount"], match["scale"]),
+                 "per_share": bool(match["per_share"])}
+        if found["per_share"] or "per share" in match["label"].lower():
+            found["per_share"] = True
+            per_share = per_share or found
+            continue
+        if found["usd"] >= 1000:    # skip "$1.00 of the Purchase Price" style fragments
+            return found
+    return per_share
+
+
+def deal_value(press_release: str) -> Optional[dict]:
+    """Headline transaction value from a press release: {"text", "usd"}, or None."""
+    match = _VALUE.search(_squash(press_release[:20000]))
+    if not match:
+        return None
+    return {"text": _format_amount(match), "usd": amount_usd(match["amount"], match["scale"])}
+
+
+def extract_terms(agreement_text: Optional[str], press_release_text: Optional[str] = None) -> dict:
+    """Deal terms from the stored text files of an Ex 2.1 and an Ex 99.1.
+
+    Takes and returns plain values so it can run in a worker process.
+    """
+    terms = {"version": EXTRACTOR_VERSION, "buyer": None, "target": None, "signing_date": None,
+             "parties": [], "purchase_price": None, "purchase_price_usd": None,
+             "deal_value": None, "deal_value_usd": None}
+    if agreement_text and Path(agreement_text).exists():
+        text = Path(agreement_text).read_text(encoding="utf-8")
+        terms.update(parse_preamble(text))
+        price = purchase_price(text)
+        if price:
+            terms["purchase_price"] = price["text"] + (" per share" if price["per_share"] else "")
+            terms["purchase_price_usd"] = None if price["per_share"] else price["usd"]
+    if press_release_text and Path(press_release_text).exists():
+        value = deal_value(Path(press_release_text).read_text(encoding="utf-8"))
+        if value:
+            terms["deal_value"], terms["deal_value_usd"] = value["text"], value["usd"]
+    if terms["deal_value"] is None and terms["purchase_price_usd"]:
+        # No press-release figure: the agreement's aggregate price is the deal value.
+        terms["deal_value"], terms["deal_value_usd"] = terms["purchase_price"], terms["purchase_price_usd"]
+    return terms
+
+
+def industry(submissions: dict) -> tuple:
+    """(SIC code, SIC description) from a data.sec.gov submissions document."""
+    sic = str(submissions.get("sic") or "").strip() or None
+    return sic, (submissions.get("sicDescription") or "").strip() or None
+
+
+class TermsCache:
+    """Extracted terms per accession, so each filing is parsed once."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS terms (accession TEXT PRIMARY KEY, version INTEGER NOT NULL, "
+            "terms TEXT NOT NULL, extracted_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def get(self, accession: str) -> Optional[dict]:
+        """Cached terms, unless they came from an older extractor."""
+        with self._lock:
+            row = self._db.execute("SELECT version, terms FROM terms WHERE accession = ?",
+                                   (accession,)).fetchone()
+        if row is None or row[0] != EXTRACTOR_VERSION:
+            return None
+        return json.loads(row[1])
+
+    def put(self, accession: str, terms: dict):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO terms VALUES (?, ?, ?, ?)",
+                             (accession, EXTRACTOR_VERSION, json.dumps(terms), time.time()))
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
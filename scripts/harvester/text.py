@@ -0,0 +1,219 @@
+"""
+Plain-text extraction for harvested EDGAR exhibits.
+
+EDGAR exhibits are mostly HTML exported from word processors: every run of
+text wrapped in inline-styled <font>/<span> tags, tables used for layout, and
+non-breaking spaces everywhere. This module reduces them to readable text with
+paragraph breaks preserved, using only the standard-library HTML parser.
+
+extract_exhibit() does this once per downloaded file and stores the result
+next to the original:
+
+    02_Purchase_Agreement/ex2-1.htm
+    02_Purchase_Agreement/ex2-1.extracted.txt    normalized UTF-8 text
+    02_Purchase_Agreement/ex2-1.sections.json    Article/Section map
+
+The section map gives each heading's number, title and [start, end) byte
+offsets into the .extracted.txt file, so read_section() can seek straight to
+"Section 8.2" without touching the HTML again.
+"""
+
+import json
+import re
+from concurrent.futures import Executor
+from html import unescape
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .atomic import write_text_atomic
+
+TEXT_SUFFIX = ".extracted.txt"
+SECTIONS_SUFFIX = ".sections.json"
+
+BLOCK_TAGS = {
+    "p", "div", "br", "tr", "li", "ul", "ol", "table", "h1", "h2", "h3",
+    "h4", "h5", "h6", "center", "blockquote", "pre", "hr", "title", "page",
+}
+SKIP_TAGS = {"script", "style", "head"}
+
+_SPACES = re.compile(r"[ \t\r\f\v\u00a0\u2002\u2003\u2009]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+class _TextCollector(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+        elif tag == "td":
+            self.parts.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def normalize_whitespace(text: str) -> str:
+    lines = (_SPACES.sub(" ", line).strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def html_to_text(html: str) -> str:
+    """Strip markup, keeping block boundaries as line breaks."""
+    collector = _TextCollector()
+    collector.feed(html)
+    collector.close()
+    return normalize_whitespace("".join(collector.parts))
+
+
+def decode_document(raw: bytes) -> str:
+    """EDGAR filers use UTF-8, Windows-1252 and Latin-1 interchangeably."""
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return raw.decode("cp1252", errors="replace")
+
+
+def extract_text(path: Path) -> str:
+    """Readable text of an exhibit file (.htm/.html or plain .txt)."""
+    content = decode_document(Path(path).read_bytes())
+    if Path(path).suffix.lower() in (".htm", ".html") or "<html" in content[:2000].lower():
+        return html_to_text(content)
+    return normalize_whitespace(unescape(content))
+
+
+# ----------------------------------------------------------------------
+# Section segmentation
+# ----------------------------------------------------------------------
+
+_ARTICLE = re.compile(r"^ARTICLE\s+([IVXLC]+|\d+)\b[\s.:\-—–]*(.*)$", re.IGNORECASE)
+_SECTION = re.compile(r"^(?:Section|SECTION|§)\s*(\d+(?:\.\d+)+|\d+)\.?\s*(.*)$")
+# A table-of-contents line ends in a page number.
+_TOC_TAIL = re.compile(r"\s\d{1,3}$")
+
+
+def _section_heading(rest: str) -> str:
+    """'Indemnification. The Seller shall…' → 'Indemnification'."""
+    heading = rest.split(". ", 1)[0].strip().rstrip(".")
+    return heading[:120]
+
+
+def segment_sections(text: str) -> list:
+    """Find Article/Section headings in extracted text.
+
+    Returns entries ordered by position, each with kind ("article" or
+    "section"), number, heading and [start, end) byte offsets into the UTF-8
+    encoded text. An article ends where the next article starts; a section
+    ends at the next section or article. When a number appears more than once
+    (table of contents, cross-reference lines), the last occurrence wins —
+    that is the one in the body of the agreement.
+    """
+    found: dict = {}
+    lines = text.split("\n")
+    offset = 0
+    for i, line in enumerate(lines):
+        line_bytes = len(line.encode("utf-8")) + 1
+        article = _ARTICLE.match(line)
+        section = None if article else _SECTION.match(line)
+        if article:
+            heading = article.group(2).strip()
+            if not heading:
+                # Heading on its own line: "ARTICLE VIII" / "INDEMNIFICATION"
+                following = next((l for l in lines[i + 1:i + 4] if l.strip()), "")
+                if following.isupper():
+                    heading = following.strip()
+            if not _TOC_TAIL.search(line):
+                found[("article", article.group(1).upper())] = {
+                    "kind": "article", "number": article.group(1).upper(),
+                    "heading": heading[:120], "start": offset,
+                }
+        elif section and not _TOC_TAIL.search(line):
+            found[("section", section.group(1))] = {
+                "kind": "section", "number": section.group(1),
+                "heading": _section_heading(section.group(2)), "start": offset,
+            }
+        offset += line_bytes
+
+    entries = sorted(found.values(), key=lambda e: e["start"])
+    total = len(text.encode("utf-8"))
+    for i, entry in enumerate(entries):
+        end = total
+        for later in entries[i + 1:]:
+            if entry["kind"] == "section" or later["kind"] == "article":
+                end = later["start"]
+                break
+        entry["end"] = end
+    return entries
+
+
+# ----------------------------------------------------------------------
+# Stored extraction
+# ----------------------------------------------------------------------
+
+def text_path(path: Path) -> Path:
+    return Path(path).with_suffix(TEXT_SUFFIX)
+
+
+def sections_path(path: Path) -> Path:
+    return Path(path).with_suffix(SECTIONS_SUFFIX)
+
+
+def extract_exhibit(path: Path) -> dict:
+    """Write the .extracted.txt and .sections.json files for one exhibit.
+
+    Skips the work when both are newer than the source. Runs in worker
+    processes, so it takes and returns plain picklable values.
+    """
+    path = Path(path)
+    txt, sections = text_path(path), sections_path(path)
+    source_mtime = path.stat().st_mtime
+    if (txt.exists() and sections.exists()
+            and txt.stat().st_mtime >= source_mtime and sections.stat().st_mtime >= source_mtime):
+        count = len(json.loads(sections.read_text()))
+    else:
+        text = extract_text(path)
+        entries = segment_sections(text)
+        write_text_atomic(txt, text)
+        write_text_atomic(sections, json.dumps(entries, indent=1))
+        count = len(entries)
+    return {"text": txt.name, "sections": sections.name, "section_count": count}
+
+
+def extract_exhibits(paths: Iterable[Path], pool: Optional[Executor] = None) -> list:
+    """Extract many exhibits, spread across a process pool when one is given."""
+    paths = [str(p) for p in paths]
+    if pool is None:
+        return [extract_exhibit(p) for p in paths]
+    return list(pool.map(extract_exhibit, paths, chunksize=4))
+
+
+def read_extracted_text(path: Path) -> Optional[str]:
+    """Stored text for an exhibit, or None if it hasn't been extracted."""
+    txt = text_path(path)
+    return txt.read_text(encoding="utf-8") if txt.exists() else None
+
+
+def read_section(path: Path, number: str, kind: str = "section") -> Optional[str]:
+    """Text of one Article/Section of an extracted exhibit, read by byte offset."""
+    sections = sections_path(path)
+    if not sections.exists():
+        return None
+    for entry in json.loads(sections.read_text()):
+        if entry["kind"] == kind and entry["number"] == number:
+            with open(text_path(path), "rb") as f:
+                f.seek(entry["start"])
+                return f.read(entry["end"] - entry["start"]).decode("utf-8")
+    return None
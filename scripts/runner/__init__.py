@@ -0,0 +1,6 @@
+"""
+Support modules for scripts/autonomous-runner.py.
+
+autonomous-runner.py stays the entry point (its file name is not importable);
+the pieces that do not need its sessions, prompts or logging live here.
+"""
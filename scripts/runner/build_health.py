@@ -0,0 +1,327 @@
+"""
+Build health of the working tree: incremental, cached, off the agent's checkout.
+
+The runner used to run a full `pnpm build` after every turn to decide whether
+to escalate, then a second one to capture the error for the supervisor. Here:
+
+- The tree is fingerprinted by its git tree hash: the index is copied to a
+  temporary GIT_INDEX_FILE, `git add -A` stages everything (untracked files
+  included; dependencies, build output and .env files excluded), and
+  `git write-tree` names the result. The real index is never touched, and
+  with the copied stat cache only modified files are re-hashed.
+- Results are cached per tree hash (in the git common dir), so an unchanged
+  tree is never checked twice, and the output kept with the result is what
+  the escalation context quotes.
+- The check runs on a snapshot: the tree is read into a dedicated worktree
+  (<repo>-worktrees/build-health), so the agent can keep editing while it
+  runs, and node_modules, tsbuildinfo and .next survive between checks.
+- Only workspace packages touched since the last green tree, plus their
+  workspace dependents, are type-checked (`tsc --noEmit --incremental`,
+  dependencies first). Root config (package.json, lockfile, tsconfig.base,
+  turbo.json) or a missing baseline checks every package; changes outside
+  the workspace (docs, skills, scripts) check nothing.
+
+check() is synchronous and serialised; the runner calls it in a thread so
+the next turn starts while it runs, and cancel() kills the command in flight.
+"""
+
+import json
+import os
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from runner.phase_dag import worktrees_root
+
+# Never part of the fingerprint: installed or generated, or secrets.
+UNTRACKED_NOISE = ("node_modules/", ".next/", "dist/", ".turbo/", ".vercel/", "*.tsbuildinfo", ".env*")
+# A change to any of these can break every package.
+ROOT_CONFIG = {"package.json", "pnpm-lock.yaml", "pnpm-workspace.yaml", "tsconfig.base.json", "turbo.json"}
+WORKSPACE_DIRS = ("apps", "packages")
+WORKSPACE_PREFIXES = tuple(f"{folder}/" for folder in WORKSPACE_DIRS)
+
+MAX_RESULTS = 200
+OUTPUT_CHARS = 20000
+COMMAND_TIMEOUT = 600
+TSBUILDINFO = "node_modules/.cache/build-health.tsbuildinfo"
+
+
+class BuildCheckError(RuntimeError):
+    """The check could not run (no pnpm, git failure, cancelled); says nothing about the build."""
+
+
+@dataclass
+class BuildResult:
+    tree: str
+    ok: bool
+    output: str = ""
+    packages: list = field(default_factory=list)  # what was checked; ["*"] for `pnpm build`
+    mode: str = "incremental"
+    seconds: float = 0.0
+    checked_at: float = 0.0
+    cached: bool = False
+
+    def summary(self) -> str:
+        scope = ", ".join(self.packages) if self.packages else "no workspace changes"
+        status = "ok" if self.ok else "BROKEN"
+        source = "cached" if self.cached else f"{self.seconds:.1f}s"
+        return f"build {status} at {self.tree[:10]} ({scope}; {source})"
+
+
+def _git(repo: Path, *args: str, env: Optional[dict] = None) -> str:
+    done = subprocess.run(["git", *args], cwd=repo, capture_output=True, text=True, env=env)
+    if done.returncode != 0:
+        raise BuildCheckError(f"git {args[0]} failed: {(done.stderr or done.stdout).strip()}")
+    return done.stdout.strip()
+
+
+def _git_path(repo: Path, *args: str) -> Path:
+    return (Path(repo) / _git(repo, "rev-parse", *args)).resolve()
+
+
+def tree_fingerprint(repo: Path) -> str:
+    """Tree hash of the working tree as `git add -A` would stage it."""
+    repo = Path(repo)
+    index = _git_path(repo, "--git-path", "index")
+    with tempfile.TemporaryDirectory(prefix="build-health-") as tmp:
+        temp_index, excludes = Path(tmp) / "index", Path(tmp) / "exclude"
+        if index.exists():
+            shutil.copyfile(index, temp_index)
+        excludes.write_text("\n".join(UNTRACKED_NOISE) + "\n")
+        env = {**os.environ, "GIT_INDEX_FILE": str(temp_index)}
+        _git(repo, "-c", f"core.excludesFile={excludes}", "add", "-A", "--", ".", env=env)
+        return _git(repo, "write-tree", env=env)
+
+
+def changed_paths(repo: Path, old_tree: str, new_tree: str) -> list:
+    return _git(repo, "diff-tree", "-r", "--name-only", old_tree, new_tree).splitlines()
+
+
+# ----------------------------------------------------------------------
+# Workspace
+# ----------------------------------------------------------------------
+
+def load_workspace(root: Path) -> dict:
+    """{package name: {"path": "packages/db", "deps": {workspace package names}}}."""
+    manifests = {}
+    for folder in WORKSPACE_DIRS:
+        for manifest in sorted((Path(root) / folder).glob("*/package.json")):
+            data = json.loads(manifest.read_text())
+            if data.get("name"):
+                manifests[data["name"]] = (manifest.parent.relative_to(root).as_posix(), data)
+    workspace = {}
+    for name, (path, data) in manifests.items():
+        declared = {**data.get("dependencies", {}), **data.get("devDependencies", {})}
+        workspace[name] = {"path": path, "deps": set(declared) & manifests.keys()}
+    return workspace
+
+
+def _is_package_manifest(path: str) -> bool:
+    parts = path.split("/")
+    return len(parts) == 3 and parts[0] in WORKSPACE_DIRS and parts[2] == "package.json"
+
+
+def _dependents(workspace: dict, names: set) -> set:
+    found, frontier = set(names), set(names)
+    while frontier:
+        frontier = {name for name, pkg in workspace.items() if pkg["deps"] & frontier} - found
+        found |= frontier
+    return found
+
+
+def _dependency_order(workspace: dict, names: set) -> list:
+    ordered, seen = [], set()
+
+    def visit(name):
+        if name in seen:
+            return
+        seen.add(name)
+        for dep in sorted(workspace[name]["deps"]):
+            visit(dep)
+        if name in names:
+            ordered.append(name)
+
+    for name in sorted(names):
+        visit(name)
+    return ordered
+
+
+def affected_packages(workspace: dict, paths: Optional[list]) -> list:
+    """Packages to check for these changed paths (None: everything), dependencies first."""
+    if paths is None or any(path in ROOT_CONFIG for path in paths):
+        return _dependency_order(workspace, set(workspace))
+    touched = {name for name, pkg in workspace.items()
+               if any(path.startswith(pkg["path"] + "/") for path in paths)}
+    return _dependency_order(workspace, _dependents(workspace, touched))
+
+
+# ----------------------------------------------------------------------
+# Checks
+# ----------------------------------------------------------------------
+
+class BuildHealth:
+    """Cached, incremental build checks of one repo's working tree."""
+
+    def __init__(self, repo: Path, timeout: float = COMMAND_TIMEOUT):
+        self.repo = Path(repo).resolve()
+        self.timeout = timeout
+        self.snapshot = worktrees_root(self.repo) / "build-health"
+        self.store = _git_path(self.repo, "--git-common-dir") / "build-health"
+        self.results_file = self.store / "results.json"
+        self.latest: Optional[BuildResult] = None
+        self._lock = threading.Lock()
+        self._proc: Optional[subprocess.Popen] = None
+        self._cancelled = False
+
+    # -- cache --------------------------------------------------------
+
+    def _load(self) -> dict:
+        try:
+            return json.loads(self.results_file.read_text())
+        except (OSError, ValueError):
+            return {"results": {}, "last_good": None, "installed": None}
+
+    def _save(self, data: dict):
+        results = data["results"]
+        for tree in list(results)[:-MAX_RESULTS]:
+            del results[tree]
+        self.store.mkdir(parents=True, exist_ok=True)
+        temp = self.results_file.with_suffix(".tmp")
+        temp.write_text(json.dumps(data, indent=1))
+        temp.replace(self.results_file)
+
+    def cached(self, tree: str, full: bool = False) -> Optional[BuildResult]:
+        entry = self._load()["results"].get(tree)
+        if entry is None or (full and entry["mode"] != "full"):
+            return None
+        return BuildResult(**{**entry, "cached": True})
+
+    # -- commands -----------------------------------------------------
+
+    def _run(self, args: list, cwd: Path) -> tuple:
+        """(returncode, combined output); BuildCheckError if it cannot run or is cancelled."""
+        if self._cancelled:
+            raise BuildCheckError("cancelled")
+        try:
+            self._proc = subprocess.Popen(args, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                          text=True, start_new_session=True)
+        except FileNotFoundError:
+            raise BuildCheckError(f"{args[0]} not found")
+        try:
+            output, _ = self._proc.communicate(timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            self._kill()
+            output, _ = self._proc.communicate()
+            return 124, f"{output}\n{' '.join(args)}: timed out after {self.timeout:.0f}s"
+        finally:
+            proc, self._proc = self._proc, None
+        if self._cancelled:
+            raise BuildCheckError("cancelled")
+        return proc.returncode, output
+
+    def _kill(self):
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+    def cancel(self):
+        """Stop the check in flight (from any thread); check() raises BuildCheckError."""
+        self._cancelled = True
+        self._kill()
+
+    # -- snapshot -----------------------------------------------------
+
+    def _manifests(self, tree: str) -> str:
+        """Blob ids of the lockfile and every package.json: what pnpm install depends on."""
+        listing = _git(self.repo, "ls-tree", "-r", tree).splitlines()
+        return "\n".join(line for line in listing
+                         if line.split("\t", 1)[1] in ("package.json", "pnpm-lock.yaml")
+                         or _is_package_manifest(line.split("\t", 1)[1]))
+
+    def _prepare_snapshot(self, tree: str, data: dict):
+        """Read `tree` into the snapshot worktree, reinstalling if a manifest changed."""
+        if not (self.snapshot / ".git").exists():
+            _git(self.repo, "worktree", "prune")
+            self.snapshot.parent.mkdir(parents=True, exist_ok=True)
+            _git(self.repo, "worktree", "add", "--detach", str(self.snapshot), "HEAD")
+        _git(self.snapshot, "read-tree", "--reset", "-u", tree)
+        for env_file in [*self.repo.glob(".env*"), *self.repo.glob("apps/*/.env*")]:
+            target = self.snapshot / env_file.relative_to(self.repo)
+            if env_file.is_file() and not target.exists():
+                shutil.copyfile(env_file, target)
+        manifests = self._manifests(tree)
+        if manifests != data.get("installed") or not (self.snapshot / "node_modules").exists():
+            returncode, output = self._run(["pnpm", "install", "--prefer-offline"], self.snapshot)
+            if returncode != 0:
+                raise BuildCheckError(f"pnpm install failed in {self.snapshot}:\n{output[-2000:]}")
+            data["installed"] = manifests
+
+    def _baseline_paths(self, tree: str, data: dict) -> Optional[list]:
+        """Paths changed since the last green tree; None when there is none to compare with."""
+        last_good = data.get("last_good")
+        if not last_good:
+            return None
+        try:
+            return changed_paths(self.repo, last_good, tree)
+        except BuildCheckError:  # pruned by gc
+            return None
+
+    def check(self, full: bool = False) -> BuildResult:
+        """Build health of the working tree as it is now.
+
+        full=True runs the root `pnpm build` on the snapshot instead of the
+        scoped type-checks.
+        """
+        with self._lock:
+            self._cancelled = False
+            tree = tree_fingerprint(self.repo)
+            result = self.cached(tree, full)
+            if result is None:
+                result = self._check_tree(tree, full)
+            self.latest = result
+            return result
+
+    def _check_tree(self, tree: str, full: bool) -> BuildResult:
+        data = self._load()
+        started = time.monotonic()
+        paths = None if full else self._baseline_paths(tree, data)
+        outputs, ok, packages = [], True, []
+        if paths is None or any(path in ROOT_CONFIG or path.startswith(WORKSPACE_PREFIXES)
+                                for path in paths):
+            self._prepare_snapshot(tree, data)
+            if full:
+                packages = ["*"]
+                returncode, output = self._run(["pnpm", "build"], self.snapshot)
+                ok = returncode == 0
+                outputs.append(output)
+            else:
+                packages = affected_packages(load_workspace(self.snapshot), paths)
+            for name in [] if full else packages:
+                returncode, output = self._run(
+                    ["pnpm", "--filter", name, "exec", "tsc", "--noEmit", "--incremental",
+                     "--tsBuildInfoFile", TSBUILDINFO],
+                    self.snapshot,
+                )
+                if returncode != 0:
+                    ok = False
+                    outputs.append(f"{name}: tsc exited {returncode}\n{output}")
+                    break  # its dependents would only repeat the errors
+        result = BuildResult(tree=tree, ok=ok, output="\n".join(outputs)[-OUTPUT_CHARS:],
+                             packages=packages, mode="full" if full else "incremental",
+                             seconds=round(time.monotonic() - started, 2), checked_at=time.time())
+        entry = asdict(result)
+        del entry["cached"]
+        data["results"][tree] = entry
+        if ok:
+            data["last_good"] = tree
+        self._save(data)
+        return result
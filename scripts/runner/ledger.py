@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+The run ledger: every runner event in one SQLite file, queryable after the run.
+
+The runner used to keep its record in text: build_log.txt and the
+supervisor's log were appended a line at a time (an open() per line), and
+session IDs were written into BUILD_STATE.json by rewriting the whole file.
+Here everything is a row in <git common dir>/runner-ledger.sqlite:
+
+    runs     one per runner invocation (mode, model, arguments, start/finish)
+    events   session   a session got (or changed) its ID
+             turn      one agent turn: session, phase, step, cost, seconds
+             state     BUILD_STATE.json moved to another phase/step
+             intervention, escalation, guidance, build_check, needs_human,
+             phase_merged, phase_failed (the session's total_cost_usd in data)
+    log      every line the runner printed, tagged RUNNER/OK/WARN/ERROR/
+             BUILD/SUPERVISOR/STATUS
+
+Writes are buffered and committed in batches (WAL, synchronous=NORMAL) by a
+background thread every FLUSH_SECONDS, or sooner when BATCH_ROWS pile up, so
+a chatty turn costs list appends rather than file opens. The current phase,
+step, session IDs and per-session cost are also kept in memory (Ledger.state)
+so the runner never reads them back.
+
+Only turn events carry cost_usd, and the cost columns sum turns alone, so
+a phase's spend is exactly the sum of its turns.
+
+Living in the git common dir keeps the database out of the agents'
+`git add -A` and shared between the parallel phase worktrees.
+
+Usage:
+    python3 scripts/runner/ledger.py phases            # cost, turns, escalations per phase
+    python3 scripts/runner/ledger.py stalls            # turns spent without advancing a step
+    python3 scripts/runner/ledger.py turns --phase 7 --last 20
+    python3 scripts/runner/ledger.py runs
+    python3 scripts/runner/ledger.py log --tag SUPERVISOR -n 100
+    python3 scripts/runner/ledger.py log --follow      # tail -f for the ledger
+    python3 scripts/runner/ledger.py phases --run 3 --json
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+LEDGER_FILE = "runner-ledger.sqlite"
+
+BATCH_ROWS = 500
+FLUSH_SECONDS = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY, started_at REAL NOT NULL, finished_at REAL,
+    mode TEXT, model TEXT, argv TEXT
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY, run INTEGER NOT NULL, ts REAL NOT NULL, kind TEXT NOT NULL,
+    session TEXT, phase INTEGER, step TEXT, cost_usd REAL, seconds REAL, data TEXT
+);
+CREATE INDEX IF NOT EXISTS events_by_kind ON events (kind, phase);
+CREATE TABLE IF NOT EXISTS log (
+    id INTEGER PRIMARY KEY, run INTEGER NOT NULL, ts REAL NOT NULL, tag TEXT NOT NULL, line TEXT NOT NULL
+);
+"""
+
+
+def default_path(repo: Path = REPO_ROOT) -> Path:
+    """The ledger in the repo's git common dir (shared by all its worktrees)."""
+    common = subprocess.run(["git", "rev-parse", "--git-common-dir"], cwd=repo,
+                            capture_output=True, text=True).stdout.strip()
+    return (Path(repo) / (common or ".git")).resolve() / LEDGER_FILE
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    db = sqlite3.connect(path, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.executescript(SCHEMA)
+    return db
+
+
+class StateFile:
+    """A JSON file, parsed again only when it changes on disk.
+
+    Callers share the returned dict: copy it before changing it.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._stamp = None
+        self._data = None
+
+    def load(self) -> dict:
+        stat = os.stat(self.path)
+        stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if stamp != self._stamp:
+            with open(self.path) as f:
+                self._data = json.load(f)
+            self._stamp = stamp
+        return self._data
+
+
+class Ledger:
+    """Buffered writer for one runner invocation's events and log lines."""
+
+    def __init__(self, path: Path, batch_rows: int = BATCH_ROWS, flush_seconds: float = FLUSH_SECONDS):
+        self.path = Path(path)
+        self.batch_rows = batch_rows
+        self.flush_seconds = flush_seconds
+        self._db = _connect(self.path)
+        self._lock = threading.Lock()
+        self._events: list = []
+        self._lines: list = []
+        self.run: Optional[int] = None
+        self.state = {"phase": None, "step": None, "sessions": {}, "cost": {}, "turns": {}}
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def start_run(self, mode: str, model: str, argv: list) -> int:
+        with self._lock:
+            self.run = self._db.execute(
+                "INSERT INTO runs (started_at, mode, model, argv) VALUES (?, ?, ?, ?)",
+                (time.time(), mode, model, json.dumps(argv)),
+            ).lastrowid
+            self._db.commit()
+        self._flusher = threading.Thread(target=self._flush_periodically, name="ledger-flush", daemon=True)
+        self._flusher.start()
+        return self.run
+
+    def _flush_periodically(self):
+        while not self._stop.wait(self.flush_seconds):
+            self.flush()
+
+    def _append(self, buffer: list, row: tuple):
+        with self._lock:
+            buffer.append(row)
+            full = len(self._events) + len(self._lines) >= self.batch_rows
+        if full:
+            self.flush()
+
+    def record(self, kind: str, session: Optional[str] = None, phase: Optional[int] = None,
+               step=None, cost_usd: Optional[float] = None, seconds: Optional[float] = None, **data):
+        """One event; phase and step default to the last state observed."""
+        if phase is None:
+            phase = self.state["phase"]
+            step = self.state["step"] if step is None else step
+        self._append(self._events, (
+            self.run, time.time(), kind, session, phase, None if step is None else str(step),
+            cost_usd, seconds, json.dumps(data, default=str) if data else None,
+        ))
+
+    def log(self, tag: str, line: str):
+        self._append(self._lines, (self.run, time.time(), tag, line))
+
+    def record_turn(self, session: str, cost_usd: float, seconds: float, session_id: Optional[str] = None,
+                    phase: Optional[int] = None, **data):
+        """A finished agent turn; also notes a new session ID."""
+        state = self.state
+        state["cost"][session] = state["cost"].get(session, 0.0) + cost_usd
+        state["turns"][session] = state["turns"].get(session, 0) + 1
+        if session_id and state["sessions"].get(session) != session_id:
+            state["sessions"][session] = session_id
+            self.record("session", session=session, phase=phase, session_id=session_id)
+        self.record("turn", session=session, phase=phase, cost_usd=cost_usd, seconds=seconds, **data)
+
+    def observe_state(self, build_state: dict):
+        """Note BUILD_STATE.json's phase/step; a change is recorded as a transition."""
+        phase, step = build_state.get("current_phase"), build_state.get("current_step")
+        previous = (self.state["phase"], self.state["step"])
+        if (phase, step) == previous:
+            return
+        self.state["phase"], self.state["step"] = phase, step
+        self.record("state", phase=phase, step=step, from_phase=previous[0], from_step=previous[1],
+                    blocking_issues=len(build_state.get("blocking_issues", [])))
+
+    def flush(self):
+        with self._lock:
+            events, self._events = self._events, []
+            lines, self._lines = self._lines, []
+            if not events and not lines:
+                return
+            self._db.executemany(
+                "INSERT INTO events (run, ts, kind, session, phase, step, cost_usd, seconds, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", events)
+            self._db.executemany("INSERT INTO log (run, ts, tag, line) VALUES (?, ?, ?, ?)", lines)
+            self._db.commit()
+
+    def close(self):
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+        with self._lock:
+            if self.run is not None:
+                self._db.execute("UPDATE runs SET finished_at = ? WHERE id = ?", (time.time(), self.run))
+                self._db.commit()
+            self._db.close()
+
+
+# ----------------------------------------------------------------------
+# Queries
+# ----------------------------------------------------------------------
+
+def _run_filter(run: Optional[int], prefix: str = "WHERE") -> tuple:
+    return (f"{prefix} run = ?", (run,)) if run is not None else ("", ())
+
+
+def runs(db: sqlite3.Connection) -> list:
+    return [dict(row) for row in db.execute(
+        "SELECT r.id AS run, r.mode, r.model, r.started_at, r.finished_at, "
+        "  COUNT(e.id) FILTER (WHERE e.kind = 'turn') AS turns, "
+        "  ROUND(COALESCE(SUM(e.cost_usd) FILTER (WHERE e.kind = 'turn'), 0), 2) AS cost_usd "
+        "FROM runs r LEFT JOIN events e ON e.run = r.id GROUP BY r.id ORDER BY r.id")]
+
+
+def phase_stats(db: sqlite3.Connection, run: Optional[int] = None) -> list:
+    """Per phase: turns, cost (split build/supervisor), agent time, interventions, escalations."""
+    where, params = _run_filter(run)
+    return [dict(row) for row in db.execute(
+        "SELECT phase, "
+        "  SUM(kind = 'turn') AS turns, "
+        "  ROUND(COALESCE(SUM(cost_usd) FILTER (WHERE kind = 'turn'), 0), 2) AS cost_usd, "
+        "  ROUND(COALESCE(SUM(cost_usd) FILTER (WHERE kind = 'turn' AND session = 'supervisor'), 0), 2) "
+        "    AS supervisor_usd, "
+        "  ROUND(COALESCE(SUM(seconds) FILTER (WHERE kind = 'turn'), 0) / 60, 1) AS agent_minutes, "
+        "  SUM(kind = 'intervention') AS interventions, "
+        "  SUM(kind = 'escalation') AS escalations, "
+        "  SUM(kind = 'build_check' AND json_extract(data, '$.ok') = 0) AS broken_builds, "
+        "  SUM(kind = 'needs_human') AS needs_human "
+        f"FROM events {where} GROUP BY phase ORDER BY phase", params)]
+
+
+def stall_stats(db: sqlite3.Connection, run: Optional[int] = None) -> list:
+    """Per phase: steps, build turns, turns that did not advance the step (the runner's
+    no-progress turns), the step that took longest, and repeated_stuck escalations."""
+    where, params = ("AND run = ?", (run,)) if run is not None else ("", ())
+    return [dict(row) for row in db.execute(
+        "WITH per_step AS ("
+        "  SELECT phase, step, COUNT(*) AS turns FROM events "
+        f"  WHERE kind = 'turn' AND COALESCE(session, '') != 'supervisor' {where} "
+        "  GROUP BY phase, step), "
+        "stuck AS ("
+        "  SELECT phase, COUNT(*) AS escalations FROM events "
+        f"  WHERE kind = 'escalation' AND json_extract(data, '$.reason') = 'repeated_stuck' {where} "
+        "  GROUP BY phase) "
+        "SELECT p.phase, COUNT(*) AS steps, SUM(p.turns) AS turns, "
+        "  SUM(p.turns - 1) AS stalled_turns, MAX(p.turns) AS most_turns_on_a_step, "
+        "  (SELECT step FROM per_step q WHERE q.phase IS p.phase ORDER BY q.turns DESC LIMIT 1) AS worst_step, "
+        "  COALESCE(s.escalations, 0) AS stuck_escalations "
+        "FROM per_step p LEFT JOIN stuck s ON s.phase IS p.phase "
+        "GROUP BY p.phase ORDER BY p.phase", params + params)]
+
+
+def turns(db: sqlite3.Connection, run: Optional[int] = None, phase: Optional[int] = None,
+          last: int = 50) -> list:
+    clauses, params = ["kind = 'turn'"], []
+    if run is not None:
+        clauses.append("run = ?")
+        params.append(run)
+    if phase is not None:
+        clauses.append("phase = ?")
+        params.append(phase)
+    rows = db.execute(
+        "SELECT id, run, ts, session, phase, step, ROUND(cost_usd, 4) AS cost_usd, "
+        "  ROUND(seconds, 1) AS seconds, data FROM events "
+        f"WHERE {' AND '.join(clauses)} ORDER BY id DESC LIMIT ?", (*params, last)).fetchall()
+    return [dict(row) for row in reversed(rows)]
+
+
+def _print_table(rows: list, columns: list):
+    if not rows:
+        print("(nothing recorded)")
+        return
+    cells = [[("-" if row[c] is None else str(row[c])) for c in columns] for row in rows]
+    widths = [max(len(c), *(len(r[i]) for r in cells)) for i, c in enumerate(columns)]
+    print("  ".join(c.rjust(w) for c, w in zip(columns, widths)))
+    for r in cells:
+        print("  ".join(v.rjust(w) for v, w in zip(r, widths)))
+
+
+def _stamp(ts: Optional[float]) -> Optional[str]:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts)) if ts else None
+
+
+def follow_log(db: sqlite3.Connection, tag: Optional[str], lines: int, follow: bool):
+    where, params = ("WHERE tag = ?", (tag,)) if tag else ("", ())
+    rows = db.execute(f"SELECT id, ts, tag, line FROM log {where} ORDER BY id DESC LIMIT ?",
+                      (*params, lines)).fetchall()
+    last = 0
+    for row in reversed(rows):
+        print(f"[{time.strftime('%H:%M:%S', time.localtime(row['ts']))}] [{row['tag']}] {row['line']}")
+        last = row["id"]
+    while follow:
+        time.sleep(FLUSH_SECONDS)
+        clause = "AND tag = ?" if tag else ""
+        for row in db.execute(f"SELECT id, ts, tag, line FROM log WHERE id > ? {clause} ORDER BY id",
+                              (last, *params)):
+            print(f"[{time.strftime('%H:%M:%S', time.localtime(row['ts']))}] [{row['tag']}] {row['line']}",
+                  flush=True)
+            last = row["id"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the autonomous runner's ledger")
+    parser.add_argument("--ledger", type=Path, help=f"Default: <git common dir>/{LEDGER_FILE}")
+    parser.add_argument("--run", type=int, help="Only this run (see `runs`); default all")
+    parser.add_argument("--json", action="store_true", help="Print rows as JSON")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("runs", help="Runner invocations")
+    sub.add_parser("phases", help="Cost, turns, interventions and escalations per phase")
+    sub.add_parser("stalls", help="Turns spent without advancing a step, per phase")
+    turns_parser = sub.add_parser("turns", help="Individual agent turns")
+    turns_parser.add_argument("--phase", type=int)
+    turns_parser.add_argument("--last", type=int, default=50)
+    log_parser = sub.add_parser("log", help="Logged lines (what build_log.txt used to hold)")
+    log_parser.add_argument("--tag", help="RUNNER, OK, WARN, ERROR, BUILD, SUPERVISOR or STATUS")
+    log_parser.add_argument("-n", "--lines", type=int, default=50)
+    log_parser.add_argument("-f", "--follow", action="store_true")
+    args = parser.parse_args()
+
+    path = args.ledger or default_path()
+    if not path.exists():
+        sys.exit(f"No ledger at {path}")
+    db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    db.row_factory = sqlite3.Row
+
+    if args.command == "log":
+        try:
+            follow_log(db, args.tag, args.lines, args.follow)
+        except KeyboardInterrupt:
+            pass
+        return
+    if args.command == "runs":
+        rows = runs(db)
+        for row in rows:
+            row["started_at"], row["finished_at"] = _stamp(row["started_at"]), _stamp(row["finished_at"])
+        columns = ["run", "mode", "model", "started_at", "finished_at", "turns", "cost_usd"]
+    elif args.command == "phases":
+        rows = phase_stats(db, args.run)
+        columns = ["phase", "turns", "cost_usd", "supervisor_usd", "agent_minutes", "interventions",
+                   "escalations", "broken_builds", "needs_human"]
+    elif args.command == "stalls":
+        rows = stall_stats(db, args.run)
+        columns = ["phase", "steps", "turns", "stalled_turns", "most_turns_on_a_step", "worst_step",
+                   "stuck_escalations"]
+    else:
+        rows = turns(db, args.run, args.phase, args.last)
+        for row in rows:
+            row["ts"] = _stamp(row["ts"])
+        columns = ["id", "run", "ts", "session", "phase", "step", "cost_usd", "seconds"]
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        _print_table(rows, columns)
+
+
+if __name__ == "__main__":
+    main()
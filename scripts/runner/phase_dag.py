@@ -0,0 +1,223 @@
+"""
+Phase dependency graph, scheduling, and git worktrees for parallel phases.
+
+Each skill file (skills/phase-NN.md) opens with a "## Prerequisites" list.
+Every phase it names there is a dependency:
+
+    - Phase 4 complete (approval framework ...)            -> {4}
+    - Phases 3-6 complete (event backbone, ...)            -> {3, 4, 5, 6}
+    - Phase 16-17 must be complete (...)                   -> {16, 17}
+    - All prior phases complete (3-13)                     -> {3, ..., 13}
+    - All Phases 3-11 complete (...)                       -> {3, ..., 11}
+    - Approval framework operational (Phase 4)             -> {4}
+
+Phases without a skill file (0-2, built before the runner) are taken as
+done. PhaseScheduler hands out the phases whose dependencies have all been
+merged; a failed phase blocks everything downstream of it.
+
+Each running phase is built on its own branch (phase-NN) in its own worktree,
+cut from main once its dependencies are merged; merge_branch() brings it back
+and reports conflicting paths instead of leaving a half-merged tree.
+add_detached_worktree() gives the supervisor a checkout of main of its own.
+"""
+
+import re
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+PREREQUISITES_HEADING = "## Prerequisites"
+SKILL_FILE = re.compile(r"phase-(\d+)\.md$")
+
+_RANGE = r"(\d+)(?:\s*[-–]\s*(\d+))?"
+_PHASE_REF = re.compile(r"\bphases?\s+" + _RANGE, re.IGNORECASE)
+_PRIOR = re.compile(r"\ball\s+prior\s+phases\b[^(\n]*(?:\(\s*" + _RANGE + r"\s*\))?", re.IGNORECASE)
+
+
+def _span(start: str, end: Optional[str]) -> set:
+    low, high = int(start), int(end or start)
+    return set(range(min(low, high), max(low, high) + 1))
+
+
+def prerequisites_section(text: str) -> str:
+    """The body of a skill file's "## Prerequisites" section ("" if it has none)."""
+    lines, inside = [], False
+    for line in text.splitlines():
+        if line.startswith("## "):
+            if inside:
+                break
+            inside = line.strip().lower() == PREREQUISITES_HEADING.lower()
+            continue
+        if inside:
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def parse_prerequisites(text: str, phase: int) -> set:
+    """Phases a skill file says must be complete first (never the phase itself)."""
+    section = prerequisites_section(text)
+    deps = set()
+    for match in _PRIOR.finditer(section):
+        # "All prior phases complete (3-13)"; with no range, every earlier phase.
+        deps |= _span(match[1], match[2]) if match[1] else set(range(phase))
+    for match in _PHASE_REF.finditer(section):
+        deps |= _span(match[1], match[2])
+    deps.discard(phase)
+    return {dep for dep in deps if dep < phase}
+
+
+def load_phase_graph(skills_dir: Path) -> dict:
+    """{phase: set of prerequisite phases} for every skills/phase-NN.md.
+
+    Prerequisites without a skill file are dropped (built before the
+    runner); only earlier phases are accepted, so the graph is acyclic.
+    """
+    texts = {}
+    for path in sorted(Path(skills_dir).glob("phase-*.md")):
+        match = SKILL_FILE.search(path.name)
+        if match and not path.is_symlink():
+            texts[int(match[1])] = path.read_text()
+    return {phase: parse_prerequisites(text, phase) & texts.keys() for phase, text in texts.items()}
+
+
+def levels(graph: dict) -> list:
+    """Phases grouped into waves: each wave needs only phases in earlier waves."""
+    depth: dict = {}
+    for phase in sorted(graph):
+        depth[phase] = 1 + max((depth[dep] for dep in graph[phase]), default=-1)
+    waves: dict = {}
+    for phase, level in depth.items():
+        waves.setdefault(level, []).append(phase)
+    return [sorted(waves[level]) for level in sorted(waves)]
+
+
+def critical_path(graph: dict) -> list:
+    """The longest dependency chain — the floor on a parallel build's length in phases."""
+    best: dict = {}
+    for phase in sorted(graph):
+        chain = max((best[dep] for dep in graph[phase]), key=len, default=[])
+        best[phase] = chain + [phase]
+    return max(best.values(), key=len, default=[])
+
+
+class PhaseScheduler:
+    """Which phases may start, given what has been merged, is running, or failed."""
+
+    def __init__(self, graph: dict, done: set = ()):
+        self.graph = graph
+        self.done = set(done) & graph.keys()
+        self.running: set = set()
+        self.failed: set = set()
+
+    def _blocked(self, phase: int) -> bool:
+        stack, seen = list(self.graph[phase]), set()
+        while stack:
+            dep = stack.pop()
+            if dep in self.failed:
+                return True
+            if dep not in seen:
+                seen.add(dep)
+                stack.extend(self.graph[dep])
+        return False
+
+    def ready(self) -> list:
+        """Startable phases, lowest number first."""
+        return [phase for phase in sorted(self.graph)
+                if phase not in self.done | self.running | self.failed
+                and self.graph[phase] <= self.done]
+
+    def blocked(self) -> list:
+        """Phases that can never start because something they need failed."""
+        return [phase for phase in sorted(self.graph)
+                if phase not in self.done | self.running | self.failed and self._blocked(phase)]
+
+    def start(self, phase: int):
+        self.running.add(phase)
+
+    def finish(self, phase: int):
+        self.running.discard(phase)
+        self.done.add(phase)
+
+    def fail(self, phase: int):
+        self.running.discard(phase)
+        self.failed.add(phase)
+
+    def pending(self) -> list:
+        return [phase for phase in sorted(self.graph)
+                if phase not in self.done | self.running | self.failed]
+
+    def finished(self) -> bool:
+        """Nothing running and nothing left that could still start."""
+        return not self.running and not self.ready()
+
+
+# ----------------------------------------------------------------------
+# Worktrees
+# ----------------------------------------------------------------------
+
+def _git(repo: Path, *args: str, check: bool = True) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", *args], cwd=repo, capture_output=True, text=True, check=check)
+
+
+def branch_name(phase: int) -> str:
+    return f"phase-{phase:02d}"
+
+
+def worktrees_root(repo: Path) -> Path:
+    """Outside the repo, so pnpm/turbo workspace globs never pick worktrees up."""
+    repo = Path(repo).resolve()
+    return repo.parent / f"{repo.name}-worktrees"
+
+
+def worktree_path(repo: Path, phase: int) -> Path:
+    return worktrees_root(repo) / branch_name(phase)
+
+
+def add_worktree(repo: Path, phase: int, base: str = "main") -> Path:
+    """A fresh worktree for the phase on branch phase-NN, reset to `base`."""
+    path = worktree_path(repo, phase)
+    if path.exists():
+        _git(repo, "worktree", "remove", "--force", str(path), check=False)
+    _git(repo, "worktree", "prune")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _git(repo, "worktree", "add", "-B", branch_name(phase), str(path), base)
+    return path
+
+
+def add_detached_worktree(repo: Path, name: str, base: str = "main") -> Path:
+    """A fresh worktree <repo>-worktrees/<name> on a detached HEAD at `base`.
+
+    For an agent that commits to main alongside the one working in `repo`
+    (where main is checked out): it pulls and pushes origin main itself.
+    """
+    path = worktrees_root(repo) / name
+    if path.exists():
+        _git(repo, "worktree", "remove", "--force", str(path), check=False)
+    _git(repo, "worktree", "prune")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _git(repo, "worktree", "add", "--detach", str(path), base)
+    return path
+
+
+def remove_worktree(repo: Path, phase: int, delete_branch: bool = False):
+    _git(repo, "worktree", "remove", "--force", str(worktree_path(repo, phase)), check=False)
+    _git(repo, "worktree", "prune", check=False)
+    if delete_branch:
+        _git(repo, "branch", "-D", branch_name(phase), check=False)
+
+
+def merge_branch(repo: Path, branch: str, message: str) -> list:
+    """Merge `branch` into the repo's checked-out branch.
+
+    Returns the conflicting paths; on conflict the merge is aborted and the
+    checkout left exactly as it was, so the phase can reconcile on its own
+    branch and try again.
+    """
+    merged = _git(repo, "merge", "--no-ff", "-m", message, branch, check=False)
+    if merged.returncode == 0:
+        return []
+    conflicts = _git(repo, "diff", "--name-only", "--diff-filter=U", check=False).stdout.split()
+    _git(repo, "merge", "--abort", check=False)
+    if not conflicts:
+        raise RuntimeError(f"git merge {branch} failed: {(merged.stderr or merged.stdout).strip()}")
+    return conflicts